@@ -2,9 +2,9 @@ import os
 import json
 import logging
 from uuid import uuid4
-from typing import List
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, UploadFile, Form, File, Request, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, UploadFile, Form, File, Request, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
@@ -14,11 +14,14 @@ from app.models.user import User
 from app.config import settings
 from app.database import get_db
 from app.services import editor_service
+from app.services.edl import EditDecisionList
 from app.services.editor import apply_cut, apply_multiple_cuts, concatenate_video_segments
+from app.tasks import generate_proxy_task, render_timeline_task
 
 router = APIRouter(prefix="/editor", tags=["Editor AI"])
 logger = logging.getLogger(__name__)
 TMP_DIR = settings.TMP_DIR
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 # === 📦 SCHEMAS ===
 
@@ -34,22 +37,41 @@ class VideoProcessingInput(BaseModel):
 # === 🔧 UTILITÁRIO ===
 
 async def save_upload_file(upload_file: UploadFile) -> str:
-    """Salva o arquivo de upload temporariamente e retorna o caminho."""
+    """Salva o arquivo de upload na pasta de uploads e retorna o caminho."""
     extension = upload_file.filename.split(".")[-1].lower()
     if extension not in ["mp4", "mov", "avi", "mkv"]:
         raise HTTPException(status_code=400, detail="Formato de vídeo não suportado.")
 
     unique_filename = f"{uuid4()}.{extension}"
-    file_path = os.path.join(TMP_DIR, unique_filename)
+    os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
+    file_path = os.path.join(settings.UPLOAD_FOLDER, unique_filename)
     try:
+        # Em blocos: a memória não cresce com o tamanho nem com o número de uploads
         with open(file_path, "wb") as buffer:
-            content = await upload_file.read()
-            buffer.write(content)
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
         return file_path
     except Exception as e:
         logger.error(f"Erro ao salvar arquivo: {e}")
         raise HTTPException(status_code=500, detail="Erro ao salvar o arquivo.")
 
+
+async def store_upload(upload_file: UploadFile) -> Tuple[str, Optional[str]]:
+    """
+    Fluxo comum de upload: salva o vídeo na pasta de uploads e enfileira o proxy
+    de prévia. O original fica guardado (o proxy é localizado por ele) e pode ser
+    usado depois na timeline pelo `file_id`. Retorna (caminho, id da task do proxy).
+    """
+    video_path = await save_upload_file(upload_file)
+    try:
+        task_id = generate_proxy_task.delay(video_path).id
+    except Exception as e:
+        # Sem fila o upload segue valendo: prévias e análises usam a fonte até o proxy existir
+        logger.warning(f"⚠️ Proxy não enfileirado para {video_path}: {e}")
+        task_id = None
+    logger.info(f"📥 Upload salvo em {video_path} | Proxy Task ID: {task_id}")
+    return video_path, task_id
+
 # === 🧠 GERAÇÃO DE ROTEIRO ===
 
 @router.post("/generate-script")
@@ -120,7 +142,6 @@ async def process_video(
 
 @router.post("/cut/")
 async def cut_single_segment(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     file: UploadFile = File(...),
     start_time: float = Form(...),
@@ -130,14 +151,13 @@ async def cut_single_segment(
     if start_time >= end_time or start_time < 0 or end_time < 0:
         raise HTTPException(status_code=400, detail="Tempos de corte inválidos.")
 
-    video_path = await save_upload_file(file)
+    video_path, _ = await store_upload(file)
     output_path = os.path.join(TMP_DIR, f"cut_{uuid4()}.mp4")
     success = apply_cut(video_path, start_time, end_time, output_path)
 
-    background_tasks.add_task(os.remove, video_path)
-
     if success:
-        return {"message": "Vídeo cortado com sucesso!", "output_path": output_path}
+        return {"message": "Vídeo cortado com sucesso!", "output_path": output_path,
+                "file_id": os.path.basename(video_path)}
     else:
         raise HTTPException(status_code=500, detail="Erro ao cortar o vídeo.")
 
@@ -145,7 +165,6 @@ async def cut_single_segment(
 
 @router.post("/cut-multiple/")
 async def cut_multiple_segments(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     file: UploadFile = File(...),
     cuts: str = Form(...)
@@ -162,14 +181,13 @@ async def cut_multiple_segments(
             if cut['start'] >= cut['end'] or cut['start'] < 0 or cut['end'] < 0:
                 raise HTTPException(status_code=400, detail="Tempos inválidos em corte.")
 
-        video_path = await save_upload_file(file)
+        video_path, _ = await store_upload(file)
         output_dir = os.path.join(TMP_DIR, f"cuts_{uuid4()}")
         cut_files = apply_multiple_cuts(video_path, cuts_list, output_dir)
 
-        background_tasks.add_task(os.remove, video_path)
-
         if cut_files:
-            return {"message": "Vídeo cortado com sucesso!", "output_paths": cut_files}
+            return {"message": "Vídeo cortado com sucesso!", "output_paths": cut_files,
+                    "file_id": os.path.basename(video_path)}
         else:
             raise HTTPException(status_code=500, detail="Erro ao cortar vídeo em múltiplos trechos.")
 
@@ -180,7 +198,6 @@ async def cut_multiple_segments(
 
 @router.post("/concatenate/")
 async def concatenate_segments(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     files: List[UploadFile] = File(...)
 ):
@@ -191,21 +208,71 @@ async def concatenate_segments(
     input_paths = []
     try:
         for file in files:
-            path = await save_upload_file(file)
+            path, _ = await store_upload(file)
             input_paths.append(path)
 
         output_path = os.path.join(TMP_DIR, f"concatenated_{uuid4()}.mp4")
         success = concatenate_video_segments(input_paths, output_path)
 
         if success:
-            return {"message": "Vídeos concatenados com sucesso!", "output_path": output_path}
+            return {"message": "Vídeos concatenados com sucesso!", "output_path": output_path,
+                    "file_ids": [os.path.basename(path) for path in input_paths]}
         else:
             raise HTTPException(status_code=500, detail="Erro ao concatenar vídeos.")
 
     except Exception as e:
         logger.error(f"Erro ao concatenar vídeos: {e}")
         raise HTTPException(status_code=500, detail="Erro interno ao concatenar vídeos.")
-    finally:
-        for path in input_paths:
-            if os.path.exists(path):
-                background_tasks.add_task(os.remove, path)
+
+# === 📥 UPLOAD COM PROXY ===
+
+@router.post("/upload/")
+async def upload_media(current_user: User = Depends(get_current_user), file: UploadFile = File(...)):
+    """Guarda o vídeo na pasta de uploads e enfileira a geração do proxy de prévia."""
+    video_path, proxy_task_id = await store_upload(file)
+    return {"file_id": os.path.basename(video_path), "proxy_task_id": proxy_task_id}
+
+# === 🎞️ TIMELINE (EDL) ===
+
+def _load_edl(data: dict) -> EditDecisionList:
+    """Monta a EDL resolvendo cada arquivo pelo nome dentro da pasta de uploads."""
+    def resolve(name):
+        return os.path.join(settings.UPLOAD_FOLDER, os.path.basename(name)) if name else name
+
+    try:
+        edl = EditDecisionList.from_dict(data)
+    except (TypeError, AttributeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"EDL inválida: {e}")
+    for clip in edl.clips:
+        clip.source = resolve(clip.source)
+    for overlay in edl.overlays:
+        overlay.path = resolve(overlay.path)
+    if edl.voiceover:
+        edl.voiceover.path = resolve(edl.voiceover.path)
+    edl.subtitles = resolve(edl.subtitles)
+    return edl
+
+
+@router.post("/timeline/estimate")
+async def estimate_timeline(request: Request, preview: bool = False,
+                            current_user: User = Depends(get_current_user)):
+    edl = _load_edl(await request.json())
+    return (edl.proxied() if preview else edl).estimate_cost().to_dict()
+
+
+@router.post("/timeline/render")
+async def render_timeline(request: Request, preview: bool = False,
+                          current_user: User = Depends(get_current_user)):
+    """
+    Valida e estima a EDL; só enfileira o render (um único ffmpeg) se couber nos limites.
+    Com `preview`, renderiza sobre os proxies; os mesmos tempos valem para o render final.
+    """
+    edl = _load_edl(await request.json())
+    cost = (edl.proxied() if preview else edl).estimate_cost()
+    if not cost.ok:
+        raise HTTPException(status_code=422, detail=cost.errors)
+
+    output_path = os.path.join(TMP_DIR, f"{'preview' if preview else 'timeline'}_{uuid4()}.mp4")
+    task = render_timeline_task.delay(edl.to_dict(), output_path, preview)
+    logger.info(f"🎞️ Timeline enfileirada | {len(edl.clips)} clipes | estimativa {cost.estimated_seconds}s | Task ID: {task.id}")
+    return {"task_id": task.id, "output_path": output_path, "estimate": cost.to_dict()}
@@ -3,6 +3,7 @@
 import os
 import logging
 from celery import Celery
+from celery.signals import worker_process_init
 from app.config import settings  # ⬅️ importa configurações centralizadas
 
 # === 🛠️ Logger Setup ===
@@ -46,5 +47,12 @@ celery_app.conf.update(
     result_expires=3600,
 )
 
+# === 🔥 Warm-up de modelos em cada processo do worker ===
+@worker_process_init.connect
+def warm_up_models(**kwargs):
+    # Import tardio: o processo principal (e a API) não precisam carregar torch/ultralytics
+    from app.services.model_registry import warm_up_default_models
+    warm_up_default_models()
+
 # === ✅ Mensagem final ===
 logger.info("✅ Celery configurado com sucesso e pronto para processar tarefas.")
@@ -1,7 +1,7 @@
 # 📁 backend/app/routes/scenes.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from app.services.scene_detector import detect_scenes_pyscenedetect, split_scenes
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from app.services.scene_detector import detect_scenes as detect_scene_segments, split_scenes
 from app.services.redis_cache import cache_get, cache_set
 from app.auth.dependencies import get_current_user
 from app.models.user import User
@@ -27,6 +27,7 @@ logger.setLevel(logging.INFO)
 @router.post("/scenes/", dependencies=[Depends(get_current_user)])
 async def detect_scenes(
     file: UploadFile = File(...),
+    method: str = Query("content", description="Detector: content, threshold, histogram, scdet ou select (ffmpeg)"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -36,7 +37,7 @@ async def detect_scenes(
     try:
         file_bytes = await file.read()
         file_hash = md5(file_bytes).hexdigest()
-        cache_key = f"{SCENE_CACHE_PREFIX}:{file_hash}"
+        cache_key = f"{SCENE_CACHE_PREFIX}:{method}:{file_hash}"
 
         cached = cache_get(cache_key)
         if cached:
@@ -53,7 +54,7 @@ async def detect_scenes(
 
         logger.info(f"📥 Vídeo recebido '{file.filename}' salvo como '{unique_filename}' por {current_user.username}")
 
-        scenes = detect_scenes_pyscenedetect(str(input_path))
+        scenes = detect_scene_segments(str(input_path), method=method)
         if not scenes:
             logger.info(f"⚠️ Nenhuma cena detectada no vídeo '{file.filename}'")
             input_path.unlink(missing_ok=True)
@@ -3,7 +3,7 @@ from .ai_processing import process_video
 from .voice_generator import generate_voice
 from .transcription import transcribe_video
 from .video_filters import apply_opencv_filter, apply_moviepy_effect, apply_style_transfer, apply_banuba_filter
-from .scene_detector import detect_scenes_pyscenedetect, split_scenes
+from .scene_detector import detect_scenes, detect_scenes_pyscenedetect, split_scenes
 
 # 📊 Métricas e uso
 from .metrics_service import log_ia_usage, get_ia_usage
@@ -1,8 +1,12 @@
 import os, cv2, subprocess, numpy as np, logging
 from uuid import uuid4
-from typing import List
+from typing import List, Tuple
 from fastapi import UploadFile, HTTPException
-from ultralytics import YOLO
+
+from app.services.filter_chain import FilterChain, TrimStage
+from app.services.frame_sampler import iter_sampled_frames
+from app.services.model_registry import get_model
+from app.services.object_detection import YOLO_BATCH_SIZE, iter_ultralytics_detections
 
 # === 📁 Diretório temporário ===
 TMP_DIR = "/tmp"
@@ -12,79 +16,45 @@ os.makedirs(TMP_DIR, exist_ok=True)
 logger = logging.getLogger("ai_processing")
 logger.setLevel(logging.INFO)
 
-# === 🧠 YOLOv8 ===
-try:
-    yolo_model = YOLO("yolov8n.pt")
-    logger.info("✅ Modelo YOLO carregado com sucesso.")
-except Exception as e:
-    logger.error(f"❌ Falha ao carregar modelo YOLO: {e}")
-    yolo_model = None
-
 # === 🎯 Detecta momentos-chave ===
-def analyze_video(video_path: str) -> List[float]:
+def analyze_video(video_path: str, batch_size: int = YOLO_BATCH_SIZE) -> List[float]:
     moments = []
     try:
-        cap = cv2.VideoCapture(video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-        logger.info(f"📊 Analisando vídeo '{video_path}' | FPS: {fps}, Frames: {total_frames}")
+        logger.info(f"📊 Analisando vídeo '{video_path}'")
 
-        if not yolo_model:
-            logger.warning("⚠️ YOLO não carregado. Pulando análise.")
+        # YOLOv8 do registro do processo: carregado no warm-up do worker ou no primeiro uso
+        try:
+            yolo_model = get_model("yolo")
+        except Exception as e:
+            logger.warning(f"⚠️ YOLO não carregado ({e}). Pulando análise.")
             return []
 
-        for frame_num in range(0, total_frames, fps * 2):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
-            if not ret:
-                break
-            results = yolo_model(frame)
-            if results[0].boxes:
-                moments.append(frame_num / fps)
-        cap.release()
+        samples = iter_sampled_frames(video_path, interval_sec=2)
+        for timestamp, result in iter_ultralytics_detections(yolo_model, samples, batch_size):
+            if result.boxes:
+                moments.append(timestamp)
         return sorted(set(moments))
 
     except Exception as e:
         logger.error(f"❌ Erro ao analisar vídeo: {e}")
         return []
 
+# === 🎯 Trechos de 5s ao redor dos momentos-chave ===
+def select_cut_segments(video_path: str) -> List[Tuple[float, float]]:
+    key_moments = analyze_video(video_path) or [10, 30, 50]
+    logger.info(f"🎯 Momentos selecionados: {key_moments}")
+    return [(max(0, moment - 3), max(0, moment - 3) + 5) for moment in key_moments]
+
 # === ✂️ Processa cortes e concatena ===
 def process_video(video_path: str, output_path: str):
     try:
-        key_moments = analyze_video(video_path) or [10, 30, 50]
-        logger.info(f"🎯 Momentos selecionados: {key_moments}")
-
-        clips = []
-        for moment in key_moments:
-            start = max(0, moment - 3)
-            clip_path = os.path.join(TMP_DIR, f"clip_{uuid4()}.mp4")
-            subprocess.run([
-                "ffmpeg", "-y", "-i", video_path,
-                "-ss", str(start), "-t", "00:00:05",
-                "-c:v", "libx264", "-c:a", "aac", clip_path
-            ], check=True)
-            clips.append(clip_path)
-
-        list_path = os.path.join(TMP_DIR, "concat_list.txt")
-        with open(list_path, "w") as f:
-            f.writelines([f"file '{c}'\n" for c in clips])
-
-        subprocess.run([
-            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
-            "-c:v", "libx264", "-c:a", "aac", output_path
-        ], check=True)
-
+        # Todos os trechos cortados e concatenados num único ffmpeg, sem clipes intermediários
+        FilterChain(video_path).add(TrimStage(select_cut_segments(video_path))).render(output_path)
         logger.info(f"✅ Vídeo final salvo em: {output_path}")
 
-        # Limpeza
-        for clip in clips:
-            os.remove(clip)
-        os.remove(list_path)
-
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Erro FFMPEG: {e.stderr}")
-        raise HTTPException(status_code=500, detail=f"Erro FFMPEG: {e.stderr}")
+    except RuntimeError as e:
+        logger.error(f"❌ Erro FFMPEG: {e}")
+        raise HTTPException(status_code=500, detail=f"Erro FFMPEG: {e}")
     except Exception as e:
         logger.error(f"❌ Erro ao processar vídeo: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,268 @@
+# 📁 backend/app/services/analysis_cache.py
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from app.services.redis_cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Configurações ===
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", os.path.join(os.getenv("TMP_DIR", "/tmp"), "analysis_cache"))
+ANALYSIS_CACHE_MAX_MB = int(os.getenv("ANALYSIS_CACHE_MAX_MB", 2048))
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Namespace do índice no Redis; defina um por volume de cache (ex.: "backend", "celery")
+ANALYSIS_CACHE_NAMESPACE = os.getenv("ANALYSIS_CACHE_NAMESPACE", "")
+ANALYSIS_CACHE_INDEX_TTL = int(os.getenv("ANALYSIS_CACHE_INDEX_TTL", 7 * 24 * 3600))
+# A varredura de limpeza só roda depois de gravar essa fração do limite
+ANALYSIS_CACHE_EVICT_FRACTION = float(os.getenv("ANALYSIS_CACHE_EVICT_FRACTION", 0.05))
+
+# Prefixos; cada namespace tem as próprias chaves, ver AnalysisCache.__init__
+REDIS_LRU_KEY = "analysis_cache:lru"
+REDIS_SIZE_KEY = "analysis_cache:bytes"
+HASH_CHUNK_BYTES = 1024 * 1024
+HASH_MEMO_SIZE = 1024
+_EXTENSIONS = (".npy", ".npz", ".json")
+
+
+# === 🔑 Hash do conteúdo ===
+_hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_lock = threading.Lock()
+
+
+def content_hash(video_path: str) -> str:
+    """SHA-256 do arquivo, memorizado por (caminho, tamanho, mtime) nos últimos HASH_MEMO_SIZE arquivos do processo."""
+    stat = os.stat(video_path)
+    memo_key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            _hash_memo.move_to_end(memo_key)
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(video_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _hash_lock:
+        _hash_memo[memo_key] = value
+        while len(_hash_memo) > HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return value
+
+
+def params_digest(params: dict) -> str:
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+# === 🗄️ Armazenamento de sinais brutos de análise ===
+class AnalysisCache:
+    """
+    Resultados brutos de análise (movimento, rostos, detecções, níveis de áudio)
+    chaveados por (hash do conteúdo, analisador, versão, parâmetros) e gravados em
+    disco: arrays como .npy/.npz, o resto como JSON. Um índice LRU no Redis
+    (ou o mtime dos arquivos, sem Redis) limita o total a `max_mb`.
+
+    O índice no Redis é separado por namespace (ANALYSIS_CACHE_NAMESPACE, ou o
+    diretório do cache): containers que dividem o Redis mas não o disco (backend
+    e celery) não contam nem removem as entradas um do outro. O namespace não
+    muda quando o container é recriado, e as chaves do índice expiram depois de
+    `index_ttl` segundos sem uso.
+
+    A limpeza não roda a cada gravação: só depois que o processo gravou
+    `evict_fraction` do limite desde a última varredura.
+
+    Limiares de pontuação não fazem parte da chave: quem consome o sinal bruto
+    pode mudar o limiar sem decodificar o vídeo de novo.
+    """
+
+    def __init__(self, cache_dir: str = ANALYSIS_CACHE_DIR, max_mb: int = ANALYSIS_CACHE_MAX_MB,
+                 enabled: bool = ANALYSIS_CACHE_ENABLED, redis=redis_client,
+                 namespace: str = ANALYSIS_CACHE_NAMESPACE, index_ttl: int = ANALYSIS_CACHE_INDEX_TTL,
+                 evict_fraction: float = ANALYSIS_CACHE_EVICT_FRACTION):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.enabled = enabled
+        self.redis = redis
+        namespace = namespace or hashlib.sha1(os.path.realpath(cache_dir).encode()).hexdigest()[:12]
+        self.lru_key = f"{REDIS_LRU_KEY}:{namespace}"
+        self.size_key = f"{REDIS_SIZE_KEY}:{namespace}"
+        self.index_ttl = index_ttl
+        self.evict_threshold = int(self.max_bytes * evict_fraction)
+        self._written_since_evict = 0
+        self._evict_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # --- chaves e caminhos ---
+    def entry_key(self, video_path: str, analyzer: str, params: dict, version: int = 1) -> str:
+        return f"{content_hash(video_path)}_{analyzer}_v{version}_{params_digest(params)}"
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ext)
+
+    def _existing_path(self, key: str) -> Optional[str]:
+        for ext in _EXTENSIONS:
+            path = self._path(key, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    # --- leitura/escrita ---
+    def load(self, key: str) -> Any:
+        path = self._existing_path(key)
+        if path is None:
+            return None
+        if path.endswith(".npy"):
+            value = np.load(path, allow_pickle=False)
+        elif path.endswith(".npz"):
+            with np.load(path, allow_pickle=False) as data:
+                value = {name: data[name] for name in data.files}
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        self._touch(key, path)
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        if isinstance(value, np.ndarray):
+            ext = ".npy"
+        elif isinstance(value, dict) and value and all(isinstance(v, np.ndarray) for v in value.values()):
+            ext = ".npz"
+        else:
+            ext = ".json"
+        path = self._path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Escrita atômica: outro worker nunca lê um arquivo pela metade
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            if ext == ".npy":
+                np.save(f, value, allow_pickle=False)
+            elif ext == ".npz":
+                np.savez(f, **value)
+            else:
+                f.write(json.dumps(value).encode("utf-8"))
+        os.replace(tmp_path, path)
+        self._touch(key, path)
+
+        with self._evict_lock:
+            self._written_since_evict += os.path.getsize(path)
+            due = self._written_since_evict >= self.evict_threshold
+            if due:
+                self._written_since_evict = 0
+        if due:
+            self.evict_to_budget()
+
+    # --- índice LRU ---
+    def _touch(self, key: str, path: str) -> None:
+        now = time.time()
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.zadd(self.lru_key, {key: now})
+                pipe.hset(self.size_key, key, os.path.getsize(path))
+                pipe.expire(self.lru_key, self.index_ttl)
+                pipe.expire(self.size_key, self.index_ttl)
+                pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Índice Redis do cache de análise indisponível: {e}")
+        os.utime(path, (now, now))
+
+    def _forget(self, keys: list) -> None:
+        if self.redis is not None and keys:
+            try:
+                self.redis.zrem(self.lru_key, *keys)
+                self.redis.hdel(self.size_key, *keys)
+            except Exception:
+                pass
+
+    def _remove(self, key: str) -> None:
+        path = self._existing_path(key)
+        if path:
+            os.remove(path)
+        self._forget([key])
+
+    def _entries_by_age(self):
+        """[(chave, bytes)] do menos para o mais recentemente usado."""
+        if self.redis is not None:
+            try:
+                keys = self.redis.zrange(self.lru_key, 0, -1)
+                sizes = self.redis.hmget(self.size_key, keys) if keys else []
+                # Só entra na conta o que ainda está neste diretório; o resto sai do índice
+                entries, missing = [], []
+                for key, size in zip(keys, sizes):
+                    key = key.decode() if isinstance(key, bytes) else key
+                    if self._existing_path(key) is None:
+                        missing.append(key)
+                    else:
+                        entries.append((key, int(size or 0)))
+                self._forget(missing)
+                return entries
+            except Exception as e:
+                logger.warning(f"⚠️ Índice Redis do cache de análise indisponível: {e}")
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, os.path.splitext(name)[0], stat.st_size))
+        return [(key, size) for _, key, size in sorted(entries)]
+
+    def evict_to_budget(self) -> int:
+        entries = self._entries_by_age()
+        total = sum(size for _, size in entries)
+        removed = 0
+        for key, size in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"🧹 Cache de análise: {removed} entradas removidas (limite {self.max_bytes // 1024 // 1024} MB).")
+        return removed
+
+    # --- API por vídeo ---
+    def get(self, video_path: str, analyzer: str, params: dict, version: int = 1) -> Any:
+        if not self.enabled or not os.path.exists(video_path):
+            return None
+        try:
+            value = self.load(self.entry_key(video_path, analyzer, params, version))
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao ler cache de análise ({analyzer}): {e}")
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            logger.info(f"♻️ Análise '{analyzer}' reaproveitada do cache para {video_path}")
+        return value
+
+    def put(self, video_path: str, analyzer: str, params: dict, value: Any, version: int = 1) -> None:
+        if not self.enabled or value is None or not os.path.exists(video_path):
+            return
+        try:
+            self.store(self.entry_key(video_path, analyzer, params, version), value)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar cache de análise ({analyzer}): {e}")
+
+    def get_or_compute(self, video_path: str, analyzer: str, params: dict,
+                       compute: Callable[[], Any], version: int = 1) -> Any:
+        value = self.get(video_path, analyzer, params, version)
+        if value is None:
+            value = compute()
+            self.put(video_path, analyzer, params, value, version)
+        return value
+
+
+analysis_cache = AnalysisCache()
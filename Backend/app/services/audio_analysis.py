@@ -0,0 +1,193 @@
+# 📁 backend/app/services/audio_analysis.py
+
+import os
+import logging
+import librosa
+import numpy as np
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.utils.ffmpeg_pipe import iter_pcm_chunks, probe_audio_stream
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Configurações ===
+AUDIO_CHUNK_SECONDS = float(os.getenv("AUDIO_CHUNK_SECONDS", 10.0))
+INT16_FULL_SCALE = 32768.0
+
+
+def _to_dbfs(values: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        return 20 * np.log10(values / INT16_FULL_SCALE)
+
+
+# === 🎚️ Níveis por janela (streaming) ===
+def iter_audio_levels(
+    video_path: str,
+    window_ms: int = 50,
+    hop_ms: int = 25,
+    chunk_seconds: float = AUDIO_CHUNK_SECONDS,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Lê o PCM do ffmpeg em blocos fixos e calcula, para cada janela de `window_ms`
+    a cada `hop_ms`, o pico e o RMS em dBFS. Entrega (timestamps, pico_db, rms_db)
+    bloco a bloco; a memória depende só do tamanho do bloco, não da duração.
+
+    As janelas seguem o mesmo grid do laço pydub antigo: início em k * hop_ms e
+    timestamp no centro da janela.
+    """
+    sample_rate, channels = probe_audio_stream(video_path)
+    window = max(1, int(round(window_ms * sample_rate / 1000)))
+    chunk_frames = max(window, int(chunk_seconds * sample_rate))
+
+    # Sobra do bloco anterior: amostras ainda necessárias para as próximas janelas
+    carry_peak = np.empty(0, dtype=np.int32)
+    carry_sq = np.empty(0, dtype=np.float64)
+    carry_offset = 0
+    next_k = 0
+
+    for chunk in iter_pcm_chunks(video_path, channels, chunk_frames):
+        samples = chunk.astype(np.int32)
+        peak = np.abs(samples).max(axis=1)
+        sq = (samples.astype(np.float64) ** 2).mean(axis=1)
+
+        buf_peak = np.concatenate((carry_peak, peak))
+        buf_sq = np.concatenate((carry_sq, sq))
+        buf_end = carry_offset + len(buf_peak)
+
+        # Janelas completas dentro do buffer atual
+        max_windows = len(buf_peak) * 1000 // (hop_ms * sample_rate) + 2
+        ks = np.arange(next_k, next_k + max_windows, dtype=np.int64)
+        starts = ks * hop_ms * sample_rate // 1000
+        valid = starts + window <= buf_end
+        ks, starts = ks[valid], starts[valid]
+
+        if len(ks):
+            local = starts - carry_offset
+            peaks_db = _to_dbfs(sliding_window_view(buf_peak, window)[local].max(axis=1).astype(np.float64))
+            csum = np.concatenate(([0.0], np.cumsum(buf_sq)))
+            rms = np.sqrt((csum[local + window] - csum[local]) / window)
+            rms_db = _to_dbfs(rms)
+            timestamps = (ks * hop_ms + window_ms / 2) / 1000.0
+            yield timestamps, peaks_db, rms_db
+            next_k = int(ks[-1]) + 1
+
+        keep_from = next_k * hop_ms * sample_rate // 1000 - carry_offset
+        keep_from = min(max(keep_from, 0), len(buf_peak))
+        carry_peak = buf_peak[keep_from:]
+        carry_sq = buf_sq[keep_from:]
+        carry_offset += keep_from
+
+
+# === 🔊 Picos de áudio (incremental) ===
+def iter_audio_peaks(
+    video_path: str,
+    peak_threshold: float = -20,
+    window_ms: int = 50,
+    hop_ms: int = 25,
+    metric: str = "peak",
+) -> Iterator[float]:
+    """Emite, em ordem, os timestamps das janelas cujo nível (pico ou RMS) supera o limiar."""
+    for timestamps, peaks_db, rms_db in iter_audio_levels(video_path, window_ms, hop_ms):
+        levels = rms_db if metric == "rms" else peaks_db
+        for t in timestamps[levels > peak_threshold]:
+            yield float(t)
+
+
+def compute_audio_levels(video_path: str, window_ms: int = 50, hop_ms: int = 25) -> Dict[str, np.ndarray]:
+    """Níveis de todas as janelas {times, peak_db, rms_db}: sinal bruto reaproveitável para qualquer limiar."""
+    parts = list(iter_audio_levels(video_path, window_ms, hop_ms))
+    if not parts:
+        return {"times": np.empty(0), "peak_db": np.empty(0), "rms_db": np.empty(0)}
+    times, peak_db, rms_db = (np.concatenate(column) for column in zip(*parts))
+    return {"times": times, "peak_db": peak_db, "rms_db": rms_db}
+
+
+def analyze_audio_peaks(video_path: str, peak_threshold: float = -20, cache=None) -> List[float]:
+    """
+    Timestamps com pico acima de `peak_threshold`. Com `cache` (AnalysisCache), os
+    níveis brutos são guardados por conteúdo e um novo limiar não relê o áudio.
+    """
+    if not os.path.exists(video_path):
+        logger.error(f"❌ Arquivo de vídeo não encontrado: {video_path}")
+        return []
+
+    try:
+        if cache is None:
+            peaks = list(iter_audio_peaks(video_path, peak_threshold))
+        else:
+            levels = cache.get_or_compute(video_path, "audio_levels", {"window_ms": 50, "hop_ms": 25},
+                                          lambda: compute_audio_levels(video_path))
+            peaks = levels["times"][levels["peak_db"] > peak_threshold].tolist()
+        logger.info(f"🔊 {len(peaks)} picos de áudio detectados.")
+        return peaks
+    except Exception as e:
+        logger.error(f"❌ Erro na análise de picos de áudio: {e}")
+        return []
+
+
+# === 🎼 Características do áudio em colunas ===
+class AudioFeatures(NamedTuple):
+    """Features alinhadas por frame espectral; `times` é crescente."""
+
+    times: np.ndarray
+    spectral_centroid: np.ndarray
+    is_music: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "AudioFeatures":
+        return cls(np.empty(0), np.empty(0), np.empty(0, dtype=bool))
+
+    def __bool__(self) -> bool:
+        return len(self.times) > 0
+
+    def window(self, center: float, radius: float) -> slice:
+        """Fatia dos frames com |t - center| < radius, por busca binária."""
+        lo = np.searchsorted(self.times, center - radius, side="right")
+        hi = np.searchsorted(self.times, center + radius, side="left")
+        return slice(int(lo), int(hi))
+
+    def to_dict(self) -> dict:
+        """Formato antigo {t: {'spectral_centroid', 'is_music'}}, para consumidores legados."""
+        return {
+            float(t): {"spectral_centroid": float(c), "is_music": bool(m)}
+            for t, c, m in zip(self.times, self.spectral_centroid, self.is_music)
+        }
+
+
+def near_any(times: np.ndarray, events: np.ndarray, tolerance: float) -> np.ndarray:
+    """Máscara: para cada t, existe evento com |t - e| < tolerance (events ordenado)."""
+    if len(events) == 0:
+        return np.zeros(len(times), dtype=bool)
+    idx = np.searchsorted(events, times)
+    left = events[np.clip(idx - 1, 0, len(events) - 1)]
+    right = events[np.clip(idx, 0, len(events) - 1)]
+    return np.minimum(np.abs(times - left), np.abs(right - times)) < tolerance
+
+
+def extract_audio_features(video_path: str, beat_tolerance: float = 0.2) -> AudioFeatures:
+    y, sr = librosa.load(video_path)
+    centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+    _, beats = librosa.beat.beat_track(y=y, sr=sr)
+    beat_times = np.sort(librosa.frames_to_time(beats, sr=sr))
+    times = librosa.frames_to_time(np.arange(len(centroid)), sr=sr)
+    return AudioFeatures(times, centroid.astype(np.float64), near_any(times, beat_times, beat_tolerance))
+
+
+def analyze_audio_features(video_path: str, cache=None) -> AudioFeatures:
+    if not os.path.exists(video_path):
+        logger.error(f"❌ Arquivo de vídeo não encontrado: {video_path}")
+        return AudioFeatures.empty()
+
+    try:
+        if cache is None:
+            features = extract_audio_features(video_path)
+        else:
+            value = cache.get_or_compute(video_path, "audio_features", {"beat_tolerance": 0.2},
+                                         lambda: extract_audio_features(video_path)._asdict())
+            features = AudioFeatures(value["times"], value["spectral_centroid"], value["is_music"].astype(bool))
+        logger.info(f"🎶 Features extraídas de {len(features.times)} instantes.")
+        return features
+    except Exception as e:
+        logger.error(f"❌ Erro nas features de áudio: {e}")
+        return AudioFeatures.empty()
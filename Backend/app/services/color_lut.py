@@ -0,0 +1,133 @@
+# 📁 backend/app/services/color_lut.py
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# === ⚙️ Configuração ===
+COLOR_LUT_DIR = os.getenv("COLOR_LUT_DIR", os.path.join(tempfile.gettempdir(), "color_luts"))
+COLOR_LUT_CUBE_SIZE = int(os.getenv("COLOR_LUT_CUBE_SIZE", 33))
+
+IDENTITY = np.eye(3)
+LUMA = np.array([[0.299, 0.587, 0.114]] * 3)
+# Mesma matriz do filtro sepia original (aplicada sobre BGR), reescrita em ordem RGB
+SEPIA = np.array([[0.189, 0.769, 0.393],
+                  [0.168, 0.686, 0.349],
+                  [0.131, 0.534, 0.272]])
+
+
+# === 🎨 Definição de um look ===
+@dataclass(frozen=True)
+class ColorLook:
+    """
+    Efeito de cor como `curve(clip(matrix @ rgb))`, com valores RGB em [0, 1].
+
+    `matrix` mistura canais (3x3, linhas = saída R, G, B); `curve` é aplicada
+    canal a canal e recebe/retorna arrays (..., 3).
+    """
+    matrix: np.ndarray = field(default_factory=lambda: IDENTITY)
+    curve: Optional[Callable[[np.ndarray], np.ndarray]] = None
+
+    def evaluate(self, rgb: np.ndarray, strength: float = 1.0) -> np.ndarray:
+        matrix = IDENTITY + strength * (self.matrix - IDENTITY)
+        out = np.clip(rgb @ matrix.T, 0.0, 1.0)
+        if self.curve is not None:
+            out = out + strength * (self.curve(out) - out)
+        return np.clip(out, 0.0, 1.0)
+
+
+def _vintage_curve(v: np.ndarray) -> np.ndarray:
+    # pretos levantados, altas luzes suaves e tom quente
+    return (0.06 + 0.88 * v) * np.array([1.04, 1.0, 0.88])
+
+
+def _bw_curve(v: np.ndarray) -> np.ndarray:
+    return (v - 0.5) * 1.25 + 0.5
+
+
+COLOR_LOOKS: Dict[str, ColorLook] = {
+    "sepia": ColorLook(SEPIA),
+    "vintage": ColorLook(0.55 * IDENTITY + 0.45 * SEPIA, _vintage_curve),
+    "grayscale": ColorLook(LUMA),
+    "bw": ColorLook(LUMA, _bw_curve),
+    # equivalente ao vfx.colorx(1.4) do MoviePy
+    "color_boost": ColorLook(curve=lambda v: v * 1.4),
+}
+
+
+# === 🧮 Tabelas pré-calculadas ===
+class ColorLUT:
+    """
+    Look pré-calculado em tabelas.
+
+    - Caminho Python: mistura de canais em inteiro (`cv2.transform`, uint8 com
+      saturação, pulado se identidade) + LUT de 256 entradas por canal (`cv2.LUT`).
+    - Caminho nativo: LUT 3D exportada em `.cube` para o filtro `lut3d` do ffmpeg.
+    """
+
+    def __init__(self, name: str, strength: float = 1.0):
+        if name not in COLOR_LOOKS:
+            raise ValueError(f"Look de cor desconhecido: {name}")
+        self.name = name
+        self.strength = strength
+        self.look = COLOR_LOOKS[name]
+
+        matrix = IDENTITY + strength * (self.look.matrix - IDENTITY)
+        self.matrix_rgb = None if np.allclose(matrix, IDENTITY) else matrix
+        self.table_rgb = None
+        if self.look.curve is not None:
+            ramp = np.repeat(np.linspace(0.0, 1.0, 256)[:, None], 3, axis=1)
+            curve = ramp + strength * (self.look.curve(ramp) - ramp)
+            self.table_rgb = np.clip(np.rint(curve * 255), 0, 255).astype(np.uint8).reshape(1, 256, 3)
+
+    def apply(self, frame: np.ndarray, channel_order: str = "bgr") -> np.ndarray:
+        """Aplica o look a um frame uint8 (BGR do OpenCV ou RGB do MoviePy)."""
+        bgr = channel_order == "bgr"
+        if self.matrix_rgb is not None:
+            frame = cv2.transform(frame, self.matrix_rgb[::-1, ::-1] if bgr else self.matrix_rgb)
+        if self.table_rgb is not None:
+            frame = cv2.LUT(frame, self.table_rgb[..., ::-1] if bgr else self.table_rgb)
+        return frame
+
+    def lut_3d(self, size: int = COLOR_LUT_CUBE_SIZE) -> np.ndarray:
+        """Reticulado (B, G, R, 3) em RGB [0, 1]: achatado em ordem C, R varia mais rápido (ordem .cube)."""
+        grid = np.linspace(0.0, 1.0, size)
+        b, g, r = np.meshgrid(grid, grid, grid, indexing="ij")
+        return self.look.evaluate(np.stack([r, g, b], axis=-1), self.strength).astype(np.float32)
+
+    def write_cube(self, path: str, size: int = COLOR_LUT_CUBE_SIZE, lut: Optional[np.ndarray] = None) -> str:
+        lut = self.lut_3d(size) if lut is None else lut
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(f'TITLE "{self.name}"\nLUT_3D_SIZE {size}\nDOMAIN_MIN 0 0 0\nDOMAIN_MAX 1 1 1\n')
+            np.savetxt(f, lut.reshape(-1, 3), fmt="%.6f")
+        os.replace(tmp_path, path)
+        return path
+
+    def cube_path(self, size: int = COLOR_LUT_CUBE_SIZE) -> str:
+        """Arquivo `.cube` do look; o nome leva um digest da tabela, então mudar o look gera outro arquivo."""
+        lut = self.lut_3d(size)
+        digest = hashlib.sha1(lut.tobytes()).hexdigest()[:10]
+        path = os.path.join(COLOR_LUT_DIR, f"{self.name}_{size}_{digest}.cube")
+        if not os.path.exists(path):
+            os.makedirs(COLOR_LUT_DIR, exist_ok=True)
+            self.write_cube(path, size, lut)
+            logger.info(f"🎨 LUT 3D '{self.name}' exportada → {path}")
+        return path
+
+    def ffmpeg_graph(self) -> str:
+        return f"lut3d=file='{self.cube_path()}':interp=tetrahedral"
+
+
+@lru_cache(maxsize=64)
+def get_color_lut(name: str, strength: float = 1.0) -> ColorLUT:
+    return ColorLUT(name, strength)
@@ -1,10 +1,17 @@
 # 🎬 Serviços de Corte e Edição de Vídeo
 
 import os
+import shutil
 import logging
-from typing import List, Tuple
-from moviepy.editor import VideoFileClip, concatenate_videoclips
-import cv2
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.services.scene_engine import SceneEngine
+from app.utils.ffmpeg_pipe import probe_keyframe_times, probe_media, probe_stream_signature, probe_video_stream
+from app.utils.smart_cut import smart_cut
+from app.utils.video_tools import x264_encode_args
 
 # === 🛠️ Logger ===
 logger = logging.getLogger("editor")
@@ -15,6 +22,9 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# 0 = um corte simultâneo por núcleo
+CUT_WORKERS = int(os.getenv("CUT_WORKERS", 0))
+
 # === ✂️ Corte Único ===
 def apply_cut(video_path: str, start_time: float, end_time: float, output_path: str) -> str | None:
     """Aplica um único corte a um vídeo."""
@@ -24,13 +34,13 @@ def apply_cut(video_path: str, start_time: float, end_time: float, output_path:
             logger.error(f"❌ Arquivo não encontrado: {video_path}")
             return None
 
-        with VideoFileClip(video_path) as clip:
-            if start_time < 0 or end_time > clip.duration or start_time >= end_time:
-                logger.warning(f"⚠️ Intervalo inválido: [{start_time}-{end_time}] (duração: {clip.duration})")
-                return None
+        duration, _ = probe_media(video_path)
+        if start_time < 0 or end_time > duration or start_time >= end_time:
+            logger.warning(f"⚠️ Intervalo inválido: [{start_time}-{end_time}] (duração: {duration})")
+            return None
 
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            clip.subclip(start_time, end_time).write_videofile(output_path, codec="libx264", audio_codec="aac", logger=None)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        smart_cut(video_path, start_time, end_time, output_path)
 
         logger.info(f"✅ Corte salvo em: {output_path}")
         return output_path
@@ -39,30 +49,73 @@ def apply_cut(video_path: str, start_time: float, end_time: float, output_path:
         return None
 
 # === ✂️ Múltiplos Cortes ===
-def apply_multiple_cuts(video_path: str, cuts: List[dict], output_dir: str, base_name: str = "cut") -> List[str]:
-    """Aplica vários cortes em um vídeo, gerando arquivos separados."""
+def cut_worker_budget(jobs: int, workers: Optional[int] = None) -> Tuple[int, int]:
+    """(cortes simultâneos, threads do ffmpeg por corte) sem passar do número de núcleos."""
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or CUT_WORKERS or cores, jobs, cores))
+    return workers, max(1, cores // workers)
+
+
+def run_cuts(video_path: str, jobs: List[Tuple[float, float, str]], workers: Optional[int] = None,
+             keyframes=None) -> List[str]:
+    """
+    Executa os cortes (início, fim, saída) com o corte inteligente, no máximo
+    `workers` ffmpeg ao mesmo tempo. Cada corte espera o próprio processo
+    terminar antes de liberar a vaga; uma falha cancela os cortes que ainda não
+    começaram, remove as saídas já gravadas e é propagada.
+    """
+    if not jobs:
+        return []
+    keyframes = probe_keyframe_times(video_path) if keyframes is None else keyframes
+    workers, threads = cut_worker_budget(len(jobs), workers)
+    logger.info(f"⚙️ {len(jobs)} cortes em {workers} processos ffmpeg paralelos × {threads} threads")
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Threads só disparam e aguardam os ffmpeg: o trabalho pesado roda nos subprocessos
+        futures = [executor.submit(smart_cut, video_path, start, end, out_path,
+                                   keyframes=keyframes, threads=threads)
+                   for start, end, out_path in jobs]
+        for future in futures:
+            future.result()
+    except BaseException:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for _, _, out_path in jobs:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+        raise
+    executor.shutdown(wait=True)
+    return [out_path for _, _, out_path in jobs]
+
+
+def apply_multiple_cuts(video_path: str, cuts: List[dict], output_dir: str, base_name: str = "cut",
+                        workers: Optional[int] = None) -> List[str]:
+    """
+    Aplica vários cortes em um vídeo, gerando arquivos separados.
+
+    Os cortes são renderizados em paralelo (cada um é um ffmpeg) com threads por
+    processo divididas entre os núcleos; a saída segue a ordem dos cortes e uma
+    falha cancela os que ainda não começaram.
+    """
     logger.info(f"📎 Múltiplos cortes em: {video_path} => {output_dir}")
-    cut_files = []
+
+    if not os.path.exists(video_path):
+        logger.error(f"❌ Vídeo não encontrado: {video_path}")
+        return []
 
     try:
-        if not os.path.exists(video_path):
-            logger.error(f"❌ Vídeo não encontrado: {video_path}")
-            return []
-
-        with VideoFileClip(video_path) as clip:
-            os.makedirs(output_dir, exist_ok=True)
-
-            for i, cut in enumerate(cuts):
-                start = cut.get("start")
-                end = cut.get("end")
-                if start is not None and end is not None and 0 <= start < end <= clip.duration:
-                    out_path = os.path.join(output_dir, f"{base_name}_{i+1}.mp4")
-                    logger.info(f"⏱️ Corte {i+1}: [{start}-{end}] => {out_path}")
-                    clip.subclip(start, end).write_videofile(out_path, codec="libx264", audio_codec="aac", logger=None)
-                    cut_files.append(out_path)
-                else:
-                    logger.warning(f"⚠️ Corte inválido ignorado: {cut}")
+        duration, _ = probe_media(video_path)
+        os.makedirs(output_dir, exist_ok=True)
+
+        jobs = []
+        for i, cut in enumerate(cuts):
+            start = cut.get("start")
+            end = cut.get("end")
+            if start is not None and end is not None and 0 <= start < end <= duration:
+                jobs.append((start, end, os.path.join(output_dir, f"{base_name}_{i+1}.mp4")))
+            else:
+                logger.warning(f"⚠️ Corte inválido ignorado: {cut}")
 
+        cut_files = run_cuts(video_path, jobs, workers)
         logger.info(f"✅ Total de cortes realizados: {len(cut_files)}")
         return cut_files
     except Exception as e:
@@ -70,76 +123,101 @@ def apply_multiple_cuts(video_path: str, cuts: List[dict], output_dir: str, base
         return []
 
 # === 🔗 Concatenar Vídeos ===
-def concatenate_video_segments(video_paths: List[str], output_path: str) -> str | None:
-    """Concatena uma lista de vídeos em um único arquivo."""
-    logger.info(f"🔗 Concatenando vídeos: {video_paths} => {output_path}")
-    clips = []
+def _run_ffmpeg(cmd: List[str]) -> None:
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
 
-    try:
+
+def _concat_copy(video_paths: List[str], output_path: str, work_dir: str) -> None:
+    """Concat demuxer com cópia de stream: lê um arquivo por vez, memória constante."""
+    list_path = os.path.join(work_dir, "inputs.txt")
+    with open(list_path, "w") as f:
         for path in video_paths:
-            if os.path.exists(path):
-                clips.append(VideoFileClip(path))
-            else:
-                logger.warning(f"⚠️ Ignorado (não encontrado): {path}")
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    _run_ffmpeg([
+        "ffmpeg", "-y", "-v", "error", "-nostdin", "-f", "concat", "-safe", "0", "-i", list_path,
+        "-map", "0:v:0", "-map", "0:a?", "-c", "copy", "-movflags", "+faststart", output_path,
+    ])
+
+
+def _normalize(path: str, output_path: str, width: int, height: int, fps: float, with_audio: bool) -> None:
+    """Reencoda um clipe para o formato comum (tamanho/fps do primeiro, H.264 + AAC 48 kHz estéreo)."""
+    cmd = ["ffmpeg", "-y", "-v", "error", "-nostdin", "-i", path]
+    has_audio = probe_stream_signature(path)[1] is not None
+    if with_audio and not has_audio:
+        # Silêncio para manter o áudio alinhado entre clipes com e sem som
+        cmd += ["-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo"]
+    cmd += [
+        "-map", "0:v:0",
+        "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+               f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps:.6f}",
+        *x264_encode_args(), "-video_track_timescale", "90000",
+    ]
+    if with_audio:
+        cmd += ["-map", "0:a:0" if has_audio else "1:a:0", "-c:a", "aac", "-ar", "48000", "-ac", "2", "-shortest"]
+    _run_ffmpeg(cmd + [output_path])
 
-        if not clips:
-            logger.error("❌ Nenhum vídeo válido para concatenação.")
-            return None
 
-        final = concatenate_videoclips(clips)
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        final.write_videofile(output_path, codec="libx264", audio_codec="aac", logger=None)
+def concatenate_video_segments(video_paths: List[str], output_path: str) -> str | None:
+    """
+    Concatena uma lista de vídeos em um único arquivo.
+
+    Se todos os clipes têm a mesma assinatura de streams (codec, resolução, pix_fmt,
+    time base, áudio), junta por cópia com o concat demuxer; senão cada clipe é
+    normalizado uma vez (um por vez) e o resultado é juntado por cópia.
+    """
+    logger.info(f"🔗 Concatenando vídeos: {video_paths} => {output_path}")
+    paths = []
+    for path in video_paths:
+        if os.path.exists(path):
+            paths.append(path)
+        else:
+            logger.warning(f"⚠️ Ignorado (não encontrado): {path}")
+
+    if not paths:
+        logger.error("❌ Nenhum vídeo válido para concatenação.")
+        return None
 
+    work_dir = tempfile.mkdtemp(prefix="concat_")
+    try:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        signatures = [probe_stream_signature(path) for path in paths]
+
+        if len(set(signatures)) == 1:
+            logger.info("⚡ Clipes compatíveis: concatenação por cópia de stream")
+        else:
+            logger.info("🔄 Clipes com formatos diferentes: normalizando antes de concatenar")
+            width, height, fps = probe_video_stream(paths[0])
+            with_audio = any(audio is not None for _, audio in signatures)
+            normalized = []
+            for i, path in enumerate(paths):
+                normalized_path = os.path.join(work_dir, f"norm_{i}.mp4")
+                _normalize(path, normalized_path, width - width % 2, height - height % 2, fps or 30.0, with_audio)
+                normalized.append(normalized_path)
+            paths = normalized
+
+        _concat_copy(paths, output_path, work_dir)
         logger.info(f"✅ Concatenação salva em: {output_path}")
         return output_path
     except Exception as e:
         logger.error(f"❌ Erro ao concatenar vídeos: {e}")
         return None
     finally:
-        for clip in clips:
-            clip.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
 
 # === 🎬 Detecção de Cenas ===
 def detect_scenes(video_path: str, threshold: float = 30.0) -> List[Tuple[float, float]]:
     """
-    Detecta cenas com base na diferença entre quadros consecutivos.
+    Detecta cenas com base na diferença entre quadros consecutivos: média de
+    |Δcinza| acima de `threshold` (mesma escala 0-255 do detector antigo), em frames reduzidos.
     Retorna uma lista de (start_time, end_time).
     """
     logger.info(f"🎬 Iniciando detecção de cenas: {video_path}")
-    scenes = []
-    cap = cv2.VideoCapture(video_path)
-
-    if not cap.isOpened():
+    if not os.path.exists(video_path):
         raise ValueError("Erro ao abrir o vídeo.")
 
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration = frame_count / fps
-    prev_frame = None
-    scene_start = 0.0
-
-    for i in range(frame_count):
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        if prev_frame is not None:
-            diff = cv2.absdiff(prev_frame, gray)
-            score = diff.mean()
-
-            if score > threshold:
-                scene_end = i / fps
-                if scene_end > scene_start:
-                    scenes.append((scene_start, scene_end))
-                scene_start = scene_end
-
-        prev_frame = gray
-
-    if scene_start < duration:
-        scenes.append((scene_start, duration))
-
-    cap.release()
+    scenes = SceneEngine("absdiff", threshold).detect(video_path)
     logger.info(f"✅ Cenas detectadas: {len(scenes)}")
     return scenes
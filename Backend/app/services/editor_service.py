@@ -6,13 +6,13 @@ import logging
 from uuid import uuid4
 from typing import List, Tuple
 
-import cv2
 from fastapi import UploadFile, HTTPException, Depends
 from openai import ChatCompletion
 
 from app.config import settings
 from app.auth.dependencies import get_current_user
 from app.models.user import User
+from app.services.scene_engine import SceneEngine
 
 # === 📁 Diretórios Temporários ===
 STATIC_DIR = os.getenv("STATIC_DIR", "static")
@@ -88,39 +88,13 @@ def generate_ai_script(prompt: str, user: User = Depends(get_current_user)) -> d
 
 # === 🎬 Corte por Diferença de Quadros ===
 def detect_scenes(video_path: str, threshold: float = 30.0) -> List[Tuple[float, float]]:
-    """Detecta mudanças de cena com base na diferença de quadros."""
-    scenes = []
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
+    """
+    Detecta mudanças de cena com base na diferença de quadros: média de |Δcinza|
+    acima de `threshold` (mesma escala 0-255 do detector antigo), em frames reduzidos.
+    """
+    if not os.path.exists(video_path):
         raise ValueError("Erro ao abrir o vídeo.")
-
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration = frame_count / fps
-    prev_frame = None
-    scene_start = 0.0
-
-    for i in range(frame_count):
-        ret, frame = cap.read()
-        if not ret:
-            break
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        if prev_frame is not None:
-            diff = cv2.absdiff(prev_frame, gray)
-            score = diff.mean()
-            if score > threshold:
-                scene_end = i / fps
-                if scene_end > scene_start:
-                    scenes.append((scene_start, scene_end))
-                scene_start = scene_end
-        prev_frame = gray
-
-    if scene_start < duration:
-        scenes.append((scene_start, duration))
-
-    cap.release()
-    return scenes
+    return SceneEngine("absdiff", threshold).detect(video_path)
 
 # === ✂️ Corte Automático por Histograma ===
 def detect_scenes_by_histogram(
@@ -133,37 +107,16 @@ def detect_scenes_by_histogram(
     logger.info(f"📽️ Iniciando detecção de cenas via histograma: {video_path}")
     scenes = []
     try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
+        if not os.path.exists(video_path):
             raise ValueError("Não foi possível abrir o vídeo.")
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = frame_count / fps
-        prev_hist = None
-        last_cut = 0.0
-
-        for frame_num in range(frame_count):
-            ret, frame = cap.read()
-            if not ret:
-                break
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
-            hist = cv2.normalize(hist, hist).flatten()
-
-            if prev_hist is not None:
-                diff = cv2.compareHist(prev_hist, hist, cv2.HISTCMP_CORREL)
-                if diff < threshold:
-                    scene_end = frame_num / fps
-                    if scene_end - last_cut >= min_scene_length:
-                        scenes.append({"start": last_cut, "end": scene_end})
-                        last_cut = scene_end
-            prev_hist = hist
-
-        if duration - last_cut >= min_scene_length:
-            scenes.append({"start": last_cut, "end": duration})
-
-        cap.release()
+        engine = SceneEngine("histogram", threshold, min_scene_len=min_scene_length)
+        bounds = engine.detect(video_path)
+        # A última cena só entra se também tiver a duração mínima
+        if bounds and bounds[-1][1] - bounds[-1][0] < min_scene_length:
+            bounds = bounds[:-1]
+        scenes = [{"start": start, "end": end} for start, end in bounds]
+
         logger.info(f"✅ {len(scenes)} cenas detectadas com histograma.")
         return {
             "scenes": scenes,
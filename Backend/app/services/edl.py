@@ -0,0 +1,308 @@
+# 📁 backend/app/services/edl.py
+
+import logging
+import math
+import os
+import re
+import subprocess
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from app.services.proxy_media import PROXY_HEIGHT, resolve_media
+from app.utils.ffmpeg_pipe import probe_media, probe_video_stream
+from app.utils.video_tools import x264_encode_args
+
+logger = logging.getLogger(__name__)
+
+# === ⚙️ Limites e modelo de custo ===
+EDL_MAX_CLIPS = int(os.getenv("EDL_MAX_CLIPS", 200))
+EDL_MAX_OUTPUT_SECONDS = float(os.getenv("EDL_MAX_OUTPUT_SECONDS", 900))
+EDL_MAX_RENDER_SECONDS = float(os.getenv("EDL_MAX_RENDER_SECONDS", 1800))
+# Vazão aproximada de um worker (pixels/s): decode H.264 e encode x264 no preset padrão
+EDL_DECODE_PIXELS_PER_SEC = float(os.getenv("EDL_DECODE_PIXELS_PER_SEC", 400e6))
+EDL_ENCODE_PIXELS_PER_SEC = float(os.getenv("EDL_ENCODE_PIXELS_PER_SEC", 60e6))
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+AUDIO_FORMAT = "aformat=sample_fmts=fltp:sample_rates=48000:channel_layouts=stereo"
+# Posição da sobreposição: número ou expressão simples com W/H/w/h (nada de ':' ';' '[' nem nomes de filtro)
+POSITION_PATTERN = re.compile(r"^[0-9WwHh+\-*/(). ]+$")
+
+
+# === ✅ Validação dos campos vindos do JSON ===
+def _number(value, name: str) -> float:
+    """Campo numérico da EDL: float finito e não negativo; qualquer outra coisa é ValueError."""
+    if isinstance(value, bool):
+        raise ValueError(f"'{name}' deve ser numérico.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' deve ser numérico, recebido {value!r}.")
+    if not math.isfinite(number) or number < 0:
+        raise ValueError(f"'{name}' deve ser um número finito e não negativo, recebido {value!r}.")
+    return number
+
+
+def _position(value, name: str) -> str:
+    """x/y da sobreposição entram no filter_complex: só números ou expressões da lista permitida."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{_number(value, name):g}"
+    if isinstance(value, str) and POSITION_PATTERN.match(value):
+        return value
+    raise ValueError(f"'{name}' inválido: use um número ou uma expressão com W, H, w, h e + - * / ( ).")
+
+
+# === 🧱 Modelo da lista de decisões de edição ===
+@dataclass
+class EDLClip:
+    """Trecho [start, end) de uma fonte, com filtros de cor/efeito e fades próprios."""
+    source: str
+    start: float
+    end: float
+    filters: List[str] = field(default_factory=list)
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+
+    def __post_init__(self):
+        self.source = str(self.source)
+        for name in ("start", "end", "fade_in", "fade_out"):
+            setattr(self, name, _number(getattr(self, name), name))
+        if not isinstance(self.filters, list):
+            raise ValueError("'filters' deve ser uma lista de nomes.")
+        self.filters = [str(name) for name in self.filters]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class VoiceoverTrack:
+    """Áudio mixado sobre a trilha do vídeo a partir de `start` (s na timeline)."""
+    path: str
+    start: float = 0.0
+    volume: float = 1.0
+
+    def __post_init__(self):
+        self.path = str(self.path)
+        self.start = _number(self.start, "start")
+        self.volume = _number(self.volume, "volume")
+
+
+@dataclass
+class OverlayTrack:
+    """Imagem ou vídeo sobreposto em (x, y) entre `start` e `end` (s na timeline)."""
+    path: str
+    start: float = 0.0
+    end: Optional[float] = None
+    x: str = "W-w-20"
+    y: str = "20"
+
+    def __post_init__(self):
+        self.path = str(self.path)
+        self.start = _number(self.start, "start")
+        self.end = _number(self.end, "end") if self.end is not None else None
+        self.x = _position(self.x, "x")
+        self.y = _position(self.y, "y")
+
+
+@dataclass
+class RenderCost:
+    """Estimativa feita antes de enfileirar; `errors` não vazio = render recusado."""
+    output_seconds: float
+    output_size: Tuple[int, int]
+    estimated_seconds: float
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "ok": self.ok}
+
+
+@dataclass
+class EditDecisionList:
+    """
+    Edição completa: clipes em ordem, trilhas opcionais de narração, legenda
+    (arquivo .srt queimado no vídeo) e sobreposições. `height` define a altura
+    de saída (padrão: a do primeiro clipe); fps segue o primeiro clipe.
+    """
+    clips: List[EDLClip]
+    voiceover: Optional[VoiceoverTrack] = None
+    subtitles: Optional[str] = None
+    overlays: List[OverlayTrack] = field(default_factory=list)
+    height: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EditDecisionList":
+        """
+        EDL a partir do JSON da requisição. Campos numéricos viram float (finito,
+        não negativo) e x/y das sobreposições passam pela lista permitida: valor
+        fora disso levanta ValueError antes de chegar ao filter_complex.
+        """
+        voiceover = data.get("voiceover")
+        subtitles, height = data.get("subtitles"), data.get("height")
+        if height is not None:
+            height = int(_number(height, "height")) or None
+        return cls(
+            clips=[EDLClip(**clip) for clip in data.get("clips", [])],
+            voiceover=VoiceoverTrack(**voiceover) if voiceover else None,
+            subtitles=str(subtitles) if subtitles else None,
+            overlays=[OverlayTrack(**overlay) for overlay in data.get("overlays", [])],
+            height=height,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def duration(self) -> float:
+        return sum(clip.duration for clip in self.clips)
+
+    def proxied(self) -> "EditDecisionList":
+        """
+        Cópia para prévia: cada clipe lê o proxy da fonte (ou a fonte, se o proxy
+        ainda não existe) e a saída fica na altura do proxy. Os tempos dos clipes
+        não mudam: o proxy tem os mesmos frames e timestamps do original.
+        """
+        clips = [replace(clip, source=resolve_media(clip.source)) for clip in self.clips]
+        return replace(self, clips=clips, height=min(self.height or PROXY_HEIGHT, PROXY_HEIGHT))
+
+    # === 🔍 Validação e estimativa de custo (antes de enfileirar) ===
+    def probe_sources(self) -> Dict[str, dict]:
+        probes = {}
+        for path in {clip.source for clip in self.clips}:
+            if os.path.exists(path):
+                width, height, fps = probe_video_stream(path)
+                duration, has_audio = probe_media(path)
+                probes[path] = {"width": width, "height": height, "fps": fps or 30.0,
+                                "duration": duration, "has_audio": has_audio}
+        return probes
+
+    def output_format(self, probes: Dict[str, dict]) -> Tuple[int, int, float]:
+        first = probes[self.clips[0].source]
+        height = self.height or first["height"]
+        width = round(first["width"] * height / first["height"])
+        return width - width % 2, height - height % 2, first["fps"]
+
+    def estimate_cost(self, probes: Optional[Dict[str, dict]] = None) -> RenderCost:
+        """Valida a EDL e estima o tempo de render de um único passe ffmpeg."""
+        probes = self.probe_sources() if probes is None else probes
+        from app.services.video_filters import ffmpeg_filter_graph
+
+        errors = []
+        if not self.clips:
+            errors.append("A EDL não tem clipes.")
+        if len(self.clips) > EDL_MAX_CLIPS:
+            errors.append(f"Máximo de {EDL_MAX_CLIPS} clipes por render.")
+        for i, clip in enumerate(self.clips):
+            probe = probes.get(clip.source)
+            if probe is None:
+                errors.append(f"Clipe {i + 1}: fonte não encontrada ({os.path.basename(clip.source)}).")
+            elif not 0 <= clip.start < clip.end <= probe["duration"] + 1e-3:
+                errors.append(f"Clipe {i + 1}: intervalo [{clip.start}-{clip.end}] fora de 0-{probe['duration']:.2f}s.")
+            if clip.fade_in + clip.fade_out > clip.duration:
+                errors.append(f"Clipe {i + 1}: fades mais longos que o clipe.")
+            errors += [f"Clipe {i + 1}: filtro desconhecido '{name}'."
+                       for name in clip.filters if not ffmpeg_filter_graph(name)]
+        tracks = [self.voiceover.path] if self.voiceover else []
+        tracks += [self.subtitles] if self.subtitles else []
+        tracks += [overlay.path for overlay in self.overlays]
+        errors += [f"Arquivo de trilha não encontrado: {os.path.basename(path)}."
+                   for path in tracks if not os.path.exists(path)]
+        if self.duration > EDL_MAX_OUTPUT_SECONDS:
+            errors.append(f"Duração final acima de {EDL_MAX_OUTPUT_SECONDS:.0f}s.")
+
+        if errors or not self.clips:
+            return RenderCost(self.duration, (0, 0), 0.0, errors)
+
+        width, height, fps = self.output_format(probes)
+        decoded_pixels = sum(
+            clip.duration * probes[clip.source]["fps"] * probes[clip.source]["width"] * probes[clip.source]["height"]
+            for clip in self.clips
+        )
+        encoded_pixels = self.duration * fps * width * height
+        estimated = decoded_pixels / EDL_DECODE_PIXELS_PER_SEC + encoded_pixels / EDL_ENCODE_PIXELS_PER_SEC
+        if estimated > EDL_MAX_RENDER_SECONDS:
+            errors.append(f"Render estimado em {estimated:.0f}s, acima do limite de {EDL_MAX_RENDER_SECONDS:.0f}s.")
+        return RenderCost(self.duration, (width, height), round(estimated, 2), errors)
+
+    # === 🔗 Compilação em um único filter_complex ===
+    def build_command(self, output_path: str, probes: Dict[str, dict]) -> List[str]:
+        from app.services.video_filters import ffmpeg_filter_graph
+
+        width, height, fps = self.output_format(probes)
+        cmd = ["ffmpeg", "-y", "-v", "error", "-nostdin"]
+        graph, pads = [], []
+
+        # Um input por clipe com seek no input: só o trecho usado é decodificado
+        for i, clip in enumerate(self.clips):
+            cmd += ["-ss", f"{clip.start:.3f}", "-t", f"{clip.duration:.3f}", "-i", clip.source]
+            video = [ffmpeg_filter_graph(name) for name in clip.filters]
+            video += [
+                f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+                "setsar=1", f"fps={fps:.6f}", "format=yuv420p",
+            ]
+            audio = [AUDIO_FORMAT]
+            if clip.fade_in:
+                video.append(f"fade=t=in:st=0:d={clip.fade_in}")
+                audio.append(f"afade=t=in:st=0:d={clip.fade_in}")
+            if clip.fade_out:
+                video.append(f"fade=t=out:st={clip.duration - clip.fade_out:.3f}:d={clip.fade_out}")
+                audio.append(f"afade=t=out:st={clip.duration - clip.fade_out:.3f}:d={clip.fade_out}")
+            graph.append(f"[{i}:v:0]{','.join(video)}[v{i}]")
+            if probes[clip.source]["has_audio"]:
+                graph.append(f"[{i}:a:0]{','.join(audio)}[a{i}]")
+            else:
+                # Silêncio do tamanho do clipe para a concatenação manter áudio e vídeo alinhados
+                graph.append(f"anullsrc=r=48000:cl=stereo,atrim=duration={clip.duration:.3f},{AUDIO_FORMAT}[a{i}]")
+            pads.append(f"[v{i}][a{i}]")
+        graph.append(f"{''.join(pads)}concat=n={len(self.clips)}:v=1:a=1[vcat][acat]")
+        video_label, audio_label, next_input = "vcat", "acat", len(self.clips)
+
+        # Sobreposição limitada ao intervalo dela e deslocada para `start`: não estende a timeline
+        for j, overlay in enumerate(self.overlays):
+            end = overlay.end if overlay.end is not None else self.duration
+            if os.path.splitext(overlay.path)[1].lower() in IMAGE_EXTENSIONS:
+                cmd += ["-loop", "1"]
+            cmd += ["-t", f"{end - overlay.start:.3f}", "-i", overlay.path]
+            graph.append(f"[{next_input}:v:0]setpts=PTS-STARTPTS+{overlay.start:.3f}/TB[ovsrc{j}]")
+            graph.append(f"[{video_label}][ovsrc{j}]overlay=x={overlay.x}:y={overlay.y}:eof_action=pass[ov{j}]")
+            video_label, next_input = f"ov{j}", next_input + 1
+
+        if self.subtitles:
+            escaped = self.subtitles.replace("\\", "\\\\").replace(":", "\\:").replace("'", "\\'")
+            graph.append(f"[{video_label}]subtitles=filename='{escaped}'[vsub]")
+            video_label = "vsub"
+
+        if self.voiceover:
+            cmd += ["-i", self.voiceover.path]
+            delay = int(self.voiceover.start * 1000)
+            graph.append(f"[{next_input}:a:0]{AUDIO_FORMAT},adelay={delay}|{delay},"
+                         f"volume={self.voiceover.volume}[vo]")
+            graph.append(f"[{audio_label}][vo]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[amix]")
+            audio_label = "amix"
+
+        cmd += [
+            "-filter_complex", ";".join(graph),
+            "-map", f"[{video_label}]", "-map", f"[{audio_label}]",
+            *x264_encode_args(), "-c:a", "aac", "-b:a", "192k",
+            "-movflags", "+faststart", output_path,
+        ]
+        return cmd
+
+    def render(self, output_path: str) -> str:
+        probes = self.probe_sources()
+        cost = self.estimate_cost(probes)
+        if not cost.ok:
+            raise ValueError("; ".join(cost.errors))
+
+        cmd = self.build_command(output_path, probes)
+        logger.info(f"🎞️ Renderizando EDL com {len(self.clips)} clipes ({self.duration:.1f}s) em um único ffmpeg "
+                    f"(estimativa {cost.estimated_seconds:.1f}s) → {output_path}")
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+        return output_path
@@ -0,0 +1,136 @@
+# 📁 backend/app/services/filter_chain.py
+
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+from app.utils.ffmpeg_pipe import probe_media
+from app.utils.video_tools import x264_encode_args
+
+logger = logging.getLogger(__name__)
+
+
+# === 🧱 Estágios compiláveis ===
+@dataclass
+class TrimStage:
+    """Mantém só os trechos [início, fim) e concatena na ordem dada. Deve ser o primeiro estágio."""
+    segments: List[Tuple[float, float]]
+
+
+@dataclass
+class VideoFilterStage:
+    """Filtro de vídeo quadro a quadro (ex.: `format=gray`, `gblur=sigma=2.6`)."""
+    graph: str
+    name: str = "filter"
+
+
+@dataclass
+class FadeStage:
+    """Fade de/para preto (e do áudio, de/para silêncio) no início e/ou no fim do vídeo (segundos)."""
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+
+
+@dataclass
+class ScaleStage:
+    """Redimensiona para `height` mantendo a proporção (largura par)."""
+    height: int
+
+
+Stage = Union[TrimStage, VideoFilterStage, FadeStage, ScaleStage]
+
+
+# === 🔗 Cadeia compilada em um único ffmpeg ===
+@dataclass
+class FilterChain:
+    """
+    Acumula estágios consecutivos e os compila num único `filter_complex`:
+    uma decodificação e um encode para cortar, filtrar, aplicar fades e
+    redimensionar, em vez de um MP4 intermediário por estágio.
+
+    O corte vira um input por trecho (`-ss/-t` antes do `-i`), então só os
+    trechos usados são decodificados.
+    """
+
+    input_path: str
+    stages: List[Stage] = field(default_factory=list)
+
+    def add(self, stage: Stage) -> "FilterChain":
+        if isinstance(stage, TrimStage) and self.stages:
+            raise ValueError("O corte (TrimStage) deve ser o primeiro estágio da cadeia.")
+        self.stages.append(stage)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def _segments(self, duration: float) -> Optional[List[Tuple[float, float]]]:
+        if not self.stages or not isinstance(self.stages[0], TrimStage):
+            return None
+        segments = [
+            (max(0.0, start), min(end, duration) if duration else end)
+            for start, end in self.stages[0].segments
+        ]
+        segments = [(start, end) for start, end in segments if end > start]
+        if not segments:
+            raise ValueError("Nenhum trecho de corte dentro da duração do vídeo.")
+        return segments
+
+    def build_command(self, output_path: str, duration: float, has_audio: bool) -> List[str]:
+        segments = self._segments(duration)
+        cmd = ["ffmpeg", "-y", "-v", "error", "-nostdin"]
+        graph = []
+
+        if segments:
+            for start, end in segments:
+                cmd += ["-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", self.input_path]
+            pads = "".join(f"[{i}:v:0]" + (f"[{i}:a:0]" if has_audio else "") for i in range(len(segments)))
+            outputs = "[vcat][acat]" if has_audio else "[vcat]"
+            graph.append(f"{pads}concat=n={len(segments)}:v=1:a={int(has_audio)}{outputs}")
+            video_label, audio_label = "vcat", "acat" if has_audio else None
+            duration = sum(end - start for start, end in segments)
+        else:
+            cmd += ["-i", self.input_path]
+            video_label, audio_label = "0:v:0", None
+
+        filters, audio_filters = [], []
+        for stage in self.stages:
+            if isinstance(stage, VideoFilterStage):
+                filters.append(stage.graph)
+            elif isinstance(stage, ScaleStage):
+                filters.append(f"scale=-2:{stage.height}")
+            elif isinstance(stage, FadeStage):
+                fade_out_start = max(0.0, duration - stage.fade_out)
+                if stage.fade_in:
+                    filters.append(f"fade=t=in:st=0:d={stage.fade_in}")
+                    audio_filters.append(f"afade=t=in:st=0:d={stage.fade_in}")
+                if stage.fade_out:
+                    filters.append(f"fade=t=out:st={fade_out_start:.3f}:d={stage.fade_out}")
+                    audio_filters.append(f"afade=t=out:st={fade_out_start:.3f}:d={stage.fade_out}")
+
+        if filters or not segments:
+            graph.append(f"[{video_label}]{','.join(filters) or 'null'}[vout]")
+            video_label = "vout"
+        if has_audio and audio_filters:
+            audio_label = audio_label or "0:a:0"
+            graph.append(f"[{audio_label}]{','.join(audio_filters)}[aout]")
+            audio_label = "aout"
+
+        cmd += ["-filter_complex", ";".join(graph), "-map", f"[{video_label}]"]
+        if audio_label:
+            cmd += ["-map", f"[{audio_label}]", "-c:a", "aac"]
+        else:
+            # Áudio sem corte nem fade não passa por filtro: cópia direta do stream
+            cmd += ["-map", "0:a?", "-c:a", "copy"]
+        cmd += [*x264_encode_args(), "-movflags", "+faststart", output_path]
+        return cmd
+
+    def render(self, output_path: str) -> str:
+        duration, has_audio = probe_media(self.input_path)
+        cmd = self.build_command(output_path, duration, has_audio)
+        logger.info(f"🔗 Renderizando {len(self.stages)} estágios em um único ffmpeg → {output_path}")
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+        return output_path
@@ -0,0 +1,533 @@
+# 📁 backend/app/services/frame_pipeline.py
+
+import os
+import cv2
+import logging
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.object_detection import YOLO_BATCH_SIZE, detect_dnn_batch
+from app.utils.ffmpeg_pipe import iter_gray_frames, probe_video_stream, scaled_size
+
+logger = logging.getLogger(__name__)
+HAAR_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+# === 🔧 Altura padrão do modo de análise em baixa resolução ===
+ANALYSIS_HEIGHT = int(os.getenv("ANALYSIS_HEIGHT", 240))
+
+
+# === 🖼️ Frame compartilhado entre analisadores ===
+class VideoFrame:
+    """Frame decodificado uma única vez; conversões são calculadas sob demanda e reaproveitadas."""
+
+    def __init__(self, image: np.ndarray, index: int, timestamp: float,
+                 analysis_height: Optional[int] = None, source_height: Optional[int] = None):
+        self.image = image
+        self.index = index
+        self.timestamp = timestamp
+        self.analysis_height = analysis_height
+        self.source_height = source_height or image.shape[0]
+        self._gray = None
+        self._analysis = None
+
+    @property
+    def gray(self) -> np.ndarray:
+        if self._gray is None:
+            if self.image.ndim == 2:
+                self._gray = self.image
+            else:
+                self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def analysis(self) -> np.ndarray:
+        """Cinza reduzido para `analysis_height` (ou o cinza original se não houver modo de análise)."""
+        if self._analysis is None:
+            gray = self.gray
+            if self.analysis_height and gray.shape[0] > self.analysis_height:
+                width, height = scaled_size(gray.shape[1], gray.shape[0], self.analysis_height)
+                gray = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+            self._analysis = gray
+        return self._analysis
+
+    @property
+    def scale(self) -> float:
+        """Fator linear entre o frame de análise e a resolução original."""
+        return self.analysis.shape[0] / float(self.source_height)
+
+
+# === 🧩 Analisador base ===
+class FrameAnalyzer:
+    """Recebe apenas os frames da sua taxa de amostragem e acumula o próprio resultado."""
+
+    name = "analyzer"
+    # Analisadores que só usam `frame.analysis` podem receber frames cinza reduzidos pelo ffmpeg
+    supports_gray = True
+    # Incrementar quando a forma de calcular o resultado mudar (invalida o cache de análise)
+    cache_version = 1
+
+    def __init__(self, sample_rate: int = 1):
+        self.sample_rate = max(1, int(sample_rate))
+
+    def wants(self, frame_index: int) -> bool:
+        return frame_index % self.sample_rate == 0
+
+    def reset(self) -> None:
+        pass
+
+    def process(self, frame: VideoFrame) -> None:
+        raise NotImplementedError
+
+    def finalize(self) -> None:
+        """Chamado ao fim da decodificação (ex.: descarregar lotes pendentes)."""
+        pass
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+    def empty_result(self) -> Any:
+        return []
+
+    def cache_params(self) -> Optional[dict]:
+        """Parâmetros que alteram o resultado bruto; None desativa o cache para o analisador."""
+        return {"sample_rate": self.sample_rate}
+
+    def to_cache(self, result: Any) -> Any:
+        return result
+
+    def from_cache(self, value: Any) -> Any:
+        return value
+
+    # --- execução em fatias (ver services/parallel_analysis.py) ---
+    shardable = True
+
+    def boundary_state(self) -> Any:
+        """Estado nas bordas da fatia, usado para costurar resultados de fatias vizinhas."""
+        return None
+
+    def merge_shards(self, parts: List[Tuple[Any, Any]]) -> Any:
+        """Junta [(resultado, estado de borda)] das fatias, em ordem de tempo."""
+        if isinstance(self.empty_result(), dict):
+            merged = {}
+            for result, _ in parts:
+                merged.update(result)
+            return merged
+        return [value for result, _ in parts for value in result]
+
+
+# === 🎥 Movimento ===
+class MotionAnalyzer(FrameAnalyzer):
+    """Intensidade de movimento entre frames consecutivos (absdiff + threshold)."""
+
+    name = "motion"
+    cache_version = 2
+
+    def __init__(self, blur_kernel: int = 21, dilate_iterations: int = 0, score: str = "count"):
+        super().__init__(sample_rate=1)
+        self.blur_kernel = blur_kernel
+        self.dilate_iterations = dilate_iterations
+        self.score = score
+        self.reset()
+
+    def reset(self) -> None:
+        self._first = None
+        self._prev = None
+        self._scale = 1.0
+        self._scores = []
+
+    def _diff_score(self, prev: np.ndarray, gray: np.ndarray, scale: float):
+        diff = cv2.absdiff(prev, gray)
+        thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)[1]
+        # A dilatação cresce a borda em pixels: em resolução reduzida as iterações acompanham a escala
+        iterations = int(round(self.dilate_iterations * scale)) if scale < 1.0 else self.dilate_iterations
+        if iterations:
+            thresh = cv2.dilate(thresh, None, iterations=iterations)
+        if self.score == "mean":
+            return np.sum(thresh) / float(thresh.size)
+        if scale < 1.0:
+            return int(round(np.count_nonzero(thresh) / (scale * scale)))
+        return np.sum(thresh > 0)
+
+    def process(self, frame: VideoFrame) -> None:
+        # Em resolução reduzida o kernel do blur e a contagem de pixels acompanham a escala
+        scale = frame.scale
+        kernel = max(3, int(round(self.blur_kernel * scale)) | 1)
+        # Sigma padrão do OpenCV para o kernel original, na escala do frame de análise
+        sigma = 0.3 * ((self.blur_kernel - 1) * 0.5 - 1) + 0.8
+        gray = cv2.GaussianBlur(frame.analysis, (kernel, kernel), sigma * scale)
+        if self._prev is not None:
+            self._scores.append(self._diff_score(self._prev, gray, scale))
+        else:
+            self._first, self._scale = gray, scale
+        self._prev = gray
+
+    def result(self) -> list:
+        return self._scores
+
+    def boundary_state(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], float]:
+        return self._first, self._prev, self._scale
+
+    def merge_shards(self, parts: List[Tuple[list, tuple]]) -> list:
+        # A diferença entre o último frame de uma fatia e o primeiro da seguinte é recalculada aqui
+        merged, last = [], None
+        for scores, (first, shard_last, scale) in parts:
+            if last is not None and first is not None:
+                merged.append(self._diff_score(last, first, scale))
+            merged.extend(scores)
+            if shard_last is not None:
+                last = shard_last
+        return merged
+
+    def cache_params(self) -> dict:
+        return {"blur_kernel": self.blur_kernel, "dilate_iterations": self.dilate_iterations, "score": self.score}
+
+    def to_cache(self, result: list) -> np.ndarray:
+        return np.asarray(result, dtype=np.float64 if self.score == "mean" else np.int64)
+
+    def from_cache(self, value: np.ndarray) -> list:
+        return value.tolist()
+
+
+# === 😶 Rostos ===
+class FaceAnalyzer(FrameAnalyzer):
+    """Instantes (em segundos) com ao menos um rosto detectado pelo Haar Cascade."""
+
+    name = "faces"
+
+    def __init__(self, sample_rate: int = 5, cascade_path: str = HAAR_CASCADE_PATH):
+        super().__init__(sample_rate=sample_rate)
+        self.cascade_path = cascade_path
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            logger.warning("⚠️ Haar Cascade não encontrado.")
+        self.reset()
+
+    def reset(self) -> None:
+        self._timestamps = []
+
+    def wants(self, frame_index: int) -> bool:
+        return not self.cascade.empty() and super().wants(frame_index)
+
+    def __getstate__(self) -> dict:
+        # CascadeClassifier não é serializável: cada processo recarrega pelo caminho
+        state = self.__dict__.copy()
+        state.pop("cascade", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.cascade = cv2.CascadeClassifier(self.cascade_path)
+
+    def process(self, frame: VideoFrame) -> None:
+        faces = self.cascade.detectMultiScale(frame.analysis, scaleFactor=1.1, minNeighbors=5)
+        if len(faces) > 0:
+            self._timestamps.append(frame.timestamp)
+
+    def result(self) -> list:
+        return sorted(set(self._timestamps))
+
+    def cache_params(self) -> Optional[dict]:
+        if self.cascade.empty():
+            return None
+        return {"sample_rate": self.sample_rate, "cascade": os.path.basename(self.cascade_path)}
+
+
+# === 🧠 Objetos (YOLO via cv2.dnn) ===
+class ObjectAnalyzer(FrameAnalyzer):
+    """Detecções YOLO por timestamp: {t: [{'label', 'confidence'}, ...]}, inferidas em lotes."""
+
+    name = "objects"
+    supports_gray = False
+    # A rede (cv2.dnn) fica no processo que a carregou
+    shardable = False
+
+    def __init__(self, yolo_model, classes, confidence_threshold: float = 0.5, sample_rate: int = 5,
+                 batch_size: int = YOLO_BATCH_SIZE, model_id: Optional[str] = None):
+        super().__init__(sample_rate=sample_rate)
+        self.model_id = model_id
+        self.yolo_model = yolo_model
+        self.classes = classes
+        self.confidence_threshold = confidence_threshold
+        self.batch_size = max(1, int(batch_size))
+        self.reset()
+
+    def reset(self) -> None:
+        self._detections = {}
+        self._pending = []
+
+    def process(self, frame: VideoFrame) -> None:
+        self._pending.append((frame.index, frame.timestamp, frame.image))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def finalize(self) -> None:
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            results = detect_dnn_batch(self.yolo_model, [image for _, _, image in batch],
+                                       self.classes, self.confidence_threshold)
+            for (_, timestamp, _), frame_detections in zip(batch, results):
+                if frame_detections:
+                    self._detections[timestamp] = frame_detections
+        except Exception as e:
+            logger.error(f"❌ Erro YOLO nos frames {batch[0][0]}–{batch[-1][0]}: {e}")
+
+    def result(self) -> dict:
+        return self._detections
+
+    def empty_result(self) -> dict:
+        return {}
+
+    def cache_params(self) -> Optional[dict]:
+        # Sem identificação estável do modelo (ex.: caminho dos pesos) o resultado não é cacheável
+        if self.model_id is None:
+            return None
+        return {"model": self.model_id, "classes": len(self.classes), "sample_rate": self.sample_rate,
+                "confidence_threshold": self.confidence_threshold}
+
+    def to_cache(self, result: dict) -> list:
+        return [[timestamp, detections] for timestamp, detections in sorted(result.items())]
+
+    def from_cache(self, value: list) -> dict:
+        return {float(timestamp): detections for timestamp, detections in value}
+
+
+# === 📊 Histograma (troca de cena) ===
+class HistogramAnalyzer(FrameAnalyzer):
+    """Instantes de troca de cena por correlação de histograma entre frames amostrados."""
+
+    name = "histogram"
+
+    def __init__(self, threshold: float = 0.5, sample_rate: int = 1):
+        super().__init__(sample_rate=sample_rate)
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self) -> None:
+        self._first = None
+        self._last_hist = None
+        self._cuts = []
+
+    def process(self, frame: VideoFrame) -> None:
+        source = frame.analysis if frame.analysis_height else frame.image
+        hist = cv2.calcHist([source], [0], None, [256], [0, 256])
+        hist = cv2.normalize(hist, hist).flatten()
+        if self._last_hist is not None:
+            if cv2.compareHist(self._last_hist, hist, cv2.HISTCMP_CORREL) < self.threshold:
+                self._cuts.append(frame.timestamp)
+        else:
+            self._first = (hist, frame.timestamp)
+        self._last_hist = hist
+
+    def result(self) -> list:
+        return self._cuts
+
+    def boundary_state(self) -> tuple:
+        return self._first, self._last_hist
+
+    def merge_shards(self, parts: List[Tuple[list, tuple]]) -> list:
+        merged, last = [], None
+        for cuts, (first, shard_last) in parts:
+            if last is not None and first is not None:
+                first_hist, first_timestamp = first
+                if cv2.compareHist(last, first_hist, cv2.HISTCMP_CORREL) < self.threshold:
+                    merged.append(first_timestamp)
+            merged.extend(cuts)
+            if shard_last is not None:
+                last = shard_last
+        return merged
+
+    def cache_params(self) -> dict:
+        return {"threshold": self.threshold, "sample_rate": self.sample_rate}
+
+
+# === 🔁 Pipeline de decodificação única ===
+class FramePipeline:
+    """
+    Decodifica o vídeo uma única vez e entrega cada frame aos analisadores registrados,
+    respeitando a taxa de amostragem de cada um. Frames que nenhum analisador quer
+    são apenas avançados com grab(), sem retrieve.
+
+    Com `analysis_height`, os analisadores trabalham em cinza reduzido. Se todos
+    aceitam cinza, o próprio ffmpeg entrega os frames já reduzidos (`scale,format=gray`);
+    caso contrário (ex.: YOLO precisa de cor) a redução é feita após a decodificação.
+
+    Com `cache` (ver services/analysis_cache.py), resultados já calculados para o
+    mesmo conteúdo e parâmetros são lidos do cache e só os analisadores restantes
+    decodificam o vídeo; se todos estiverem em cache, não há decodificação.
+    """
+
+    def __init__(self, video_path: str, analysis_height: Optional[int] = None, cache=None,
+                 start_frame: int = 0, end_frame: Optional[int] = None):
+        self.video_path = video_path
+        self.analysis_height = analysis_height
+        self.cache = cache
+        # Intervalo [start_frame, end_frame) em índices globais; o início deve cair num keyframe
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.analyzers: List[FrameAnalyzer] = []
+        self.fps = 0.0
+        self.frame_count = 0
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.fps if self.fps else 0.0
+
+    def register(self, analyzer: FrameAnalyzer) -> "FramePipeline":
+        if any(a.name == analyzer.name for a in self.analyzers):
+            raise ValueError(f"Analisador '{analyzer.name}' já registrado.")
+        self.analyzers.append(analyzer)
+        return self
+
+    def _empty(self) -> Dict[str, Any]:
+        return {a.name: a.empty_result() for a in self.analyzers}
+
+    def _dispatch(self, frames) -> None:
+        """Entrega cada (índice, imagem) aos analisadores interessados."""
+        frame_idx = self.start_frame
+        for image, source_height in frames:
+            consumers = [a for a in self.analyzers if a.wants(frame_idx)]
+            if consumers:
+                timestamp = frame_idx / self.fps if self.fps else 0.0
+                frame = VideoFrame(image, frame_idx, timestamp, self.analysis_height, source_height)
+                for analyzer in consumers:
+                    analyzer.process(frame)
+            frame_idx += 1
+        self.frame_count = frame_idx - self.start_frame
+        for analyzer in self.analyzers:
+            analyzer.finalize()
+
+    def _run_gray_pipe(self) -> Dict[str, Any]:
+        src_width, src_height, self.fps = probe_video_stream(self.video_path)
+        width, height = scaled_size(src_width, src_height, self.analysis_height)
+        # Meio frame antes do início: o seek preciso do ffmpeg mantém exatamente o frame `start_frame`
+        start_time = (self.start_frame - 0.5) / self.fps if self.start_frame and self.fps else None
+        max_frames = self.end_frame - self.start_frame if self.end_frame is not None else None
+        gray_frames = iter_gray_frames(self.video_path, width, height, start_time, max_frames)
+        frames = ((image, src_height) for image in gray_frames)
+        self._dispatch(frames)
+        logger.info(
+            f"🎞️ Pipeline de análise {width}x{height} (cinza) concluído: {self.frame_count} frames "
+            f"para {[a.name for a in self.analyzers]}."
+        )
+        return {a.name: a.result() for a in self.analyzers}
+
+    def _cache_params(self, analyzer: FrameAnalyzer) -> Optional[dict]:
+        params = analyzer.cache_params()
+        if params is None:
+            return None
+        return {**params, "analysis_height": self.analysis_height}
+
+    def run(self) -> Dict[str, Any]:
+        if not os.path.exists(self.video_path):
+            logger.error(f"❌ Arquivo de vídeo não encontrado: {self.video_path}")
+            return self._empty()
+        # Só o vídeo inteiro é cacheado; fatias (start/end) sempre decodificam
+        if self.cache is None or self.start_frame or self.end_frame is not None:
+            return self._decode()
+
+        cached, pending = {}, []
+        for analyzer in self.analyzers:
+            params = self._cache_params(analyzer)
+            value = None
+            if params is not None:
+                value = self.cache.get(self.video_path, analyzer.name, params, analyzer.cache_version)
+            if value is None:
+                pending.append(analyzer)
+            else:
+                cached[analyzer.name] = analyzer.from_cache(value)
+
+        if not pending:
+            info = self.cache.get(self.video_path, "video_info", {})
+            if info is None:
+                # Metadados sem decodificar: contagem do container
+                cap = cv2.VideoCapture(self.video_path)
+                info = {"fps": cap.get(cv2.CAP_PROP_FPS) or 0.0, "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT))}
+                cap.release()
+            self.fps, self.frame_count = float(info["fps"]), int(info["frame_count"])
+            return cached
+
+        # Decodifica só para os analisadores sem resultado em cache
+        registered, self.analyzers = self.analyzers, pending
+        try:
+            results = self._decode()
+        finally:
+            self.analyzers = registered
+
+        if self.frame_count:
+            self.cache.put(self.video_path, "video_info", {}, {"fps": self.fps, "frame_count": self.frame_count})
+            for analyzer in pending:
+                params = self._cache_params(analyzer)
+                if params is not None:
+                    self.cache.put(self.video_path, analyzer.name, params,
+                                   analyzer.to_cache(results[analyzer.name]), analyzer.cache_version)
+        return {a.name: cached[a.name] if a.name in cached else results[a.name] for a in self.analyzers}
+
+    def _decode(self) -> Dict[str, Any]:
+        self.frame_count = 0
+        for analyzer in self.analyzers:
+            analyzer.reset()
+
+        if self.analysis_height and all(a.supports_gray for a in self.analyzers):
+            try:
+                return self._run_gray_pipe()
+            except Exception as e:
+                logger.warning(f"⚠️ Modo de análise via ffmpeg indisponível, usando OpenCV: {e}")
+                for analyzer in self.analyzers:
+                    analyzer.reset()
+
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if not cap.isOpened():
+                logger.error(f"❌ Não foi possível abrir o vídeo: {self.video_path}")
+                return self._empty()
+
+            self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+            frame_idx = self.start_frame
+            if self.start_frame:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+
+            while self.end_frame is None or frame_idx < self.end_frame:
+                consumers = [a for a in self.analyzers if a.wants(frame_idx)]
+                if not consumers:
+                    if not cap.grab():
+                        break
+                    frame_idx += 1
+                    continue
+
+                ret, image = cap.read()
+                if not ret:
+                    break
+
+                timestamp = frame_idx / self.fps if self.fps else 0.0
+                frame = VideoFrame(image, frame_idx, timestamp, self.analysis_height)
+                for analyzer in consumers:
+                    analyzer.process(frame)
+                frame_idx += 1
+
+            self.frame_count = frame_idx - self.start_frame
+            for analyzer in self.analyzers:
+                analyzer.finalize()
+            logger.info(
+                f"🎞️ Pipeline de frames concluído: {self.frame_count} frames decodificados uma vez "
+                f"para {[a.name for a in self.analyzers]}."
+            )
+            return {a.name: a.result() for a in self.analyzers}
+        except Exception as e:
+            logger.error(f"❌ Erro no pipeline de frames: {e}")
+            return self._empty()
+        finally:
+            cap.release()
+
+
+def run_frame_pipeline(video_path: str, analyzers: List[FrameAnalyzer],
+                       analysis_height: Optional[int] = None, cache=None) -> Dict[str, Any]:
+    """Atalho: registra os analisadores, executa e retorna {nome: resultado}."""
+    pipeline = FramePipeline(video_path, analysis_height=analysis_height, cache=cache)
+    for analyzer in analyzers:
+        pipeline.register(analyzer)
+    return pipeline.run()
@@ -0,0 +1,134 @@
+# 📁 backend/app/services/frame_sampler.py
+
+import os
+import cv2
+import logging
+import numpy as np
+from typing import Iterator, Optional, Sequence, Tuple
+
+from app.utils.ffmpeg_pipe import iter_frame_batches, probe_decoded_keyframe_times, probe_keyframe_times
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Amostras mais espaçadas que N GOPs usam decodificação só de keyframes ===
+SPARSE_GOP_FACTOR = float(os.getenv("SPARSE_GOP_FACTOR", 2.0))
+
+
+def _target_frames(fps: float, frame_count: int, interval_sec: Optional[float],
+                   timestamps: Optional[Sequence[float]]) -> np.ndarray:
+    if timestamps is not None:
+        return np.unique(np.round(np.asarray(timestamps, dtype=np.float64) * fps).astype(np.int64).clip(min=0))
+    stride = max(1, int(fps * interval_sec))
+    return np.arange(0, max(frame_count, 1), stride, dtype=np.int64)
+
+
+def choose_sampling_mode(target_frames: np.ndarray, fps: float, keyframes: np.ndarray) -> str:
+    """'grab' para amostragem densa; 'keyframe' quando as amostras ficam vários GOPs distantes."""
+    if len(keyframes) < 2:
+        return "grab"
+    mean_gop = float(np.mean(np.diff(keyframes)))
+    spacing = float(np.mean(np.diff(target_frames))) / fps if len(target_frames) > 1 else float("inf")
+    return "keyframe" if spacing >= SPARSE_GOP_FACTOR * mean_gop else "grab"
+
+
+# === ⏩ Modo sequencial: grab() em tudo, retrieve() só nas amostras ===
+def _iter_grab(cap, fps: float, targets: np.ndarray) -> Iterator[Tuple[float, np.ndarray]]:
+    pending = iter(targets.tolist())
+    target = next(pending, None)
+    frame_idx = 0
+    while target is not None:
+        if not cap.grab():
+            break
+        if frame_idx == target:
+            ret, frame = cap.retrieve()
+            if ret:
+                yield frame_idx / fps, frame
+            target = next(pending, None)
+        frame_idx += 1
+
+
+# === 🔑 Modo esparso: cada amostra é encaixada no keyframe mais próximo ===
+def _iter_keyframes(video_path: str, width: int, height: int, fps: float, targets: np.ndarray,
+                    keyframes: np.ndarray) -> Iterator[Tuple[float, np.ndarray]]:
+    wanted = targets / fps
+    idx = np.clip(np.searchsorted(keyframes, wanted), 1, len(keyframes) - 1)
+    left, right = keyframes[idx - 1], keyframes[idx]
+    snapped = set(np.where(wanted - left <= right - wanted, idx - 1, idx).tolist())
+    last = max(snapped)
+    # Uma única passada do ffmpeg decodificando só keyframes (-skip_frame nokey), sem seek:
+    # o i-ésimo frame do pipe é o i-ésimo keyframe do ffprobe (conferido em `_keyframes_align`)
+    frames = iter_frame_batches(video_path, width, height, "bgr24", batch_size=1, keyframes_only=True)
+    try:
+        for keyframe_idx, batch in enumerate(frames):
+            if keyframe_idx in snapped:
+                yield float(keyframes[keyframe_idx]), batch[0]
+            if keyframe_idx >= last:
+                break
+    finally:
+        frames.close()
+
+
+def _keyframes_align(video_path: str, keyframes: np.ndarray) -> bool:
+    """Os frames entregues com -skip_frame nokey são os pacotes K do ffprobe, na mesma ordem?"""
+    decoded = probe_decoded_keyframe_times(video_path)
+    return len(decoded) == len(keyframes) and bool(np.allclose(decoded, keyframes, atol=1e-3))
+
+
+# === 🎯 Amostrador esparso ===
+def iter_sampled_frames(
+    video_path: str,
+    interval_sec: Optional[float] = None,
+    timestamps: Optional[Sequence[float]] = None,
+    mode: str = "auto",
+) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Gera (timestamp, frame BGR) a cada `interval_sec` ou nos `timestamps` pedidos,
+    sem um seek por amostra. Os timestamps contam a partir do início do vídeo
+    (pts - start_time) nos dois modos. `mode`:
+      - "grab": percorre o vídeo com grab() e só decodifica para imagem as amostras;
+      - "keyframe": decodifica apenas keyframes, encaixando cada amostra no mais próximo;
+      - "auto": escolhe pelo espaçamento das amostras em relação ao GOP médio.
+    """
+    if interval_sec is None and timestamps is None:
+        raise ValueError("Informe interval_sec ou timestamps.")
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Não foi possível abrir o vídeo: {video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        targets = _target_frames(fps, frame_count, interval_sec, timestamps)
+        if not len(targets):
+            return
+
+        keyframes = np.empty(0)
+        if mode != "grab":
+            try:
+                keyframes = probe_keyframe_times(video_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Keyframes indisponíveis, usando modo sequencial: {e}")
+
+        if mode == "auto":
+            mode = choose_sampling_mode(targets, fps, keyframes)
+        if mode == "keyframe" and len(keyframes) < 2:
+            mode = "grab"
+        if mode == "keyframe":
+            try:
+                aligned = _keyframes_align(video_path, keyframes)
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível conferir os keyframes decodificados: {e}")
+                aligned = False
+            if not aligned:
+                logger.warning("⚠️ Keyframes decodificados não batem com os pacotes K, usando modo sequencial")
+                mode = "grab"
+
+        logger.info(f"🎯 Amostragem '{mode}' de {len(targets)} frames em {video_path}")
+        if mode == "keyframe":
+            yield from _iter_keyframes(video_path, width, height, fps, targets, keyframes)
+        else:
+            yield from _iter_grab(cap, fps, targets)
+    finally:
+        cap.release()
@@ -0,0 +1,234 @@
+# 📁 backend/app/services/model_registry.py
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Configurações ===
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", 4096))
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "yolo,whisper")
+YOLO_MODEL = os.getenv("YOLO_MODEL", "yolov8n.pt")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "pierreguillou/bert-base-cased-sentiment-analysis")
+
+# === 📊 Métricas Prometheus ===
+MODEL_CACHE_HITS = Counter("model_registry_hits_total", "Modelos servidos do cache do processo", ["kind"])
+MODEL_CACHE_MISSES = Counter("model_registry_misses_total", "Modelos carregados do disco", ["kind"])
+MODEL_EVICTIONS = Counter("model_registry_evictions_total", "Modelos removidos por orçamento de memória", ["kind"])
+MODEL_LOAD_TIME = Histogram("model_registry_load_seconds", "⏱️ Tempo de carregamento de modelos", ["kind"])
+
+ModelKey = Tuple[str, Hashable]
+
+
+# === 📏 Estimativa de memória ocupada ===
+def estimate_model_bytes(model: Any, path: Optional[str] = None, _depth: int = 0) -> int:
+    """
+    Soma parâmetros e buffers quando o objeto é (ou envolve) um módulo torch;
+    sem isso, usa o tamanho do arquivo de pesos como aproximação.
+    """
+    if hasattr(model, "parameters") and callable(model.parameters):
+        try:
+            total = sum(p.numel() * p.element_size() for p in model.parameters())
+            if hasattr(model, "buffers"):
+                total += sum(b.numel() * b.element_size() for b in model.buffers())
+            if total:
+                return int(total)
+        except Exception:
+            pass
+    # YOLO (ultralytics) e pipelines (transformers) guardam o módulo em `.model`
+    inner = getattr(model, "model", None)
+    if inner is not None and inner is not model and _depth < 3:
+        size = estimate_model_bytes(inner, None, _depth + 1)
+        if size:
+            return size
+    if path and os.path.isfile(path):
+        return os.path.getsize(path)
+    return 0
+
+
+# === 🧠 Registro de modelos por processo ===
+class ModelRegistry:
+    """
+    Cache de modelos por (tipo, caminho) dentro do processo. Carrega sob demanda
+    com o loader registrado para o tipo, mantém ordem LRU e remove os menos
+    usados quando a soma estimada passa de `memory_budget_mb`. O modelo recém
+    carregado nunca é removido, mesmo que sozinho estoure o orçamento.
+    Cada modelo carrega sob o próprio lock: um carregamento lento não segura os
+    acertos de cache nem o carregamento de outros modelos.
+    """
+
+    def __init__(self, memory_budget_mb: int = MODEL_MEMORY_BUDGET_MB):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._loaders: Dict[str, Callable[[Hashable], Any]] = {}
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._sizes: Dict[ModelKey, int] = {}
+        self._load_seconds: Dict[ModelKey, float] = {}
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register_loader(self, kind: str, loader: Callable[[Hashable], Any]) -> None:
+        self._loaders[kind] = loader
+
+    def get(self, kind: str, path: Hashable) -> Any:
+        key = (kind, path)
+        with self._lock:
+            if key in self._models:
+                return self._hit(key)
+            loader = self._loaders.get(kind)
+            if loader is None:
+                raise KeyError(f"Nenhum loader registrado para modelos do tipo '{kind}'.")
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Só quem pede o mesmo modelo espera o carregamento; o lock global fica com o dicionário e a LRU
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    return self._hit(key)
+            try:
+                logger.info(f"📦 Carregando modelo {kind}: '{path}'...")
+                start = time.perf_counter()
+                model = loader(path)
+                elapsed = time.perf_counter() - start
+                size = estimate_model_bytes(model, path if isinstance(path, str) else None)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+
+            # Entra no cache e sai de `_loading` na mesma seção: quem chegar depois vê o modelo
+            with self._lock:
+                self.misses += 1
+                MODEL_CACHE_MISSES.labels(kind=kind).inc()
+                MODEL_LOAD_TIME.labels(kind=kind).observe(elapsed)
+                self._models[key] = model
+                self._sizes[key] = size
+                self._load_seconds[key] = elapsed
+                self._loading.pop(key, None)
+                logger.info(f"✅ Modelo {kind} '{path}' carregado em {elapsed:.2f}s (~{size / 1024 / 1024:.0f} MB).")
+                self._evict(keep=key)
+            return model
+
+    def _hit(self, key: ModelKey) -> Any:
+        self._models.move_to_end(key)
+        self.hits += 1
+        MODEL_CACHE_HITS.labels(kind=key[0]).inc()
+        return self._models[key]
+
+    def _evict(self, keep: ModelKey) -> None:
+        while self.memory_bytes > self.memory_budget and len(self._models) > 1:
+            key = next(iter(self._models))
+            if key == keep:
+                break
+            self._forget(key)
+            self.evictions += 1
+            MODEL_EVICTIONS.labels(kind=key[0]).inc()
+            logger.info(f"♻️ Modelo {key[0]} '{key[1]}' removido do cache (orçamento de memória).")
+
+    def _forget(self, key: ModelKey) -> bool:
+        self._sizes.pop(key, None)
+        self._load_seconds.pop(key, None)
+        return self._models.pop(key, None) is not None
+
+    def evict(self, kind: str, path: Hashable) -> bool:
+        with self._lock:
+            return self._forget((kind, path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+            self._load_seconds.clear()
+
+    def __contains__(self, key: ModelKey) -> bool:
+        return key in self._models
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def warm_up(self, specs: Iterable[ModelKey]) -> None:
+        """Pré-carrega modelos; falhas são registradas e não impedem o worker de subir."""
+        for kind, path in specs:
+            try:
+                self.get(kind, path)
+            except Exception as e:
+                logger.error(f"❌ Falha no warm-up do modelo {kind} '{path}': {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_mb": round(self.memory_bytes / 1024 / 1024, 1),
+                "memory_budget_mb": round(self.memory_budget / 1024 / 1024, 1),
+                "models": [
+                    {
+                        "kind": kind,
+                        "path": str(path),
+                        "memory_mb": round(self._sizes.get((kind, path), 0) / 1024 / 1024, 1),
+                        "load_seconds": round(self._load_seconds.get((kind, path), 0.0), 3),
+                    }
+                    for kind, path in self._models
+                ],
+            }
+
+
+# === 📥 Loaders (imports pesados só no primeiro uso) ===
+def _load_yolo(path: str):
+    from ultralytics import YOLO
+    return YOLO(path)
+
+
+def _load_torchscript(path: str):
+    import torch
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    return torch.jit.load(path, map_location=device).eval()
+
+
+def _load_whisper(name: str):
+    import whisper
+    return whisper.load_model(name)
+
+
+def _load_sentiment(name: str):
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=name)
+
+
+model_registry = ModelRegistry()
+model_registry.register_loader("yolo", _load_yolo)
+model_registry.register_loader("torchscript", _load_torchscript)
+model_registry.register_loader("whisper", _load_whisper)
+model_registry.register_loader("sentiment", _load_sentiment)
+
+DEFAULT_MODELS = {
+    "yolo": YOLO_MODEL,
+    "whisper": WHISPER_MODEL,
+    "sentiment": SENTIMENT_MODEL,
+}
+
+
+def get_model(kind: str, path: Optional[Hashable] = None) -> Any:
+    """Modelo do registro do processo; sem `path`, usa o padrão configurado para o tipo."""
+    return model_registry.get(kind, path if path is not None else DEFAULT_MODELS[kind])
+
+
+def warm_up_default_models(kinds: str = MODEL_WARMUP) -> None:
+    """Carrega os tipos listados em MODEL_WARMUP (ex.: "yolo,whisper")."""
+    specs = [(kind, DEFAULT_MODELS[kind]) for kind in (k.strip() for k in kinds.split(",")) if kind in DEFAULT_MODELS]
+    if specs:
+        logger.info(f"🔥 Warm-up de modelos: {', '.join(kind for kind, _ in specs)}")
+        model_registry.warm_up(specs)
@@ -0,0 +1,64 @@
+# 📁 backend/app/services/object_detection.py
+
+import os
+import cv2
+import logging
+import numpy as np
+from typing import Any, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Tamanho do lote de inferência (CPU: 8 costuma amortizar bem o overhead por chamada) ===
+YOLO_BATCH_SIZE = int(os.getenv("YOLO_BATCH_SIZE", 8))
+DNN_INPUT_SIZE = (416, 416)
+
+
+# === 📦 Agrupa amostras em lotes ===
+def iter_batches(samples: Iterable[Any], batch_size: int = YOLO_BATCH_SIZE) -> Iterator[List[Any]]:
+    batch = []
+    for sample in samples:
+        batch.append(sample)
+        if len(batch) >= max(1, batch_size):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# === 🧠 YOLO via cv2.dnn: um forward() por lote ===
+def detect_dnn_batch(net, frames: List[np.ndarray], classes, confidence_threshold: float = 0.5) -> List[List[dict]]:
+    """
+    Roda `blobFromImages` + um único `forward()` para N frames e devolve,
+    por frame, a lista [{'label', 'confidence'}] acima do limiar.
+    """
+    blob = cv2.dnn.blobFromImages(frames, 1/255.0, DNN_INPUT_SIZE, swapRB=True, crop=False)
+    net.setInput(blob)
+    outputs = net.forward(net.getUnconnectedOutLayersNames())
+
+    detections = [[] for _ in frames]
+    for output in outputs:
+        # Com lote > 1 a saída é (N, linhas, 5 + classes); com lote 1, (linhas, 5 + classes)
+        per_frame = output.reshape(len(frames), -1, output.shape[-1])
+        for i, rows in enumerate(per_frame):
+            scores = rows[:, 5:]
+            class_ids = np.argmax(scores, axis=1)
+            confidences = scores[np.arange(len(rows)), class_ids]
+            for class_id, confidence in zip(class_ids[confidences > confidence_threshold],
+                                            confidences[confidences > confidence_threshold]):
+                detections[i].append({'label': classes[class_id], 'confidence': float(confidence)})
+    return detections
+
+
+# === 🎯 YOLO via ultralytics: lista de frames por chamada ===
+def iter_ultralytics_detections(
+    model,
+    samples: Iterable[Tuple[float, np.ndarray]],
+    batch_size: int = YOLO_BATCH_SIZE,
+    **predict_kwargs,
+) -> Iterator[Tuple[float, Any]]:
+    """Recebe (timestamp, frame) e devolve (timestamp, result) na mesma ordem, inferindo em lotes."""
+    predict_kwargs.setdefault("verbose", False)
+    for batch in iter_batches(samples, batch_size):
+        timestamps = [t for t, _ in batch]
+        results = model([frame for _, frame in batch], **predict_kwargs)
+        yield from zip(timestamps, results)
@@ -0,0 +1,135 @@
+# 📁 backend/app/services/parallel_analysis.py
+
+import os
+import cv2
+import logging
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.frame_pipeline import FrameAnalyzer, FramePipeline
+from app.utils.ffmpeg_pipe import probe_keyframe_times
+
+logger = logging.getLogger(__name__)
+
+# === 🔧 Configurações ===
+PARALLEL_ANALYSIS_WORKERS = int(os.getenv("PARALLEL_ANALYSIS_WORKERS", os.cpu_count() or 1))
+PARALLEL_MIN_SHARD_SECONDS = float(os.getenv("PARALLEL_MIN_SHARD_SECONDS", 60.0))
+
+
+# === ✂️ Planejamento das fatias ===
+def plan_shards(keyframe_frames: np.ndarray, frame_count: int, shards: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Divide [0, frame_count) em até `shards` intervalos [início, fim) cujos inícios
+    são keyframes (índices de frame). A última fatia fica aberta (fim None) e lê
+    até o fim do arquivo, já que a contagem do container pode ser aproximada.
+    """
+    keyframe_frames = np.unique(np.asarray(keyframe_frames, dtype=np.int64))
+    keyframe_frames = keyframe_frames[(keyframe_frames > 0) & (keyframe_frames < frame_count)]
+    if shards <= 1 or not len(keyframe_frames):
+        return [(0, None)]
+
+    ideal = np.arange(1, shards) * frame_count / shards
+    idx = np.clip(np.searchsorted(keyframe_frames, ideal), 1, len(keyframe_frames)) - 1
+    candidates = np.stack([keyframe_frames[idx], keyframe_frames[np.minimum(idx + 1, len(keyframe_frames) - 1)]])
+    nearest = candidates[np.argmin(np.abs(candidates - ideal), axis=0), np.arange(len(ideal))]
+    starts = [0] + sorted(set(int(s) for s in nearest))
+    return [(start, end) for start, end in zip(starts, starts[1:] + [None])]
+
+
+# === 🧵 Execução de uma fatia (processo filho) ===
+def _analyze_shard(video_path: str, analyzers: List[FrameAnalyzer], analysis_height: Optional[int],
+                   start_frame: int, end_frame: Optional[int]) -> Tuple[Dict[str, Any], Dict[str, Any], int, float]:
+    pipeline = FramePipeline(video_path, analysis_height=analysis_height, start_frame=start_frame, end_frame=end_frame)
+    for analyzer in analyzers:
+        pipeline.register(analyzer)
+    results = pipeline.run()
+    if not pipeline.frame_count:
+        raise RuntimeError(f"Fatia {start_frame}–{end_frame} não decodificou nenhum frame.")
+    states = {a.name: a.boundary_state() for a in analyzers}
+    return results, states, pipeline.frame_count, pipeline.fps
+
+
+# === ⚡ Pipeline fatiado no tempo ===
+class ShardedFramePipeline(FramePipeline):
+    """
+    Mesmo contrato do FramePipeline, mas decodifica fatias alinhadas a keyframes
+    em paralelo (ProcessPoolExecutor) e costura os resultados: cada analisador
+    recalcula em `merge_shards` o que depende do frame vizinho (diferença de
+    movimento, troca de cena), então o resultado é igual ao do caminho serial.
+
+    Analisadores não fatiáveis (ex.: YOLO via cv2.dnn) rodam no processo atual
+    enquanto as fatias são decodificadas. Vídeos curtos, sem keyframes
+    conhecidos ou em processos que não podem criar filhos (workers Celery
+    prefork) caem no caminho serial.
+    """
+
+    def __init__(self, video_path: str, analysis_height: Optional[int] = None, cache=None,
+                 workers: int = PARALLEL_ANALYSIS_WORKERS, min_shard_seconds: float = PARALLEL_MIN_SHARD_SECONDS):
+        super().__init__(video_path, analysis_height=analysis_height, cache=cache)
+        self.workers = max(1, int(workers))
+        self.min_shard_seconds = min_shard_seconds
+
+    def _plan(self) -> List[Tuple[int, Optional[int]]]:
+        cap = cv2.VideoCapture(self.video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        if not fps or frame_count <= 0:
+            return [(0, None)]
+
+        shards = min(self.workers, int(frame_count / fps // max(self.min_shard_seconds, 1e-6)))
+        if shards <= 1:
+            return [(0, None)]
+        keyframes = probe_keyframe_times(self.video_path)
+        if not len(keyframes):
+            return [(0, None)]
+        return plan_shards(np.round((keyframes - keyframes[0]) * fps), frame_count, shards)
+
+    def _decode(self) -> Dict[str, Any]:
+        try:
+            shards = self._plan() if self.workers > 1 else [(0, None)]
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível planejar fatias, analisando em série: {e}")
+            shards = [(0, None)]
+        shardable = [a for a in self.analyzers if a.shardable]
+        if len(shards) < 2 or not shardable:
+            return super()._decode()
+
+        local = [a for a in self.analyzers if not a.shardable]
+        logger.info(f"⚡ Análise em {len(shards)} fatias com {min(self.workers, len(shards))} processos: "
+                    f"{[a.name for a in shardable]}")
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(shards))) as pool:
+                futures = [pool.submit(_analyze_shard, self.video_path, shardable, self.analysis_height, start, end)
+                           for start, end in shards]
+
+                local_results = {}
+                if local:
+                    serial = FramePipeline(self.video_path, analysis_height=self.analysis_height)
+                    for analyzer in local:
+                        serial.register(analyzer)
+                    local_results = serial.run()
+
+                parts = [future.result() for future in futures]
+        except Exception as e:
+            logger.warning(f"⚠️ Análise paralela indisponível, analisando em série: {e}")
+            return super()._decode()
+
+        self.fps = parts[0][3]
+        self.frame_count = sum(frame_count for _, _, frame_count, _ in parts)
+        results = dict(local_results)
+        for analyzer in shardable:
+            results[analyzer.name] = analyzer.merge_shards(
+                [(shard_results[analyzer.name], states[analyzer.name]) for shard_results, states, _, _ in parts]
+            )
+        return {a.name: results[a.name] for a in self.analyzers}
+
+
+def run_parallel_frame_pipeline(video_path: str, analyzers: List[FrameAnalyzer], analysis_height: Optional[int] = None,
+                                workers: int = PARALLEL_ANALYSIS_WORKERS, cache=None) -> Dict[str, Any]:
+    """Atalho equivalente a run_frame_pipeline, com fatias em paralelo."""
+    pipeline = ShardedFramePipeline(video_path, analysis_height=analysis_height, cache=cache, workers=workers)
+    for analyzer in analyzers:
+        pipeline.register(analyzer)
+    return pipeline.run()
@@ -1,19 +1,23 @@
 import os
+import time
 import shutil
 import logging
 from uuid import uuid4
+from contextlib import contextmanager
 from fastapi import HTTPException
 
-from app.services.ai_processing import process_video
+from app.services.ai_processing import select_cut_segments
+from app.services.filter_chain import FilterChain, TrimStage
 from app.services.video_filters import (
     apply_opencv_filter,
     apply_moviepy_effect,
     apply_style_transfer,
     apply_banuba_filter,
+    chain_stage_for,
 )
 from app.services.transcription import transcribe_video
 from app.services.voice_generator import generate_voice
-from app.services.scene_detector import detect_scenes_pyscenedetect, split_scenes
+from app.services.scene_detector import detect_scenes, split_scenes
 
 # === 🛠️ Logger padronizado ===
 logger = logging.getLogger("processing_pipeline")
@@ -24,6 +28,43 @@ if not logger.hasHandlers():
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# === ⏱️ Tempo por estágio ===
+@contextmanager
+def _timed(timings: dict, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(timings.get(stage, 0.0) + time.perf_counter() - start, 3)
+
+
+def _materialize(chain: FilterChain, temp_dir: str, name: str, timings: dict) -> str:
+    """Renderiza os estágios acumulados (um único encode) e devolve o caminho resultante."""
+    if not chain:
+        return chain.input_path
+    output_path = os.path.join(temp_dir, f"{name}.mp4")
+    logger.info(f"🔗 Estágios compilados {[type(s).__name__ for s in chain.stages]} → {output_path}")
+    with _timed(timings, "render"):
+        chain.render(output_path)
+    return output_path
+
+
+# === ✅ Validação do filtro ===
+FILTER_SOURCES = ("opencv", "moviepy", "pytorch", "banuba")
+
+
+def _check_filter_request(filter_type: str, filter_source: str, style_model_path: str) -> None:
+    """Recusa pedidos de filtro inválidos antes de analisar ou renderizar qualquer coisa."""
+    if not filter_type:
+        return
+    if filter_source == "user_style":
+        raise HTTPException(status_code=501, detail="Estilo personalizado ainda não implementado.")
+    if filter_source not in FILTER_SOURCES:
+        raise HTTPException(status_code=400, detail="Filtro inválido.")
+    if filter_source == "pytorch" and not style_model_path:
+        raise HTTPException(status_code=400, detail="Modelo de estilo ausente.")
+
+
 # === 🎞️ Pipeline principal ===
 def full_video_pipeline(
     input_path: str,
@@ -42,61 +83,75 @@ def full_video_pipeline(
 ) -> dict:
     """
     Executa a pipeline completa de edição de vídeo com IA.
+
+    Corte e filtros expressáveis em ffmpeg são compilados numa única
+    renderização; um MP4 intermediário só é gerado antes de um estágio que
+    precisa do arquivo em Python (style transfer, Banuba, OpenCV sem
+    equivalente) e ao final, para transcrição e upload.
     """
     pipeline_id = str(uuid4())
     temp_dir = os.path.join("/tmp", pipeline_id)
     os.makedirs(temp_dir, exist_ok=True)
     logger.info(f"📽️ Pipeline {pipeline_id} iniciado | user_id={user_id} | arquivo={input_path}")
 
+    timings = {}
     try:
+        _check_filter_request(filter_type, filter_source, style_model_path)
+
         base_name = pipeline_id
         current_path = input_path
+        chain = FilterChain(current_path)
 
-        # === 1. Corte inteligente
+        # === 1. Corte inteligente (compilado na cadeia)
         if apply_cutting:
-            processed_path = os.path.join(temp_dir, f"cut_{base_name}.mp4")
-            logger.info(f"🎬 Cortando vídeo → {processed_path}")
-            process_video(current_path, processed_path)
-            current_path = processed_path
+            logger.info("🎬 Selecionando trechos para corte")
+            with _timed(timings, "cut_analysis"):
+                chain.add(TrimStage(select_cut_segments(current_path)))
 
         # === 2. Aplicação de filtro visual
-        if filter_type:
+        stage = chain_stage_for(filter_source, filter_type) if filter_type else None
+        if stage is not None:
+            logger.info(f"🎨 Filtro '{filter_type}' via {filter_source} compilado na cadeia ffmpeg")
+            chain.add(stage)
+        elif filter_type:
+            # Estágio só em Python: materializa o que foi acumulado até aqui
+            current_path = _materialize(chain, temp_dir, f"cut_{base_name}", timings)
             filtered_path = os.path.join(temp_dir, f"filtered_{base_name}.mp4")
             logger.info(f"🎨 Filtro '{filter_type}' via {filter_source} → {filtered_path}")
-
-            if filter_source == "user_style":
-                raise HTTPException(status_code=501, detail="Estilo personalizado ainda não implementado.")
-            elif filter_source == "opencv":
-                apply_opencv_filter(current_path, filtered_path, filter_type)
-            elif filter_source == "moviepy":
-                apply_moviepy_effect(current_path, filtered_path, filter_type)
-            elif filter_source == "pytorch":
-                if not style_model_path:
-                    raise HTTPException(status_code=400, detail="Modelo de estilo ausente.")
-                apply_style_transfer(current_path, filtered_path, style_model_path)
-            elif filter_source == "banuba":
-                apply_banuba_filter(current_path, filtered_path, filter_type)
-            else:
-                raise HTTPException(status_code=400, detail="Filtro inválido.")
+            with _timed(timings, "filter"):
+                if filter_source == "opencv":
+                    apply_opencv_filter(current_path, filtered_path, filter_type)
+                elif filter_source == "moviepy":
+                    apply_moviepy_effect(current_path, filtered_path, filter_type)
+                elif filter_source == "pytorch":
+                    apply_style_transfer(current_path, filtered_path, style_model_path)
+                elif filter_source == "banuba":
+                    apply_banuba_filter(current_path, filtered_path, filter_type)
 
             current_path = filtered_path
+            chain = FilterChain(current_path)
+
+        current_path = _materialize(chain, temp_dir, f"processed_{base_name}", timings)
 
         # === 3. Transcrição
         transcription_data = None
         if transcribe:
             logger.info(f"📝 Transcrevendo vídeo (formato: {transcription_format})")
-            transcription_data = transcribe_video(current_path, format=transcription_format)
+            with _timed(timings, "transcription"):
+                transcription_data = transcribe_video(current_path, format=transcription_format)
 
         # === 4. Geração de voz IA
         voice_url = None
         if generate_voice_ia and voice_text:
             logger.info(f"🔊 Gerando voz IA | lang={voice_lang}, provider={voice_provider}")
-            voice_url = generate_voice(voice_text, lang=voice_lang, provider=voice_provider)
+            with _timed(timings, "voice"):
+                voice_url = generate_voice(voice_text, lang=voice_lang, provider=voice_provider)
 
         # === 5. Upload do vídeo final
         s3_key = f"user_{user_id}/processed/final_{base_name}.mp4"
         logger.info(f"📤 Upload vídeo final para S3 → {s3_key}")
-        final_video_url = upload_to_s3(current_path, s3_key)
+        with _timed(timings, "upload"):
+            final_video_url = upload_to_s3(current_path, s3_key)
 
         # === 6. Detecção e separação de cenas
         scene_segments = []
@@ -104,8 +159,9 @@ def full_video_pipeline(
 
         if separar_cenas:
             logger.info("🎞️ Separando cenas com threshold=30.0")
-            scene_segments = detect_scenes_pyscenedetect(current_path, threshold=30.0)
-            local_clips = split_scenes(current_path, scene_segments)
+            with _timed(timings, "scenes"):
+                scene_segments = detect_scenes(current_path, threshold=30.0)
+                local_clips = split_scenes(current_path, scene_segments)
 
             for idx, clip_path in enumerate(local_clips):
                 scene_key = f"user_{user_id}/scenes/{base_name}_scene_{idx+1}.mp4"
@@ -121,9 +177,10 @@ def full_video_pipeline(
             "voice_url": voice_url,
             "scene_segments": scene_segments,
             "scene_clips": scene_clips_urls,
+            "stage_timings": timings,
         }
 
-        logger.info(f"✅ Pipeline {pipeline_id} finalizada com sucesso.")
+        logger.info(f"✅ Pipeline {pipeline_id} finalizada com sucesso | tempos por estágio: {timings}")
         return result
 
     except HTTPException as http_exc:
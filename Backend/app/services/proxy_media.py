@@ -0,0 +1,99 @@
+# 📁 backend/app/services/proxy_media.py
+
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+from typing import Optional
+
+from app.utils.ffmpeg_pipe import probe_video_stream
+from app.utils.video_tools import x264_encode_args
+
+logger = logging.getLogger(__name__)
+
+# === ⚙️ Configuração ===
+PROXY_DIR = os.getenv("PROXY_DIR", os.path.join(tempfile.gettempdir(), "proxies"))
+PROXY_HEIGHT = int(os.getenv("PROXY_HEIGHT", 360))
+# Keyframe a cada N frames (1 = all-intra): seek e corte em qualquer ponto custam no máximo N frames
+PROXY_GOP = int(os.getenv("PROXY_GOP", 10))
+PROXY_PRESET = os.getenv("PROXY_PRESET", "ultrafast")
+PROXY_CRF = int(os.getenv("PROXY_CRF", 28))
+
+
+# === 📍 Localização do proxy ===
+def proxy_path(source_path: str, height: int = PROXY_HEIGHT) -> str:
+    """
+    Caminho do proxy de `source_path`. O nome leva um digest do caminho, tamanho e
+    mtime da fonte: substituir o arquivo original invalida o proxy antigo.
+    """
+    stat = os.stat(source_path)
+    key = f"{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(PROXY_DIR, f"{stem}_{digest}_{height}p.mp4")
+
+
+def get_proxy(source_path: str, height: int = PROXY_HEIGHT) -> Optional[str]:
+    """Proxy pronto para `source_path`, ou None se ainda não foi gerado."""
+    if not os.path.exists(source_path):
+        return None
+    path = proxy_path(source_path, height)
+    return path if os.path.exists(path) else None
+
+
+def resolve_media(source_path: str, use_proxy: bool = True, height: int = PROXY_HEIGHT) -> str:
+    """Arquivo para prévias e análise: o proxy quando pronto, senão a própria fonte."""
+    if use_proxy:
+        proxy = get_proxy(source_path, height)
+        if proxy:
+            return proxy
+        logger.info(f"⏳ Proxy ainda não disponível, usando a fonte: {source_path}")
+    return source_path
+
+
+# === 🎬 Geração ===
+def build_proxy_command(source_path: str, output_path: str, height: int = PROXY_HEIGHT,
+                        gop: int = PROXY_GOP) -> list:
+    # fps_mode passthrough: mesmos frames e timestamps da fonte, então um tempo
+    # escolhido no proxy corta exatamente o mesmo frame no original
+    return [
+        "ffmpeg", "-y", "-v", "error", "-nostdin", "-i", source_path,
+        "-map", "0:v:0", "-map", "0:a?",
+        "-vf", f"scale=-2:{height}:flags=bilinear", "-fps_mode", "passthrough",
+        *x264_encode_args(preset=PROXY_PRESET, crf=PROXY_CRF),
+        "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0", "-bf", "0",
+        "-c:a", "aac", "-b:a", "96k", "-ac", "2",
+        "-movflags", "+faststart", output_path,
+    ]
+
+
+def generate_proxy(source_path: str, height: int = PROXY_HEIGHT, gop: int = PROXY_GOP) -> str:
+    """
+    Gera (se ainda não existe) o proxy de baixa resolução e GOP curto de
+    `source_path` e retorna o caminho. Fontes já pequenas são usadas como estão.
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {source_path}")
+
+    _, source_height, _ = probe_video_stream(source_path)
+    if source_height <= height:
+        logger.info(f"ℹ️ Fonte já tem {source_height}p, proxy desnecessário: {source_path}")
+        return source_path
+
+    path = proxy_path(source_path, height)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(PROXY_DIR, exist_ok=True)
+    # Escreve em arquivo parcial e renomeia: quem consulta nunca vê um proxy incompleto
+    partial_path = f"{os.path.splitext(path)[0]}.{os.getpid()}.part.mp4"
+    result = subprocess.run(build_proxy_command(source_path, partial_path, height, gop),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+    os.replace(partial_path, path)
+    logger.info(f"🪶 Proxy {height}p gerado: {source_path} → {path}")
+    return path
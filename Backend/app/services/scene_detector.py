@@ -1,13 +1,21 @@
 import os
-import cv2
+import shutil
 import subprocess
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
 from scenedetect import VideoManager, SceneManager
 from scenedetect.detectors import ContentDetector
-from ultralytics import YOLO
+
+from app.services.editor import cut_worker_budget
+from app.services.frame_sampler import iter_sampled_frames
+from app.services.model_registry import get_model
+from app.services.object_detection import YOLO_BATCH_SIZE, iter_ultralytics_detections
+from app.services.scene_engine import SCENE_METHODS, SceneEngine
+from app.utils.video_tools import segment_command, x264_encode_args
 
 # === 🛠️ Logger ===
 logger = logging.getLogger("scene_detector")
@@ -22,7 +30,33 @@ if not logger.hasHandlers():
 TMP_DIR = os.getenv("TMP_DIR", "/tmp")
 os.makedirs(TMP_DIR, exist_ok=True)
 
-# === 🔍 PySceneDetect: Detecção de Cenas ===
+# "parallel" = um ffmpeg por cena com seek no input; "segment" = um único ffmpeg com o segment muxer
+SPLIT_SCENES_MODE = os.getenv("SPLIT_SCENES_MODE", "parallel")
+# 0 = uma cena simultânea por núcleo
+SPLIT_SCENES_WORKERS = int(os.getenv("SPLIT_SCENES_WORKERS", 0))
+
+# === 🎬 Detecção de Cenas (motor único, frames reduzidos) ===
+def detect_scenes(video_path: str, threshold: Optional[float] = None, method: str = "content",
+                  frame_skip: int = 1) -> List[Tuple[float, float]]:
+    """
+    Cenas (início, fim) pelo método escolhido na requisição: content, threshold e
+    histogram pontuam os frames em NumPy; scdet e select deixam o escore com os
+    filtros do ffmpeg. Sem `threshold`, vale o padrão do método (30 no content).
+    """
+    if method not in SCENE_METHODS:
+        raise HTTPException(status_code=400, detail=f"Método de detecção de cenas inválido: {method}")
+    if threshold is None:
+        threshold = 30.0 if method == "content" else SCENE_METHODS[method]
+    logger.info(f"🎞️ Analisando cenas: {video_path} (método={method}, threshold={threshold})")
+    try:
+        scenes = SceneEngine(method, threshold, frame_skip=frame_skip).detect(video_path)
+        logger.info(f"✅ {len(scenes)} cenas detectadas.")
+        return scenes
+    except Exception as e:
+        logger.error(f"❌ Erro na detecção de cenas: {e}")
+        raise HTTPException(status_code=500, detail=f"Erro ao detectar cenas: {str(e)}")
+
+# === 🔍 PySceneDetect: Detecção de Cenas (referência) ===
 def detect_scenes_pyscenedetect(video_path: str, threshold: float = 30.0) -> List[Tuple[float, float]]:
     logger.info(f"🎞️ Analisando cenas: {video_path} (threshold={threshold})")
 
@@ -48,29 +82,20 @@ def detect_scenes_pyscenedetect(video_path: str, threshold: float = 30.0) -> Lis
             video_manager.release()
 
 # === 🧠 YOLO: Detecção de Objetos ===
-def detect_yolo_objects(video_path: str, model_name: str = "yolov8n.pt", interval_sec: int = 2) -> List[float]:
+def detect_yolo_objects(video_path: str, model_name: str = "yolov8n.pt", interval_sec: int = 2,
+                        batch_size: int = YOLO_BATCH_SIZE) -> List[float]:
     logger.info(f"🔍 Detectando objetos com YOLO: {video_path} (modelo={model_name})")
 
     try:
-        model = YOLO(model_name)
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise HTTPException(status_code=400, detail="Não foi possível abrir o vídeo.")
-
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        frame_interval = int(fps * interval_sec)
+        model = get_model("yolo", model_name)
         detected_times = set()
 
-        for frame_num in range(0, total_frames, frame_interval):
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-            ret, frame = cap.read()
-            if not ret:
-                continue
-
-            results = model(frame, verbose=False)
-            if len(results[0].boxes) > 0:
-                detected_times.add(frame_num / fps)
+        # Amostragem sequencial (grab) ou só de keyframes, sem um seek por amostra;
+        # inferência em lotes: uma chamada ao modelo a cada `batch_size` amostras
+        samples = iter_sampled_frames(video_path, interval_sec=interval_sec)
+        for timestamp, result in iter_ultralytics_detections(model, samples, batch_size):
+            if len(result.boxes) > 0:
+                detected_times.add(timestamp)
 
         logger.info(f"🎯 Objetos detectados em {len(detected_times)} momentos.")
         return sorted(detected_times)
@@ -79,35 +104,93 @@ def detect_yolo_objects(video_path: str, model_name: str = "yolov8n.pt", interva
         logger.error(f"❌ Erro na detecção com YOLO: {e}")
         raise HTTPException(status_code=500, detail=f"Erro no YOLO: {str(e)}")
 
-    finally:
-        if 'cap' in locals() and cap.isOpened():
-            cap.release()
-
 # === ✂️ FFMPEG: Divisão por Cenas ===
-def split_scenes(video_path: str, scene_times: List[Tuple[float, float]]) -> List[str]:
-    logger.info(f"✂️ Iniciando corte do vídeo em {len(scene_times)} cenas...")
-
-    output_files = []
-
-    for idx, (start, end) in enumerate(scene_times):
-        duration = end - start
-        output_filename = f"scene_{idx+1}_{uuid4().hex[:8]}.mp4"
-        output_path = os.path.join(TMP_DIR, output_filename)
-
-        command = [
-            "ffmpeg", "-y", "-i", video_path,
-            "-ss", str(start), "-t", str(duration),
-            "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-            "-c:a", "aac", "-ac", "2", "-b:a", "128k",
-            output_path
+def _scene_command(video_path: str, start: float, end: float, output_path: str, threads: int) -> List[str]:
+    # -ss antes do -i: seek direto no keyframe anterior e decodificação só até o início exato da cena
+    return [
+        "ffmpeg", "-y", "-v", "error", "-nostdin",
+        "-accurate_seek", "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}",
+        "-map", "0:v:0", "-map", "0:a?",
+        *x264_encode_args(threads=threads),
+        "-c:a", "aac", "-ac", "2", "-b:a", "128k",
+        output_path,
+    ]
+
+
+def _split_parallel(video_path: str, scene_times: List[Tuple[float, float]], output_paths: List[str],
+                    workers: Optional[int]) -> None:
+    workers, threads = cut_worker_budget(len(scene_times), workers or SPLIT_SCENES_WORKERS)
+    logger.info(f"⚙️ {len(scene_times)} cenas em {workers} processos ffmpeg paralelos × {threads} threads")
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(subprocess.run, _scene_command(video_path, start, end, path, threads),
+                            check=True, capture_output=True)
+            for (start, end), path in zip(scene_times, output_paths)
         ]
+        for idx, future in enumerate(futures):
+            try:
+                future.result()
+            except subprocess.CalledProcessError as e:
+                logger.error(f"❌ Falha ao extrair cena {idx+1}: {e.stderr.decode()}")
+                raise HTTPException(status_code=500, detail=f"Erro ao extrair cena {idx+1}")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _split_segments(video_path: str, scene_times: List[Tuple[float, float]], output_paths: List[str]) -> None:
+    """Um único ffmpeg: decodifica o vídeo uma vez e o segment muxer corta em todas as bordas."""
+    bounds = sorted({t for scene in scene_times for t in scene} - {0.0})
+    index = {t: i + 1 for i, t in enumerate(bounds)}
+    index[0.0] = 0
+    work_dir = tempfile.mkdtemp(prefix="split_", dir=os.path.dirname(output_paths[0]))
+    try:
+        result = subprocess.run(segment_command(video_path, work_dir, bounds[:-1], "exact", end=bounds[-1]),
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.error(f"❌ Falha ao dividir cenas com o segment muxer: {result.stderr}")
+            raise HTTPException(status_code=500, detail="Erro ao extrair cenas")
+        # Segmentos entre cenas (lacunas) ficam no diretório temporário e são descartados
+        for (start, _), path in zip(scene_times, output_paths):
+            os.replace(os.path.join(work_dir, f"scene_{index[start]:03d}.mp4"), path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
-        try:
-            subprocess.run(command, check=True, capture_output=True)
-            output_files.append(output_path)
-            logger.info(f"✅ Cena {idx+1} salva: {output_filename}")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"❌ Falha ao extrair cena {idx+1}: {e.stderr.decode()}")
-            raise HTTPException(status_code=500, detail=f"Erro ao extrair cena {idx+1}")
 
-    return output_files
+def split_scenes(video_path: str, scene_times: List[Tuple[float, float]], output_dir: str = TMP_DIR,
+                 mode: str = SPLIT_SCENES_MODE, workers: Optional[int] = None) -> List[str]:
+    """
+    Extrai cada cena (início, fim) para um MP4 (H.264 + AAC) em `output_dir`.
+
+    - mode="parallel": um ffmpeg por cena com seek no input, `workers` de cada vez.
+    - mode="segment": um único ffmpeg com o segment muxer (keyframes forçados nas
+      bordas); cenas sobrepostas caem no modo paralelo.
+
+    Uma falha remove as cenas já gravadas.
+    """
+    logger.info(f"✂️ Iniciando corte do vídeo em {len(scene_times)} cenas ({mode})...")
+    if not scene_times:
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_paths = [os.path.join(output_dir, f"scene_{idx+1}_{uuid4().hex[:8]}.mp4")
+                    for idx in range(len(scene_times))]
+    ordered = sorted(scene_times)
+    overlapping = any(prev[1] > cur[0] + 1e-6 for prev, cur in zip(ordered, ordered[1:]))
+    if mode == "segment" and overlapping:
+        logger.warning("⚠️ Cenas sobrepostas: o segment muxer não se aplica, usando o modo paralelo")
+        mode = "parallel"
+
+    try:
+        if mode == "segment":
+            _split_segments(video_path, scene_times, output_paths)
+        else:
+            _split_parallel(video_path, scene_times, output_paths, workers)
+    except Exception:
+        for path in output_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    logger.info(f"✅ {len(output_paths)} cenas salvas em {output_dir}")
+    return output_paths
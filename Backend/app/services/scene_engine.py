@@ -0,0 +1,218 @@
+# 📁 backend/app/services/scene_engine.py
+
+import logging
+import os
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.utils.ffmpeg_pipe import (iter_frame_batches, iter_frame_metadata, probe_media, probe_video_stream,
+                                   scaled_size)
+
+logger = logging.getLogger(__name__)
+
+# === ⚙️ Configuração ===
+SCENE_ENGINE_HEIGHT = int(os.getenv("SCENE_ENGINE_HEIGHT", 144))
+# Analisa 1 a cada N frames (1 = todos); o corte fica com precisão de N frames
+SCENE_FRAME_SKIP = int(os.getenv("SCENE_FRAME_SKIP", 1))
+SCENE_BATCH_SIZE = int(os.getenv("SCENE_BATCH_SIZE", 64))
+
+# content: média de |ΔHSV| (como o ContentDetector do PySceneDetect), corte se >= limiar
+# threshold: brilho médio, corte no meio de cada fade para preto (limiar = "preto")
+# histogram: correlação do histograma de luminância com o frame anterior, corte se < limiar
+# absdiff: média de |Δcinza| entre frames vizinhos (detector antigo do editor), corte se > limiar
+# scdet / select: escore de cena calculado pelo próprio ffmpeg (0-100 / 0-1), corte se >= limiar
+SCENE_METHODS = {"content": 27.0, "threshold": 12.0, "histogram": 0.5, "absdiff": 30.0, "scdet": 10.0, "select": 0.3}
+
+
+# === 🧮 Sinais por lote (vetorizados sobre frames empilhados) ===
+def _content_scores(batch: np.ndarray, prev: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    count, height, width, _ = batch.shape
+    hsv = cv2.cvtColor(batch.reshape(count * height, width, 3), cv2.COLOR_BGR2HSV)
+    hsv = hsv.reshape(count, height, width, 3).astype(np.int16)
+    stacked = hsv if prev is None else np.concatenate([prev[None], hsv])
+    scores = np.abs(np.diff(stacked, axis=0)).mean(axis=(1, 2, 3))
+    if prev is None:
+        scores = np.concatenate([[0.0], scores])
+    return scores, hsv[-1]
+
+
+def _histogram_scores(batch: np.ndarray, prev: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    count = batch.shape[0]
+    # Um bincount para o lote inteiro: o valor de cada pixel é deslocado por 256 * índice do frame
+    offsets = (np.arange(count, dtype=np.int64) * 256)[:, None]
+    hists = np.bincount((batch.reshape(count, -1) + offsets).ravel(), minlength=count * 256)
+    hists = hists.reshape(count, 256).astype(np.float64)
+    stacked = hists if prev is None else np.vstack([prev, hists])
+    # Correlação de Pearson entre histogramas vizinhos (= cv2.HISTCMP_CORREL)
+    centered = stacked - stacked.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered ** 2).sum(axis=1))
+    num = (centered[1:] * centered[:-1]).sum(axis=1)
+    den = norms[1:] * norms[:-1]
+    scores = np.divide(num, den, out=np.ones_like(num), where=den > 0)
+    if prev is None:
+        scores = np.concatenate([[1.0], scores])
+    return scores, hists[-1:]
+
+
+def _absdiff_scores(batch: np.ndarray, prev: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    frames = batch.astype(np.int16)
+    stacked = frames if prev is None else np.concatenate([prev[None], frames])
+    scores = np.abs(np.diff(stacked, axis=0)).mean(axis=(1, 2))
+    if prev is None:
+        scores = np.concatenate([[0.0], scores])
+    return scores, frames[-1]
+
+
+def _brightness_scores(batch: np.ndarray, prev: Optional[np.ndarray]) -> Tuple[np.ndarray, None]:
+    return batch.reshape(batch.shape[0], -1).mean(axis=1), None
+
+
+_SCORERS = {
+    "content": ("bgr24", _content_scores),
+    "threshold": ("gray", _brightness_scores),
+    "histogram": ("gray", _histogram_scores),
+    "absdiff": ("gray", _absdiff_scores),
+}
+
+# Filtro do ffmpeg e chave do metadata=print com o escore de cada frame
+_FFMPEG_SCORERS = {
+    "scdet": ("scdet=threshold=100", "lavfi.scd.score"),
+    "select": ("select='gte(scene\\,0)'", "lavfi.scene_score"),
+}
+
+
+def _ffmpeg_scores(video_path: str, method: str, width: int, height: int, frame_skip: int) -> np.ndarray:
+    """
+    Escores de cena lidos do metadata=print: o ffmpeg decodifica, reduz e compara os frames.
+    Devolve [pts_time, escore] por frame (2 x N): o pts real vale também para vídeo VFR.
+    """
+    scene_filter, key = _FFMPEG_SCORERS[method]
+    video_filter = f"scale={width}:{height}:flags=area,{scene_filter}"
+    if frame_skip > 1:
+        video_filter = f"select='not(mod(n\\,{frame_skip}))',{video_filter}"
+    signal = [(pts_time, float(values.get(key, 0.0)))
+              for pts_time, values in iter_frame_metadata(video_path, video_filter)]
+    return np.array(signal, dtype=np.float64).reshape(-1, 2).T
+
+
+# === 🎬 Motor de detecção ===
+class SceneEngine:
+    """
+    Detector de cenas único para os algoritmos content, threshold, histogram e absdiff.
+
+    O ffmpeg decodifica e reduz os frames (`analysis_height`, pulando `frame_skip`)
+    e os entrega em lotes; cada lote vira um sinal por frame calculado em NumPy.
+    Nos métodos scdet e select o escore sai do próprio filtro do ffmpeg e só os
+    números atravessam o pipe.
+    O sinal bruto fica no cache de análise, sem o limiar na chave: mudar o limiar
+    ou `min_scene_len` não decodifica o vídeo de novo.
+    """
+
+    def __init__(self, method: str = "content", threshold: Optional[float] = None,
+                 analysis_height: int = SCENE_ENGINE_HEIGHT, frame_skip: int = SCENE_FRAME_SKIP,
+                 min_scene_len: float = 0.0, batch_size: int = SCENE_BATCH_SIZE, cache=None):
+        if method not in SCENE_METHODS:
+            raise ValueError(f"Método de detecção de cenas desconhecido: {method}")
+        self.method = method
+        self.threshold = SCENE_METHODS[method] if threshold is None else threshold
+        self.analysis_height = analysis_height
+        self.frame_skip = max(1, int(frame_skip))
+        self.min_scene_len = min_scene_len
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.fps = 0.0
+        self.times = None
+        self.frames_analyzed = 0
+        self.elapsed = 0.0
+
+    def _params(self) -> dict:
+        return {"analysis_height": self.analysis_height, "frame_skip": self.frame_skip}
+
+    def scores(self, video_path: str) -> np.ndarray:
+        """Sinal do método para cada frame amostrado; scdet/select também preenchem `self.times` (pts)."""
+        start = time.perf_counter()
+        width, height, self.fps = probe_video_stream(video_path)
+        name = f"scene_{self.method}"
+        # v2 nos métodos do ffmpeg: o sinal passou a levar o pts_time de cada frame
+        version = 2 if self.method in _FFMPEG_SCORERS else 1
+        cached = self.cache.get(video_path, name, self._params(), version) if self.cache is not None else None
+        if cached is not None:
+            scores = np.asarray(cached, dtype=np.float64)
+        else:
+            width, height = scaled_size(width, height, self.analysis_height)
+            if self.method in _FFMPEG_SCORERS:
+                scores = _ffmpeg_scores(video_path, self.method, width, height, self.frame_skip)
+            else:
+                pix_fmt, scorer = _SCORERS[self.method]
+                parts, prev = [], None
+                for batch in iter_frame_batches(video_path, width, height, pix_fmt, self.batch_size, self.frame_skip):
+                    batch_scores, prev = scorer(batch, prev)
+                    parts.append(batch_scores)
+                scores = np.concatenate(parts) if parts else np.zeros(0)
+            if self.cache is not None and scores.size:
+                self.cache.put(video_path, name, self._params(), scores, version)
+        # scdet/select guardam [pts_time, escore]; os demais só o escore, no passo fixo de frame_skip / fps
+        self.times, scores = (scores[0], scores[1]) if self.method in _FFMPEG_SCORERS else (None, scores)
+        self.frames_analyzed = len(scores)
+        self.elapsed = time.perf_counter() - start
+        return scores
+
+    def cuts_from_scores(self, scores: np.ndarray, times: Optional[np.ndarray] = None) -> List[float]:
+        """Cortes a partir do sinal; sem `times`, o frame i fica em i * frame_skip / fps."""
+        if times is None:
+            step = self.frame_skip / self.fps if self.fps else 0.0
+            times = np.arange(len(scores)) * step
+        if self.method == "threshold":
+            dark = scores < self.threshold
+            # Transições escuro/claro: o corte fica no meio de cada trecho escuro precedido de imagem
+            edges = np.flatnonzero(np.diff(dark.astype(np.int8))) + 1
+            fade_outs = [i for i in edges if dark[i]]
+            candidates = [(times[i] + times[j]) / 2 for i in fade_outs for j in edges[edges > i][:1]]
+        elif self.method == "histogram":
+            candidates = times[1:][scores[1:] < self.threshold]
+        elif self.method == "absdiff":
+            candidates = times[1:][scores[1:] > self.threshold]
+        else:
+            candidates = times[1:][scores[1:] >= self.threshold]
+
+        cuts, last = [], 0.0
+        for t in candidates:
+            if t - last >= self.min_scene_len:
+                cuts.append(float(t))
+                last = t
+        return cuts
+
+    def detect_cuts(self, video_path: str) -> List[float]:
+        """Instantes (s) de troca de cena."""
+        scores = self.scores(video_path)
+        cuts = self.cuts_from_scores(scores, self.times)
+        logger.info(f"🎬 Cenas ({self.method}, {self.analysis_height}p, skip {self.frame_skip}): {len(cuts)} cortes "
+                    f"em {self.frames_analyzed} frames ({self.throughput:.0f} frames/s)")
+        return cuts
+
+    def detect(self, video_path: str) -> List[Tuple[float, float]]:
+        """Cenas (início, fim) em segundos cobrindo o vídeo inteiro."""
+        cuts = self.detect_cuts(video_path)
+        duration, _ = probe_media(video_path)
+        bounds = [0.0] + [t for t in cuts if t < duration] + [duration]
+        return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+    @property
+    def throughput(self) -> float:
+        """Frames do vídeo cobertos por segundo na última análise."""
+        return self.frames_analyzed * self.frame_skip / self.elapsed if self.elapsed else 0.0
+
+
+def detect_scenes(video_path: str, method: str = "content", threshold: Optional[float] = None,
+                  **options) -> List[Tuple[float, float]]:
+    """Atalho: cenas (início, fim) do vídeo; `options` vão para o SceneEngine."""
+    return SceneEngine(method, threshold, **options).detect(video_path)
+
+
+def detect_scene_cuts(video_path: str, method: str = "content", threshold: Optional[float] = None,
+                      **options) -> List[float]:
+    """Atalho: instantes de corte do vídeo; `options` vão para o SceneEngine."""
+    return SceneEngine(method, threshold, **options).detect_cuts(video_path)
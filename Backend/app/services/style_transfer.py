@@ -0,0 +1,206 @@
+# 📁 backend/app/services/style_transfer.py
+
+import logging
+import os
+import queue
+import subprocess
+import threading
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+import torch
+
+from app.services.model_registry import get_model
+from app.utils.ffmpeg_pipe import scaled_size
+from app.utils.video_tools import x264_encode_args
+
+logger = logging.getLogger(__name__)
+
+# === ⚙️ Configuração ===
+STYLE_TRANSFER_BATCH_SIZE = int(os.getenv("STYLE_TRANSFER_BATCH_SIZE", 4))
+# Frames decodificados aguardando inferência (limita o pico de memória)
+STYLE_TRANSFER_QUEUE_SIZE = int(os.getenv("STYLE_TRANSFER_QUEUE_SIZE", 16))
+# Altura de processamento (0 = original); o resultado é ampliado de volta no encode
+STYLE_TRANSFER_HEIGHT = int(os.getenv("STYLE_TRANSFER_HEIGHT", 0))
+
+_END = object()
+
+
+# === 🧵 Runtime em três estágios: leitura → inferência em lote → escrita ===
+class StyleTransferRuntime:
+    """
+    Aplica um modelo TorchScript de style transfer a um vídeo inteiro.
+
+    - Uma thread decodifica (e reduz, se `processing_height`) e enche uma fila limitada.
+    - A thread chamadora monta lotes de `batch_size` frames e roda `torch.inference_mode`.
+    - Uma thread escritora envia os frames RGB, em ordem, para o stdin de um ffmpeg
+      (H.264), que amplia para o tamanho original e copia o áudio da fonte.
+
+    O pico de memória é limitado por `queue_size` frames na entrada mais
+    `queue_size // batch_size` lotes na saída.
+    """
+
+    def __init__(self, model_path: str, batch_size: int = STYLE_TRANSFER_BATCH_SIZE,
+                 queue_size: int = STYLE_TRANSFER_QUEUE_SIZE, processing_height: int = STYLE_TRANSFER_HEIGHT):
+        self.model = get_model("torchscript", model_path)
+        self.device = next(self.model.parameters(), torch.empty(0)).device
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(self.batch_size, queue_size)
+        self.processing_height = processing_height
+        self.frames_processed = 0
+
+    # === 📥 Leitura ===
+    def _reader(self, cap: cv2.VideoCapture, size: Optional[Tuple[int, int]],
+                frames: queue.Queue, stop: threading.Event, errors: list) -> None:
+        try:
+            while not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if size:
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                self._put(frames, frame, stop)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            self._put(frames, _END, stop)
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    # === 🧠 Inferência ===
+    def _infer(self, batch: list) -> np.ndarray:
+        # BGR uint8 (N, H, W, 3) → RGB float (N, 3, H, W) em 0..255, como ToTensor().mul(255)
+        array = np.stack(batch)[..., ::-1]
+        tensor = torch.from_numpy(np.ascontiguousarray(array)).to(self.device)
+        tensor = tensor.permute(0, 3, 1, 2).float()
+        with torch.inference_mode():
+            result = self.model(tensor)
+        return result.clamp(0, 255).to(torch.uint8).permute(0, 2, 3, 1).contiguous().cpu().numpy()
+
+    # === 📤 Escrita ===
+    @staticmethod
+    def _encoder_command(input_path: str, output_path: str, frame_size: Tuple[int, int],
+                         output_size: Tuple[int, int], fps: float) -> list:
+        width, height = output_size
+        return [
+            "ffmpeg", "-y", "-v", "error", "-nostdin",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{frame_size[0]}x{frame_size[1]}",
+            "-r", f"{fps or 30:.6f}", "-i", "pipe:0",
+            "-i", input_path,
+            "-map", "0:v:0", "-map", "1:a?",
+            "-vf", f"scale={width - width % 2}:{height - height % 2}:flags=bicubic",
+            *x264_encode_args(),
+            "-c:a", "copy", "-shortest",
+            "-movflags", "+faststart",
+            output_path,
+        ]
+
+    def _writer(self, input_path: str, output_path: str, output_size: Tuple[int, int], fps: float,
+                batches: queue.Queue, stop: threading.Event, errors: list) -> None:
+        encoder = None
+        pending, next_index = {}, 0
+        try:
+            while True:
+                item = batches.get()
+                if item is _END:
+                    break
+                index, frames = item
+                pending[index] = frames
+                # Lotes escritos estritamente na ordem de leitura
+                while next_index in pending:
+                    frames = pending.pop(next_index)
+                    if encoder is None:
+                        frame_size = (frames.shape[2], frames.shape[1])
+                        cmd = self._encoder_command(input_path, output_path, frame_size, output_size, fps)
+                        encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+                    encoder.stdin.write(frames.tobytes())
+                    next_index += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+            # Esvazia a fila para não travar a inferência
+            while batches.get() is not _END:
+                pass
+        finally:
+            if encoder is not None:
+                try:
+                    encoder.stdin.close()
+                except OSError:
+                    pass
+                stderr = encoder.stderr.read().decode(errors="replace")
+                if encoder.wait() != 0:
+                    # A mensagem do ffmpeg explica melhor que o BrokenPipe da escrita
+                    errors.insert(0, RuntimeError(stderr.strip() or f"ffmpeg saiu com código {encoder.returncode}"))
+
+    # === ▶️ Execução ===
+    def run(self, input_path: str, output_path: str) -> int:
+        cap = cv2.VideoCapture(input_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Não foi possível abrir o vídeo: {input_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        size = None
+        if self.processing_height and self.processing_height < height:
+            size = scaled_size(width, height, self.processing_height)
+
+        frames: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batches: queue.Queue = queue.Queue(maxsize=max(1, self.queue_size // self.batch_size))
+        stop = threading.Event()
+        errors: list = []
+        reader = threading.Thread(target=self._reader, args=(cap, size, frames, stop, errors), daemon=True)
+        writer = threading.Thread(target=self._writer,
+                                  args=(input_path, output_path, (width, height), fps, batches, stop, errors),
+                                  daemon=True)
+        reader.start()
+        writer.start()
+
+        self.frames_processed = 0
+        batch, index = [], 0
+        try:
+            while not stop.is_set():
+                try:
+                    frame = frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if frame is not _END:
+                    batch.append(frame)
+                if batch and (len(batch) == self.batch_size or frame is _END):
+                    self._put(batches, (index, self._infer(batch)), stop)
+                    self.frames_processed += len(batch)
+                    batch, index = [], index + 1
+                if frame is _END:
+                    break
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            batches.put(_END)
+            writer.join()
+            stop.set()
+            reader.join()
+            cap.release()
+
+        if errors:
+            raise errors[0]
+        if not self.frames_processed:
+            raise RuntimeError(f"Nenhum frame lido de {input_path}")
+        logger.info(f"🎨 Style transfer: {self.frames_processed} frames em lotes de {self.batch_size}"
+                    f"{f' a {size[0]}x{size[1]}' if size else ''}")
+        return self.frames_processed
+
+
+def run_style_transfer(input_path: str, output_path: str, model_path: str,
+                       batch_size: int = STYLE_TRANSFER_BATCH_SIZE,
+                       processing_height: int = STYLE_TRANSFER_HEIGHT) -> int:
+    """Atalho: aplica o modelo ao vídeo e retorna o número de frames processados."""
+    runtime = StyleTransferRuntime(model_path, batch_size=batch_size, processing_height=processing_height)
+    return runtime.run(input_path, output_path)
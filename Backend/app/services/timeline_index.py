@@ -0,0 +1,64 @@
+# 📁 backend/app/services/timeline_index.py
+
+import numpy as np
+from typing import Iterable, NamedTuple
+
+
+# === 🗂️ Índice sobre eventos ordenados no tempo ===
+class TimelineIndex:
+    """
+    Eventos (timestamps em segundos) ordenados uma vez; consultas de janela
+    viram duas buscas binárias, para um candidato ou para todos de uma vez.
+
+    `closed=True` consulta [start, end]; `closed=False` consulta (start, end),
+    equivalente a `abs(t - centro) < raio`.
+    """
+
+    def __init__(self, events: Iterable[float]):
+        self.times = np.sort(np.fromiter((float(t) for t in events), dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def count_within_many(self, starts, ends, closed: bool = True) -> np.ndarray:
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        if closed:
+            counts = np.searchsorted(self.times, ends, side="right") - np.searchsorted(self.times, starts, side="left")
+        else:
+            counts = np.searchsorted(self.times, ends, side="left") - np.searchsorted(self.times, starts, side="right")
+        return np.maximum(counts, 0)
+
+    def any_within_many(self, starts, ends, closed: bool = True) -> np.ndarray:
+        return self.count_within_many(starts, ends, closed) > 0
+
+    def count_within(self, start: float, end: float, closed: bool = True) -> int:
+        return int(self.count_within_many([start], [end], closed)[0])
+
+    def any_within(self, start: float, end: float, closed: bool = True) -> bool:
+        return self.count_within(start, end, closed) > 0
+
+    def any_near_many(self, centers, radius: float) -> np.ndarray:
+        """Para cada centro: existe evento com |t - centro| < radius."""
+        centers = np.asarray(centers, dtype=np.float64)
+        return self.any_within_many(centers - radius, centers + radius, closed=False)
+
+
+# === 🧮 Pontuação vetorizada de segmentos candidatos ===
+class ScoreTerm(NamedTuple):
+    """Soma `weight` aos candidatos com algum evento de `index` na janela [starts, ends]."""
+
+    index: TimelineIndex
+    weight: float
+    starts: np.ndarray
+    ends: np.ndarray
+    closed: bool = True
+
+
+def score_segments(base, terms: Iterable[ScoreTerm]) -> np.ndarray:
+    """Pontua todos os candidatos de uma vez: base + Σ peso * (há evento na janela)."""
+    scores = np.array(base, dtype=np.float64, copy=True)
+    for term in terms:
+        if term.weight and len(term.index):
+            scores += term.weight * term.index.any_within_many(term.starts, term.ends, term.closed)
+    return scores
@@ -6,8 +6,8 @@ import subprocess
 import logging
 from typing import Literal, Dict, Union
 from fastapi import HTTPException
-from functools import lru_cache
-import whisper
+
+from app.services.model_registry import get_model
 
 # === 🛠️ Logger Nomeado ===
 logger = logging.getLogger("transcription_service")
@@ -16,15 +16,10 @@ if not logger.hasHandlers():
 
 TMP_DIR = "/tmp"
 
-# === 🧠 Carregar Modelo Whisper (Cacheado) ===
-@lru_cache(maxsize=1)
+# === 🧠 Carregar Modelo Whisper (registro de modelos do processo) ===
 def get_whisper_model():
-    model_name = os.getenv("WHISPER_MODEL", "base")
-    logger.info(f"📦 Carregando modelo Whisper: '{model_name}'...")
     try:
-        model = whisper.load_model(model_name)
-        logger.info(f"✅ Modelo Whisper '{model_name}' carregado com sucesso.")
-        return model
+        return get_model("whisper")
     except Exception as e:
         logger.exception(f"❌ Erro ao carregar modelo Whisper: {e}")
         raise HTTPException(status_code=500, detail="Erro ao carregar modelo Whisper.")
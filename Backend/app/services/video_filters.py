@@ -2,19 +2,27 @@
 
 import os
 import cv2
-import torch
+import shutil
+import subprocess
 import logging
 import numpy as np
 import tempfile
 from uuid import uuid4
-from PIL import Image
+from typing import List, Optional
 from dotenv import load_dotenv
 from moviepy.editor import VideoFileClip, vfx
-from torchvision import transforms
 from fastapi import HTTPException
 import requests
 import openai
 
+from app.services.analysis_cache import analysis_cache
+from app.services.color_lut import COLOR_LOOKS, get_color_lut
+from app.services.filter_chain import FadeStage, FilterChain, Stage, VideoFilterStage
+from app.services.scene_engine import SceneEngine
+from app.services.style_transfer import STYLE_TRANSFER_HEIGHT, run_style_transfer
+from app.utils.ffmpeg_pipe import probe_keyframe_times
+from app.utils.video_tools import FFMPEG_PRESET, FFMPEG_THREADS, segment_command, x264_encode_args
+
 # === 🔐 Carregar variáveis de ambiente ===
 load_dotenv()
 BANUBA_API_KEY = os.getenv("BANUBA_API_KEY")
@@ -22,17 +30,86 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 openai.api_key = OPENAI_API_KEY
 
 TMP_DIR = "/tmp" if os.path.exists("/tmp") else tempfile.gettempdir()
+# "auto" usa o filtro nativo do ffmpeg quando existe; "opencv"/"moviepy" forçam os laços por frame em Python
+VIDEO_FILTER_BACKEND = os.getenv("VIDEO_FILTER_BACKEND", "auto")
+PYTHON_BACKENDS = ("opencv", "moviepy")
+# "fast" = cópia de stream em keyframes; "exact" = reencode com corte no frame da troca de cena
+SCENE_SPLIT_MODE = os.getenv("SCENE_SPLIT_MODE", "fast")
+SCENE_ANALYSIS_HEIGHT = int(os.getenv("SCENE_ANALYSIS_HEIGHT", 180))
 
 # === 🛠️ Logging Setup ===
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(module)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# === 🎛️ Filtros equivalentes em filter graph do ffmpeg ===
+# blur: GaussianBlur (15, 15) com sigma 0 → sigma = 0.3 * ((15 - 1) * 0.5 - 1) + 0.8 = 2.6
+# Looks de cor (sepia, vintage, bw...) vêm do color_lut como LUT 3D (.cube → lut3d)
+FFMPEG_FILTER_GRAPHS = {
+    "gray": "format=gray",
+    "blur": "gblur=sigma=2.6",
+}
+
+
+def ffmpeg_filter_graph(filter_type: str) -> Optional[str]:
+    if filter_type in FFMPEG_FILTER_GRAPHS:
+        return FFMPEG_FILTER_GRAPHS[filter_type]
+    if filter_type in COLOR_LOOKS:
+        return get_color_lut(filter_type).ffmpeg_graph()
+    return None
+
+
+# Efeitos MoviePy equivalentes (colorx multiplica RGB com saturação em 255)
+MOVIEPY_EFFECT_STAGES = {
+    "color_boost": VideoFilterStage("colorchannelmixer=rr=1.4:gg=1.4:bb=1.4", "color_boost"),
+    "fadein": FadeStage(fade_in=1),
+    "fadeout": FadeStage(fade_out=1),
+}
+
+
+def chain_stage_for(filter_source: str, filter_type: str) -> Optional[Stage]:
+    """Estágio de FilterChain equivalente ao filtro, ou None se ele só existe em Python."""
+    if VIDEO_FILTER_BACKEND in PYTHON_BACKENDS:
+        return None
+    if filter_source == "opencv":
+        graph = ffmpeg_filter_graph(filter_type)
+        return VideoFilterStage(graph, filter_type) if graph else None
+    if filter_source == "moviepy":
+        return MOVIEPY_EFFECT_STAGES.get(filter_type)
+    return None
+
+
+def run_ffmpeg_filter(input_path: str, output_path: str, filter_graph: str) -> None:
+    """Aplica `filter_graph` ao vídeo num único processo ffmpeg (H.264), copiando o áudio."""
+    cmd = [
+        "ffmpeg", "-y", "-v", "error", "-nostdin",
+        "-i", input_path,
+        "-map", "0:v:0", "-map", "0:a?",
+        "-vf", filter_graph,
+        *x264_encode_args(),
+        "-c:a", "copy",
+        "-movflags", "+faststart",
+        output_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+
+
 # === 🎨 Filtros com OpenCV ===
-def apply_opencv_filter(input_path: str, output_path: str, filter_type: str):
+def apply_opencv_filter(input_path: str, output_path: str, filter_type: str, backend: str = VIDEO_FILTER_BACKEND):
     if not os.path.exists(input_path):
         logger.error(f"Arquivo de vídeo não encontrado: {input_path}")
         raise HTTPException(status_code=404, detail="Arquivo de vídeo não encontrado.")
 
+    if backend not in PYTHON_BACKENDS and ffmpeg_filter_graph(filter_type) and shutil.which("ffmpeg"):
+        logger.info(f"Aplicando filtro '{filter_type}' via ffmpeg em '{input_path}' → '{output_path}'")
+        try:
+            run_ffmpeg_filter(input_path, output_path, ffmpeg_filter_graph(filter_type))
+            logger.info(f"✅ Filtro '{filter_type}' aplicado com sucesso (ffmpeg).")
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Filtro via ffmpeg falhou, usando OpenCV: {e}")
+
     logger.info(f"Aplicando filtro OpenCV '{filter_type}' em '{input_path}' → '{output_path}'")
     try:
         cap = cv2.VideoCapture(input_path)
@@ -41,6 +118,7 @@ def apply_opencv_filter(input_path: str, output_path: str, filter_type: str):
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        color_lut = get_color_lut(filter_type) if filter_type in COLOR_LOOKS else None
 
         if not out.isOpened():
             raise Exception("Falha ao inicializar o gravador de vídeo.")
@@ -53,12 +131,8 @@ def apply_opencv_filter(input_path: str, output_path: str, filter_type: str):
             if filter_type == "gray":
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
                 frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-            elif filter_type == "sepia":
-                sepia = np.array([[0.272, 0.534, 0.131],
-                                  [0.349, 0.686, 0.168],
-                                  [0.393, 0.769, 0.189]])
-                frame = cv2.transform(frame, sepia)
-                frame = np.clip(frame, 0, 255).astype(np.uint8)
+            elif color_lut is not None:
+                frame = color_lut.apply(frame)
             elif filter_type == "blur":
                 frame = cv2.GaussianBlur(frame, (15, 15), 0)
             else:
@@ -74,17 +148,28 @@ def apply_opencv_filter(input_path: str, output_path: str, filter_type: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # === 🎬 Efeitos com MoviePy ===
-def apply_moviepy_effect(input_path: str, output_path: str, effect: str):
+def apply_moviepy_effect(input_path: str, output_path: str, effect: str, backend: str = VIDEO_FILTER_BACKEND):
     if not os.path.exists(input_path):
         logger.error(f"Arquivo de vídeo não encontrado: {input_path}")
         raise HTTPException(status_code=404, detail="Arquivo de vídeo não encontrado.")
 
+    # fade/afade e mistura de canais num único ffmpeg; MoviePy fica como fallback
+    if backend not in PYTHON_BACKENDS and effect in MOVIEPY_EFFECT_STAGES and shutil.which("ffmpeg"):
+        logger.info(f"Aplicando efeito '{effect}' via ffmpeg em '{input_path}' → '{output_path}'")
+        try:
+            FilterChain(input_path).add(MOVIEPY_EFFECT_STAGES[effect]).render(output_path)
+            logger.info(f"✅ Efeito '{effect}' aplicado com sucesso (ffmpeg).")
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Efeito via ffmpeg falhou, usando MoviePy: {e}")
+
     logger.info(f"Aplicando efeito MoviePy '{effect}' em '{input_path}' → '{output_path}'")
     try:
         clip = VideoFileClip(input_path)
 
         if effect == "color_boost":
-            result = clip.fx(vfx.colorx, 1.4)
+            color_lut = get_color_lut("color_boost")
+            result = clip.fl_image(lambda frame: color_lut.apply(frame, channel_order="rgb"))
         elif effect == "fadein":
             result = clip.fx(vfx.fadein, 1)
         elif effect == "fadeout":
@@ -92,7 +177,8 @@ def apply_moviepy_effect(input_path: str, output_path: str, effect: str):
         else:
             raise HTTPException(status_code=400, detail="Efeito MoviePy inválido.")
 
-        result.write_videofile(output_path, codec="libx264", audio_codec="aac", logger=None)
+        result.write_videofile(output_path, codec="libx264", audio_codec="aac", preset=FFMPEG_PRESET,
+                               threads=FFMPEG_THREADS or None, logger=None)
         clip.close()
         logger.info(f"✅ Efeito MoviePy '{effect}' aplicado com sucesso.")
     except Exception as e:
@@ -100,41 +186,14 @@ def apply_moviepy_effect(input_path: str, output_path: str, effect: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 # === 🧠 Transferência de Estilo com PyTorch ===
-def apply_style_transfer(input_path: str, output_path: str, model_path: str):
+def apply_style_transfer(input_path: str, output_path: str, model_path: str,
+                         processing_height: int = STYLE_TRANSFER_HEIGHT):
     if not os.path.exists(input_path) or not os.path.exists(model_path):
         raise HTTPException(status_code=404, detail="Arquivo de vídeo ou modelo não encontrado.")
 
     logger.info(f"Aplicando style transfer com modelo '{model_path}'")
     try:
-        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        model = torch.jit.load(model_path).to(device).eval()
-
-        cap = cv2.VideoCapture(input_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
-
-        preprocess = transforms.Compose([
-            transforms.ToTensor(),
-            transforms.Lambda(lambda x: x.mul(255))
-        ])
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            tensor = preprocess(Image.fromarray(rgb).resize((width, height))).unsqueeze(0).to(device)
-
-            with torch.no_grad():
-                result = model(tensor).cpu().squeeze().clamp(0, 255).numpy()
-                frame_out = result.transpose(1, 2, 0).astype("uint8")
-                out.write(cv2.cvtColor(frame_out, cv2.COLOR_RGB2BGR))
-
-        cap.release()
-        out.release()
+        run_style_transfer(input_path, output_path, model_path, processing_height=processing_height)
         logger.info("✅ Style transfer concluído com sucesso.")
     except Exception as e:
         logger.error(f"❌ Erro na IA Style Transfer: {e}")
@@ -211,52 +270,48 @@ def generate_voice_elevenlabs(text: str, voice_id: str, api_key: str = None) ->
         raise HTTPException(status_code=500, detail=str(e))
 
 # === ✂️ Corte Automático por Cenas ===
-def split_video_by_scene(input_path: str, output_dir: str) -> list:
-    logger.info(f"🧩 Iniciando corte por cenas: {input_path}")
+def detect_scene_cuts(input_path: str, threshold: float = 0.5,
+                      analysis_height: Optional[int] = SCENE_ANALYSIS_HEIGHT) -> List[float]:
+    """Instantes (s) de troca de cena por correlação de histograma em frames reduzidos."""
+    engine = SceneEngine("histogram", threshold, analysis_height=analysis_height, cache=analysis_cache)
+    return engine.detect_cuts(input_path)
+
+
+def snap_to_keyframes(cuts: List[float], keyframes: np.ndarray) -> List[float]:
+    """Leva cada corte ao keyframe mais próximo (sem repetir e sem cortar no início)."""
+    if not len(keyframes):
+        return sorted(set(cuts))
+    idx = np.clip(np.searchsorted(keyframes, cuts), 1, len(keyframes) - 1)
+    nearest = np.where(np.abs(keyframes[idx - 1] - cuts) <= np.abs(keyframes[idx] - cuts),
+                       keyframes[idx - 1], keyframes[idx])
+    return [float(t) for t in np.unique(nearest) if t > keyframes[0]]
+
+
+def split_video_by_scene(input_path: str, output_dir: str, mode: str = SCENE_SPLIT_MODE) -> list:
+    """
+    Divide o vídeo em cenas mantendo o áudio.
+
+    - mode="fast": cortes levados ao keyframe mais próximo e cópia de stream (sem reencode).
+    - mode="exact": cortes no frame detectado, com um único reencode H.264/AAC.
+    """
+    logger.info(f"🧩 Iniciando corte por cenas ({mode}): {input_path}")
     try:
-        cap = cv2.VideoCapture(input_path)
-        if not cap.isOpened():
-            raise Exception("Falha ao abrir o vídeo.")
-
-        scene_paths = []
-        scene_id = 0
-        last_hist = None
-        threshold = 0.5
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        out = None
-        frame_idx = 0
-
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            hist = cv2.calcHist([frame], [0], None, [256], [0, 256])
-            hist = cv2.normalize(hist, hist).flatten()
-
-            if last_hist is not None:
-                correlation = cv2.compareHist(last_hist, hist, cv2.HISTCMP_CORREL)
-                if correlation < threshold:
-                    if out:
-                        out.release()
-                    scene_id += 1
-                    logger.info(f"🔪 Nova cena detectada no frame {frame_idx} (corr: {correlation:.2f})")
-
-            if out is None or not out.isOpened():
-                scene_path = os.path.join(output_dir, f"scene_{scene_id:03}.mp4")
-                out = cv2.VideoWriter(scene_path, fourcc, fps, (width, height))
-                scene_paths.append(scene_path)
-
-            out.write(frame)
-            last_hist = hist
-            frame_idx += 1
-
-        cap.release()
-        if out:
-            out.release()
+        cuts = detect_scene_cuts(input_path)
+        if mode != "exact":
+            cuts = snap_to_keyframes(cuts, probe_keyframe_times(input_path))
+        else:
+            cuts = sorted(t for t in set(cuts) if t > 0)
+        logger.info(f"🔪 {len(cuts)} cortes de cena: {[round(t, 2) for t in cuts]}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        result = subprocess.run(segment_command(input_path, output_dir, cuts, mode), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+
+        list_path = os.path.join(output_dir, "scenes.txt")
+        with open(list_path) as f:
+            scene_paths = [os.path.join(output_dir, line.strip()) for line in f if line.strip()]
+        os.remove(list_path)
         logger.info(f"✅ Corte concluído com {len(scene_paths)} cenas.")
         return scene_paths
     except Exception as e:
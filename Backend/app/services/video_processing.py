@@ -3,15 +3,20 @@
 import os
 import cv2
 import logging
-import librosa
 import numpy as np
 from uuid import uuid4
 from typing import List, Tuple, Optional
 from dotenv import load_dotenv
-from pydub import AudioSegment
-from moviepy.editor import VideoFileClip
 from sklearn.preprocessing import MinMaxScaler
-from scenedetect import detect, ContentDetector
+
+from app.services import audio_analysis
+from app.services.analysis_cache import analysis_cache
+from app.services.audio_analysis import AudioFeatures
+from app.services.frame_pipeline import FramePipeline, MotionAnalyzer, run_frame_pipeline
+from app.services.scene_engine import SceneEngine
+from app.services.timeline_index import ScoreTerm, TimelineIndex, score_segments
+from app.utils.ffmpeg_pipe import probe_keyframe_times
+from app.utils.smart_cut import smart_cut
 
 # === 🔧 Configurações ===
 load_dotenv()
@@ -22,79 +27,28 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # === 🎥 Análise de Movimento ===
-def analyze_motion(video_path: str) -> List[float]:
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error(f"Não foi possível abrir o vídeo: {video_path}")
-        return []
-
-    prev_frame = None
-    intensities = []
+def _motion_analyzer() -> MotionAnalyzer:
+    return MotionAnalyzer(dilate_iterations=2, score="mean")
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
-        if prev_frame is not None:
-            diff = cv2.absdiff(prev_frame, gray)
-            thresh = cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)[1]
-            thresh = cv2.dilate(thresh, None, iterations=2)
-            motion_score = np.sum(thresh) / float(thresh.size)
-            intensities.append(motion_score)
-        prev_frame = gray
-
-    cap.release()
-    return intensities
+def analyze_motion(video_path: str, analysis_height: Optional[int] = None) -> List[float]:
+    return run_frame_pipeline(video_path, [_motion_analyzer()], analysis_height, cache=analysis_cache)["motion"]
 
 # === 🔊 Picos de Áudio ===
 def analyze_audio_peaks(video_path: str, threshold: int = -20) -> List[float]:
-    try:
-        audio = AudioSegment.from_file(video_path)
-    except Exception as e:
-        logger.error(f"Erro ao carregar áudio: {e}")
-        return []
-
-    peaks = []
-    window_ms, overlap = 50, 25
-
-    for i in range(0, len(audio) - window_ms, overlap):
-        seg = audio[i:i+window_ms]
-        if seg.max_dBFS > threshold:
-            peak_time = (i + window_ms / 2) / 1000.0
-            peaks.append(peak_time)
-
-    return sorted(set(peaks))
+    # Níveis brutos em cache por conteúdo; o limiar é aplicado na leitura (ver services/audio_analysis.py)
+    return audio_analysis.analyze_audio_peaks(video_path, threshold, cache=analysis_cache)
 
 # === 🎼 Características Avançadas de Áudio ===
-def analyze_audio_features(video_path: str) -> dict:
-    try:
-        y, sr = librosa.load(video_path)
-        centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-        beat_times = librosa.frames_to_time(beats, sr=sr)
-        audio_features = {}
-        for i, t in enumerate(librosa.frames_to_time(np.arange(len(centroid)), sr=sr)):
-            audio_features[t] = {
-                "spectral_centroid": centroid[i],
-                "is_music": any(abs(t - bt) < 0.2 for bt in beat_times)
-            }
-        return audio_features
-    except Exception as e:
-        logger.error(f"Erro em audio_features: {e}")
-        return {}
+def analyze_audio_features(video_path: str) -> AudioFeatures:
+    return audio_analysis.analyze_audio_features(video_path, cache=analysis_cache)
 
 # === ✂️ Corte de Segmentos ===
 def cut_video_segments(video_path: str, segments: List[Tuple[float, float]]) -> List[str]:
-    clip = VideoFileClip(video_path)
+    keyframes = probe_keyframe_times(video_path)
     paths = []
     for idx, (start, end) in enumerate(segments):
-        subclip = clip.subclip(start, end)
         out_path = os.path.join(TMP_DIR, f"cut_{idx+1}_{uuid4()}.mp4")
-        subclip.write_videofile(out_path, codec="libx264", audio_codec="aac", verbose=False, logger=None)
-        paths.append(out_path)
-    clip.close()
+        paths.append(smart_cut(video_path, start, end, out_path, keyframes=keyframes))
     return paths
 
 # === 🧠 Análise de Cenas e Segmentos ===
@@ -114,37 +68,46 @@ def analyze_video_for_cuts(
     speech_weight=0.3,
     music_weight=0.2,
     yolo_model=None,
-    yolo_classes=None
+    yolo_classes=None,
+    analysis_height: Optional[int] = None
 ) -> List[Tuple[float, float]]:
     
-    motion = analyze_motion(video_path)
+    # Uma única decodificação fornece movimento, fps e duração (em cinza reduzido com `analysis_height`);
+    # com o mesmo conteúdo já analisado, o cache evita decodificar de novo
+    pipeline = FramePipeline(video_path, analysis_height=analysis_height, cache=analysis_cache).register(_motion_analyzer())
+    motion = pipeline.run()["motion"]
+    if not pipeline.fps:
+        logger.error(f"Erro ao abrir video: {video_path}")
+        return []
+    fps = pipeline.fps
+    duration = pipeline.duration
+
     motion_scaled = MinMaxScaler().fit_transform(np.array(motion).reshape(-1, 1)).flatten() if motion else []
     audio_peaks = analyze_audio_peaks(video_path, audio_peak_threshold)
-    audio_features = analyze_audio_features(video_path) if analyze_audio_advanced else {}
-
-    try:
-        clip = VideoFileClip(video_path)
-        fps = clip.fps
-        duration = clip.duration
-    except Exception as e:
-        logger.error(f"Erro ao abrir video: {e}")
-        return []
+    audio_features = analyze_audio_features(video_path) if analyze_audio_advanced else AudioFeatures.empty()
 
     segments = []
 
     if use_scene_detection:
-        scenes = detect(video_path, ContentDetector(threshold=scene_threshold))
-        for scene in scenes:
-            start, end = scene[0].get_seconds(), scene[1].get_seconds()
-            duration_seg = end - start
-            if min_cut_duration <= duration_seg <= max_cut_duration:
-                score = 1.0
-                mid_time = (start + end) / 2
-                score += audio_weight if any(abs(mid_time - t) < 0.5 for t in audio_peaks) else 0
-                score += motion_weight * (motion_scaled[int(mid_time * fps)] if motion_scaled else 0)
-                score += speech_weight if any(abs(mid_time - t) < 0.5 and v.get('spectral_centroid', 0) > 3000 for t, v in audio_features.items()) else 0
-                score += music_weight * 0.5 if any(abs(mid_time - t) < 0.5 and v.get('is_music') for t, v in audio_features.items()) else 0
-                segments.append((start, end, score))
+        scenes = SceneEngine("content", scene_threshold, cache=analysis_cache).detect(video_path)
+        bounds = np.array(scenes, dtype=np.float64).reshape(-1, 2)
+        lengths = bounds[:, 1] - bounds[:, 0]
+        bounds = bounds[(lengths >= min_cut_duration) & (lengths <= max_cut_duration)]
+
+        if len(bounds):
+            # Todas as cenas pontuadas de uma vez com busca binária sobre os eventos
+            starts, ends = bounds[:, 0], bounds[:, 1]
+            mids = (starts + ends) / 2
+            near = (mids - 0.5, mids + 0.5)
+            scores = score_segments(np.ones(len(bounds)), [
+                ScoreTerm(TimelineIndex(audio_peaks), audio_weight, *near, closed=False),
+                ScoreTerm(TimelineIndex(audio_features.times[audio_features.spectral_centroid > 3000]), speech_weight, *near, closed=False),
+                ScoreTerm(TimelineIndex(audio_features.times[audio_features.is_music]), music_weight * 0.5, *near, closed=False),
+            ])
+            if len(motion_scaled):
+                frames = np.minimum((mids * fps).astype(int), len(motion_scaled) - 1)
+                scores += motion_weight * motion_scaled[frames]
+            segments = [(float(s), float(e), float(sc)) for s, e, sc in zip(starts, ends, scores)]
 
     if not segments:
         for t in audio_peaks:
@@ -2,9 +2,14 @@
 
 from app.celery_app import celery_app
 from app.services import transcription, video_filters, voice_generator, video_processing, usage_limits
-from app.video_analyzer import analyze_motion, analyze_faces, analyze_objects, analyze_audio_peaks, VideoAnalysisConfig
+from app.services.video_analyzer import VideoAnalysisConfig, analyze_video_for_cuts
+from app.services.editor import concatenate_video_segments, run_cuts
+from app.services.model_registry import get_model
+from app.services.timeline_index import ScoreTerm, TimelineIndex, score_segments
+from app.services.edl import EditDecisionList
+from app.services.proxy_media import generate_proxy
+from app.utils.ffmpeg_pipe import probe_media, probe_video_stream
 from app.config import settings
-from moviepy.editor import VideoFileClip, concatenate_videoclips
 from sklearn.preprocessing import MinMaxScaler
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -14,6 +19,7 @@ import requests
 import numpy as np
 import cv2
 import os
+import tempfile
 import time
 
 logger = get_task_logger(__name__)
@@ -113,66 +119,68 @@ def suggest_edits_for_retention_task(attention_data, video_path):
     return {"video_id": attention_data.get('video_id'), "suggestions": suggestions}
 
 @shared_task
-def generate_video_highlights_task(video_path, highlight_duration=30, config_params=None):
+def generate_video_highlights_task(video_path, highlight_duration=30, config_params=None, output_path=None):
     try:
         config = VideoAnalysisConfig(**(config_params or {}))
-        motion = analyze_motion(video_path)
-        faces = analyze_faces(video_path, sample_rate=config.frame_sample_rate_face_object)
-        objects = analyze_objects(video_path, None, None, sample_rate=config.frame_sample_rate_face_object)
-        audio_peaks = analyze_audio_peaks(video_path, peak_threshold=config.audio_peak_threshold)
+        # Movimento e rostos numa única decodificação; objetos só com modelo YOLO
+        analysis = analyze_video_for_cuts(video_path, None, None, config)
+        motion, faces = analysis["motion"], analysis["faces"]
 
         potential = []
-        clip = VideoFileClip(video_path)
-        duration = clip.duration
-        fps = clip.fps
+        duration, _ = probe_media(video_path)
+        _, _, fps = probe_video_stream(video_path)
+        fps = fps or 30.0
 
-        if motion:
+        if len(motion):
             normalized = MinMaxScaler().fit_transform(np.array(motion).reshape(-1, 1)).flatten()
             from scipy.signal import find_peaks
-            peaks, _ = find_peaks(normalized, height=0.5, distance=int(fps * 2))
-            for peak in peaks:
-                t = peak / fps
-                start = max(0, t - 2)
-                end = min(duration, t + 3)
-                score = normalized[peak]
-                if any(abs(t - ts) < 1 for ts in faces): score += 0.3
-                if any(start <= ts <= end for ts in objects): score += 0.2
-                if any(start <= ts <= end for ts in audio_peaks): score += 0.1
-                potential.append({'start': start, 'end': end, 'score': score})
+            peaks, _ = find_peaks(normalized, height=0.5, distance=max(1, int(fps * 2)))
+            times = peaks / fps
+            starts = np.maximum(0, times - 2)
+            ends = np.minimum(duration, times + 3)
+            scores = score_segments(normalized[peaks], [
+                ScoreTerm(TimelineIndex(faces), 0.3, times - 1, times + 1, closed=False),
+                ScoreTerm(TimelineIndex(list(analysis["objects"])), 0.2, starts, ends),
+                ScoreTerm(TimelineIndex(analysis["audio_peaks"]), 0.1, starts, ends),
+            ])
+            potential = [
+                {'start': float(start), 'end': float(end), 'score': float(score)}
+                for start, end, score in zip(starts, ends, scores)
+            ]
 
         highlights = sorted(potential, key=lambda x: x['score'], reverse=True)
         selected = []
         total = 0
         for s in highlights:
             if total + (s['end'] - s['start']) <= highlight_duration:
-                selected.append((s['start'], s['end']))
+                selected.append(s)
                 total += (s['end'] - s['start'])
                 if total >= highlight_duration:
                     break
+        if not selected:
+            return {"video_id": os.path.basename(video_path), "segments": [], "error": "Nenhum destaque encontrado."}
 
-        clips = [clip.subclip(start, end) for start, end in selected]
-        final = concatenate_videoclips(clips)
-        output = f"highlight_{os.path.basename(video_path)}"
-        final.write_videofile(output, codec="libx264", audio_codec="aac")
-        clip.close()
-        final.close()
-        return {"video_id": os.path.basename(video_path), "highlight_path": output}
+        output = output_path or f"highlight_{os.path.basename(video_path)}"
+        with tempfile.TemporaryDirectory(prefix="highlights_") as work_dir:
+            jobs = [(s['start'], s['end'], os.path.join(work_dir, f"highlight_{i+1}.mp4"))
+                    for i, s in enumerate(selected)]
+            if not concatenate_video_segments(run_cuts(video_path, jobs), output):
+                raise RuntimeError("Falha ao concatenar os destaques.")
+        return {"video_id": os.path.basename(video_path), "highlight_path": output, "segments": selected}
 
     except Exception as e:
         return {"video_id": os.path.basename(video_path), "error": str(e)}
 
 @shared_task
 def analyze_sentiment_task(transcription_result: dict):
-    from transformers import pipeline
-
     try:
         # Garante que tem texto na transcrição
         text = transcription_result.get("text") or transcription_result.get("result")
         if not text:
             raise ValueError("Nenhum texto encontrado para análise de sentimento.")
 
-        # Carrega o pipeline de sentimento em português
-        sentiment_analyzer = pipeline("sentiment-analysis", model="pierreguillou/bert-base-cased-sentiment-analysis")
+        # Pipeline de sentimento em português, reaproveitado entre tarefas do worker
+        sentiment_analyzer = get_model("sentiment")
         
         # Aplica análise
         result = sentiment_analyzer(text[:512])  # limita para 512 tokens
@@ -209,11 +217,12 @@ def generate_intelligent_thumbnail_task(video_path: str, output_path: Optional[s
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Arquivo de vídeo não encontrado: {video_path}")
 
+        # Uma única amostra: um seek direto vale mais que varrer os keyframes do arquivo
         cap = cv2.VideoCapture(video_path)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        mid_frame = total_frames // 2
-        cap.set(cv2.CAP_PROP_POS_FRAMES, mid_frame)
+        cap.set(cv2.CAP_PROP_POS_FRAMES, total_frames // 2)
         success, frame = cap.read()
+        cap.release()
 
         if not success:
             raise Exception("Erro ao capturar frame do vídeo.")
@@ -224,7 +233,6 @@ def generate_intelligent_thumbnail_task(video_path: str, output_path: Optional[s
             output_path = f"/tmp/{base_name}_thumbnail.jpg"
 
         cv2.imwrite(output_path, frame)
-        cap.release()
 
         logger.info(f"✅ Thumbnail salva em: {output_path}")
         return {"status": "success", "thumbnail_path": output_path}
@@ -232,3 +240,24 @@ def generate_intelligent_thumbnail_task(video_path: str, output_path: Optional[s
     except Exception as e:
         logger.error(f"Erro ao gerar thumbnail: {e}")
         return {"status": "error", "error": str(e)}
+
+@shared_task
+def render_timeline_task(edl_data: dict, output_path: str, preview: bool = False):
+    try:
+        edl = EditDecisionList.from_dict(edl_data)
+        if preview:
+            edl = edl.proxied()
+        edl.render(output_path)
+        return {"status": "success", "output_path": output_path, "duration": edl.duration}
+    except Exception as e:
+        logger.error(f"Erro ao renderizar timeline: {e}")
+        return {"status": "error", "error": str(e)}
+
+@shared_task
+def generate_proxy_task(source_path: str):
+    try:
+        proxy_path = generate_proxy(source_path)
+        return {"status": "success", "source_path": source_path, "proxy_path": proxy_path}
+    except Exception as e:
+        logger.error(f"Erro ao gerar proxy: {e}")
+        return {"status": "error", "error": str(e)}
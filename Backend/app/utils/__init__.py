@@ -8,6 +8,7 @@ from .security_utils import *
 from .string_utils import *
 from .video_tools import *
 from .time_utils import *
+from .ffmpeg_pipe import *
 
 __all__ = [
     # jwt.py
@@ -36,6 +37,9 @@ __all__ = [
     "cut_video_segment",
     "compress_video",
     "get_video_metadata",
+    "x264_encode_args",
+    "x265_encode_args",
+    "segment_command",
 
     # time_utils.py
     "utc_now",
@@ -45,4 +49,17 @@ __all__ = [
     "to_unix",
     "parse_timestamp",
     "parse_timestamp_safe",
+
+    # ffmpeg_pipe.py
+    "probe_video_stream",
+    "scaled_size",
+    "iter_gray_frames",
+    "iter_frame_batches",
+    "iter_frame_metadata",
+    "probe_audio_stream",
+    "iter_pcm_chunks",
+    "probe_keyframe_times",
+    "probe_decoded_keyframe_times",
+    "probe_media",
+    "probe_stream_signature",
 ]
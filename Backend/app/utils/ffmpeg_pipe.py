@@ -0,0 +1,330 @@
+# 📁 app/utils/ffmpeg_pipe.py
+
+import json
+import logging
+import subprocess
+import tempfile
+from fractions import Fraction
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("ffmpeg_pipe")
+
+
+# === 📊 Dimensões e FPS do stream de vídeo ===
+def probe_video_stream(video_path: str) -> Tuple[int, int, float]:
+    """Retorna (largura, altura, fps) do primeiro stream de vídeo via ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height,avg_frame_rate,r_frame_rate",
+        "-of", "json",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    stream = json.loads(result.stdout).get("streams", [{}])[0]
+
+    rate = stream.get("avg_frame_rate") or "0/1"
+    if rate in ("0/0", "0/1"):
+        rate = stream.get("r_frame_rate") or "0/1"
+    fps = float(Fraction(rate)) if rate != "0/0" else 0.0
+    return int(stream["width"]), int(stream["height"]), fps
+
+
+# === 📐 Tamanho reduzido (largura par, sem upscale) ===
+def scaled_size(width: int, height: int, target_height: int) -> Tuple[int, int]:
+    if target_height >= height:
+        return width - width % 2, height - height % 2
+    new_width = int(round(width * target_height / height))
+    return new_width - new_width % 2, target_height - target_height % 2
+
+
+# === 🚨 Falha do ffmpeg em pipes de leitura ===
+def _raise_on_failure(returncode: int, stderr) -> None:
+    """RuntimeError com o stderr (arquivo temporário) quando o ffmpeg saiu com erro."""
+    if returncode != 0:
+        stderr.seek(0)
+        message = stderr.read().decode(errors="replace").strip()
+        raise RuntimeError(message or f"ffmpeg saiu com código {returncode}")
+
+
+# === 🎞️ Frames em tons de cinza já reduzidos pelo ffmpeg ===
+def iter_gray_frames(video_path: str, width: int, height: int,
+                     start_time: Optional[float] = None, max_frames: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    Decodifica o vídeo com `scale,format=gray` direto no ffmpeg e entrega
+    cada frame como uma matriz uint8 (height, width) lida de um pipe rawvideo.
+    `start_time` faz seek no input (preciso) e `max_frames` limita a saída.
+    Os frames saem como o decodificador os entrega (sem duplicar nem descartar
+    em vídeo VFR); se o ffmpeg falhar, o fim da leitura levanta RuntimeError.
+    """
+    cmd = ["ffmpeg", "-v", "error", "-nostdin"]
+    if start_time:
+        cmd += ["-ss", f"{start_time:.6f}"]
+    cmd += [
+        "-i", video_path,
+        "-an", "-sn", "-dn",
+        "-vf", f"scale={width}:{height}:flags=area,format=gray", "-fps_mode", "passthrough",
+    ]
+    if max_frames is not None:
+        cmd += ["-frames:v", str(max_frames)]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "gray", "-"]
+    frame_size = width * height
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, bufsize=frame_size * 4)
+        finished = False
+        try:
+            while True:
+                data = process.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                yield np.frombuffer(data, dtype=np.uint8).reshape(height, width)
+            finished = True
+        finally:
+            process.stdout.close()
+            if not finished and process.poll() is None:
+                process.kill()
+            returncode = process.wait()
+        _raise_on_failure(returncode, stderr)
+
+
+# === 🧱 Lotes de frames reduzidos (um array por lote) ===
+def iter_frame_batches(video_path: str, width: int, height: int, pix_fmt: str = "gray",
+                       batch_size: int = 64, frame_skip: int = 1, keyframes_only: bool = False) -> Iterator[np.ndarray]:
+    """
+    Como `iter_gray_frames`, mas entrega lotes empilhados (N, H, W) em cinza ou
+    (N, H, W, 3) em `bgr24`, lidos do pipe com uma única leitura por lote.
+    Com `frame_skip` > 1 o ffmpeg só escala e envia um frame a cada `frame_skip`;
+    com `keyframes_only` o decodificador descarta tudo que não é keyframe
+    (`-skip_frame nokey`) e só os keyframes saem, em ordem.
+    """
+    channels = 3 if pix_fmt == "bgr24" else 1
+    video_filter = f"scale={width}:{height}:flags=area,format={pix_fmt}"
+    if frame_skip > 1:
+        video_filter = f"select='not(mod(n\\,{frame_skip}))',{video_filter}"
+    cmd = ["ffmpeg", "-v", "error", "-nostdin"]
+    if keyframes_only:
+        cmd += ["-skip_frame", "nokey"]
+    cmd += [
+        "-i", video_path,
+        "-an", "-sn", "-dn", "-vf", video_filter, "-fps_mode", "passthrough",
+        "-f", "rawvideo", "-pix_fmt", pix_fmt, "-",
+    ]
+    frame_size = width * height * channels
+    shape = (height, width, 3) if channels == 3 else (height, width)
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               bufsize=frame_size * batch_size)
+    try:
+        while True:
+            data = process.stdout.read(frame_size * batch_size)
+            count = len(data) // frame_size
+            if count:
+                yield np.frombuffer(data, dtype=np.uint8, count=count * frame_size).reshape(count, *shape)
+            if count < batch_size:
+                break
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+# === 🏷️ Metadados por frame (filtros do ffmpeg + metadata=print) ===
+def iter_frame_metadata(video_path: str, video_filter: str) -> Iterator[Tuple[float, dict]]:
+    """
+    Roda `video_filter` seguido de `metadata=print` sem saída de vídeo e entrega
+    (pts_time, {chave: valor}) de cada frame, lidos do stdout enquanto o ffmpeg
+    decodifica. Nenhum pixel chega ao Python. Se o ffmpeg falhar, o fim da
+    iteração levanta RuntimeError com o stderr (fechar o gerador antes não levanta).
+    """
+    cmd = [
+        "ffmpeg", "-v", "error", "-nostdin", "-i", video_path,
+        "-an", "-sn", "-dn", "-vf", f"{video_filter},metadata=mode=print:file=-",
+        "-fps_mode", "passthrough", "-f", "null", "-",
+    ]
+    # stderr em arquivo temporário: um pipe cheio travaria o ffmpeg enquanto o stdout é lido
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        finished = False
+        try:
+            pts_time, values = None, {}
+            for line in process.stdout:
+                if line.startswith("frame:"):
+                    if pts_time is not None:
+                        yield pts_time, values
+                    pts_time, values = float(line.rsplit("pts_time:", 1)[1]), {}
+                elif "=" in line:
+                    key, value = line.strip().split("=", 1)
+                    values[key] = value
+            if pts_time is not None:
+                yield pts_time, values
+            finished = True
+        finally:
+            process.stdout.close()
+            if not finished and process.poll() is None:
+                process.kill()
+            returncode = process.wait()
+        _raise_on_failure(returncode, stderr)
+
+
+# === 🔊 Taxa de amostragem e canais do stream de áudio ===
+def probe_audio_stream(video_path: str) -> Tuple[int, int]:
+    """Retorna (sample_rate, canais) do primeiro stream de áudio via ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=sample_rate,channels",
+        "-of", "json",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    streams = json.loads(result.stdout).get("streams", [])
+    if not streams:
+        raise ValueError(f"Nenhum stream de áudio em: {video_path}")
+    return int(streams[0]["sample_rate"]), int(streams[0]["channels"])
+
+
+# === 🎚️ PCM s16le em blocos de tamanho fixo ===
+def iter_pcm_chunks(video_path: str, channels: int, chunk_frames: int) -> Iterator[np.ndarray]:
+    """
+    Decodifica o áudio na taxa e no layout originais e entrega blocos int16
+    de forma (frames, canais); só o último bloco pode ser menor.
+    """
+    cmd = [
+        "ffmpeg", "-v", "error", "-nostdin",
+        "-i", video_path,
+        "-vn", "-sn", "-dn",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-",
+    ]
+    chunk_bytes = chunk_frames * channels * 2
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=chunk_bytes)
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            usable = len(data) - len(data) % (channels * 2)
+            if usable <= 0:
+                break
+            yield np.frombuffer(data[:usable], dtype="<i2").reshape(-1, channels)
+            if len(data) < chunk_bytes:
+                break
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+# === 🔑 Timestamps dos keyframes (só demux, sem decodificar) ===
+def probe_keyframe_times(video_path: str) -> np.ndarray:
+    """
+    Lê as flags dos pacotes do vídeo e retorna os instantes (s) dos keyframes, ordenados.
+    Os pts vêm descontados do `start_time` do container: mesma referência do `-ss`
+    do ffmpeg e de `frame / fps` (arquivos .ts ou cortados não começam em zero).
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags:format=start_time",
+        "-of", "csv",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    times, start_time = [], 0.0
+    for line in result.stdout.splitlines():
+        section, _, fields = line.partition(",")
+        if section == "format":
+            start_time = float(fields) if fields not in ("", "N/A") else 0.0
+            continue
+        pts, _, flags = fields.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            times.append(float(pts))
+    return np.unique(np.array(times, dtype=np.float64)) - start_time
+
+
+def probe_decoded_keyframe_times(video_path: str) -> np.ndarray:
+    """
+    Instantes (s, descontado o `start_time`) dos frames que o decodificador entrega
+    com `-skip_frame nokey`: exatamente os frames de `iter_frame_batches(keyframes_only=True)`.
+    Decodifica só os keyframes, sem saída de pixels.
+    """
+    cmd = [
+        "ffprobe", "-v", "error", "-skip_frame", "nokey",
+        "-select_streams", "v:0",
+        "-show_entries", "frame=pts_time:format=start_time",
+        "-of", "csv",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    times, start_time = [], 0.0
+    for line in result.stdout.splitlines():
+        section, _, fields = line.partition(",")
+        value = fields.split(",", 1)[0]
+        if value in ("", "N/A"):
+            continue
+        if section == "format":
+            start_time = float(value)
+        elif section == "frame":
+            times.append(float(value))
+    return np.array(times, dtype=np.float64) - start_time
+
+
+# === ⏱️ Duração e presença de áudio ===
+def probe_media(video_path: str) -> Tuple[float, bool]:
+    """Retorna (duração em segundos, tem_áudio) via ffprobe."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration:stream=codec_type",
+        "-of", "json",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    info = json.loads(result.stdout)
+    duration = float(info.get("format", {}).get("duration") or 0.0)
+    has_audio = any(stream.get("codec_type") == "audio" for stream in info.get("streams", []))
+    return duration, has_audio
+
+
+# === 🧬 Assinatura dos streams (compatibilidade para concatenar sem reencode) ===
+def probe_stream_signature(video_path: str) -> Tuple[tuple, Optional[tuple]]:
+    """
+    Retorna ((codec, perfil, largura, altura, pix_fmt, time_base, fps), (codec, sample_rate, layout))
+    dos primeiros streams de vídeo e áudio; o áudio é None se não existir.
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries",
+        "stream=codec_type,codec_name,profile,width,height,pix_fmt,time_base,avg_frame_rate,"
+        "sample_rate,channels,channel_layout",
+        "-of", "json",
+        video_path,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    streams = json.loads(result.stdout).get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    video_signature = tuple(video.get(key) for key in
+                            ("codec_name", "profile", "width", "height", "pix_fmt", "time_base", "avg_frame_rate"))
+    audio_signature = None
+    if audio is not None:
+        audio_signature = (audio.get("codec_name"), audio.get("sample_rate"),
+                           audio.get("channel_layout") or audio.get("channels"))
+    return video_signature, audio_signature
+
+
+# === 📦 Exportações explícitas ===
+__all__ = [
+    "probe_video_stream",
+    "scaled_size",
+    "iter_gray_frames",
+    "iter_frame_batches",
+    "iter_frame_metadata",
+    "probe_audio_stream",
+    "iter_pcm_chunks",
+    "probe_keyframe_times",
+    "probe_decoded_keyframe_times",
+    "probe_media",
+    "probe_stream_signature",
+]
@@ -0,0 +1,158 @@
+# 📁 app/utils/smart_cut.py
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.ffmpeg_pipe import probe_keyframe_times, probe_stream_signature, probe_video_stream
+from app.utils.video_tools import FFMPEG_THREADS, x264_encode_args, x265_encode_args
+
+logger = logging.getLogger("smart_cut")
+
+# "smart" = frame a frame, reencodando só os GOPs parciais; "fast" = só cópia, início recuado ao keyframe
+SMART_CUT_MODE = os.getenv("SMART_CUT_MODE", "smart")
+
+Part = Tuple[str, float, float]
+
+# Codecs que dá para copiar e juntar com pontas reencodadas: filtro Annex B e encoder das pontas
+_JOINABLE_CODECS = {
+    "h264": ("h264_mp4toannexb", x264_encode_args),
+    "hevc": ("hevc_mp4toannexb", x265_encode_args),
+}
+
+
+# === 🧩 Plano de corte: cabeça reencodada + miolo copiado + cauda reencodada ===
+def plan_smart_cut(start: float, end: float, keyframes: np.ndarray, min_copy: float = 0.0) -> List[Part]:
+    """
+    Divide [start, end) em partes ("encode" | "copy", início, fim).
+
+    O miolo entre o primeiro keyframe >= start e o último keyframe <= end é
+    copiado; só as sobras nas pontas são reencodadas. Sem GOP completo no
+    trecho (ou miolo menor que `min_copy`), o trecho inteiro é reencodado.
+    """
+    inside = keyframes[(keyframes >= start) & (keyframes <= end)]
+    if len(inside) < 2 or inside[-1] - inside[0] <= min_copy:
+        return [("encode", start, end)]
+
+    head, tail = float(inside[0]), float(inside[-1])
+    parts = []
+    if head > start:
+        parts.append(("encode", start, head))
+    parts.append(("copy", head, tail))
+    if end > tail:
+        parts.append(("encode", tail, end))
+    return parts
+
+
+def snap_start(start: float, keyframes: np.ndarray) -> float:
+    """
+    Último keyframe <= `start` (modo rápido): o corte começa um pouco antes e nunca
+    perde conteúdo nem passa do fim. Sem keyframe antes de `start`, fica `start`.
+    """
+    before = keyframes[keyframes <= start + 1e-6]
+    return float(before[-1]) if len(before) else start
+
+
+def _run(cmd: list) -> None:
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"ffmpeg saiu com código {result.returncode}")
+
+
+# === 🎬 Renderização das partes (só vídeo, Annex B em Matroska para juntar sem perdas) ===
+def _render_part(video_path: str, part: Part, output_path: str, fps: float, threads: int,
+                 codec: str = "h264") -> None:
+    kind, start, end = part
+    bsf, encode_args = _JOINABLE_CODECS[codec]
+    # -ss antes do -i: seek direto no keyframe. Limite por contagem de frames, não por -t: na cópia
+    # os pacotes saem em ordem de decodificação e o -t deixaria passar B-frames do GOP seguinte
+    frames = max(1, round((end - start) * fps))
+    cmd = ["ffmpeg", "-y", "-v", "error", "-nostdin", "-ss", f"{start:.6f}", "-i", video_path,
+           "-frames:v", str(frames), "-map", "0:v:0", "-an", "-sn", "-dn"]
+    if kind == "copy":
+        cmd += ["-c:v", "copy"]
+    else:
+        cmd += encode_args(threads=threads)
+    # Annex B mantém os parâmetros (VPS/SPS/PPS) em banda: as partes reencodadas e copiadas decodificam juntas
+    _run(cmd + ["-bsf:v", bsf, "-f", "matroska", output_path])
+
+
+def _encode_range(video_path: str, start: float, end: float, output_path: str, threads: int) -> None:
+    """Trecho inteiro reencodado em H.264 num único ffmpeg (fontes que não dá para copiar e juntar)."""
+    _run([
+        "ffmpeg", "-y", "-v", "error", "-nostdin", "-accurate_seek", "-ss", f"{start:.6f}", "-i", video_path,
+        "-t", f"{end - start:.6f}", "-map", "0:v:0", "-map", "0:a?",
+        *x264_encode_args(threads=threads), "-c:a", "aac", "-movflags", "+faststart", output_path,
+    ])
+
+
+def smart_cut(video_path: str, start: float, end: float, output_path: str, mode: str = SMART_CUT_MODE,
+              keyframes: Optional[np.ndarray] = None, threads: int = FFMPEG_THREADS) -> str:
+    """
+    Corta [start, end) de `video_path` em `output_path` (MP4) mantendo o áudio.
+
+    - mode="fast": cópia pura a partir do último keyframe <= `start` (sem encode).
+    - mode="smart": frame a frame; reencoda só as pontas que não fecham GOP e copia o resto.
+      Fontes em codec sem filtro Annex B (nem H.264 nem HEVC) ou fora de yuv420p são
+      reencodadas inteiras em H.264.
+
+    `keyframes` pode vir pré-calculado quando vários cortes saem do mesmo vídeo;
+    `threads` limita as threads do ffmpeg quando vários cortes rodam em paralelo.
+    """
+    if end <= start:
+        raise ValueError(f"Intervalo de corte vazio: [{start:.3f}-{end:.3f}]")
+    keyframes = probe_keyframe_times(video_path) if keyframes is None else keyframes
+
+    if mode == "fast":
+        start = snap_start(start, keyframes)
+        _run([
+            "ffmpeg", "-y", "-v", "error", "-nostdin", "-ss", f"{start:.6f}", "-i", video_path,
+            "-t", f"{end - start:.6f}", "-map", "0:v:0", "-map", "0:a?", "-c", "copy",
+            "-avoid_negative_ts", "make_zero", "-movflags", "+faststart", output_path,
+        ])
+        return output_path
+
+    (codec, _, _, _, pix_fmt, _, _), _ = probe_stream_signature(video_path)
+    if codec not in _JOINABLE_CODECS or pix_fmt != "yuv420p":
+        logger.info(f"✂️ Corte [{start:.2f}-{end:.2f}]: {codec}/{pix_fmt} não junta por cópia, reencode completo")
+        _encode_range(video_path, start, end, output_path, threads)
+        return output_path
+
+    _, _, fps = probe_video_stream(video_path)
+    fps = fps or 25.0
+    parts = plan_smart_cut(start, end, keyframes, min_copy=1.0 / fps)
+    logger.info(f"✂️ Corte inteligente [{start:.2f}-{end:.2f}]: "
+                + ", ".join(f"{kind} {s:.2f}-{e:.2f}" for kind, s, e in parts))
+
+    work_dir = tempfile.mkdtemp(prefix="smart_cut_")
+    try:
+        list_path = os.path.join(work_dir, "parts.txt")
+        with open(list_path, "w") as f:
+            for i, part in enumerate(parts):
+                part_path = os.path.join(work_dir, f"part_{i}.mkv")
+                _render_part(video_path, part, part_path, fps, threads, codec)
+                f.write(f"file '{part_path}'\n")
+
+        # Vídeo juntado por cópia; áudio do trecho inteiro num único encode (sem emendas)
+        _run([
+            "ffmpeg", "-y", "-v", "error", "-nostdin",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+            "-ss", f"{start:.6f}", "-t", f"{end - start:.6f}", "-i", video_path,
+            "-map", "0:v:0", "-map", "1:a?", "-c:v", "copy", "-c:a", "aac", "-threads", str(threads),
+            "-movflags", "+faststart", output_path,
+        ])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return output_path
+
+
+# === 📦 Exportações explícitas ===
+__all__ = [
+    "plan_smart_cut",
+    "smart_cut",
+]
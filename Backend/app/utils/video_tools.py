@@ -6,12 +6,60 @@ import os
 import shutil
 import subprocess
 from fractions import Fraction
+from typing import Optional
 from uuid import uuid4
 
 from fastapi import HTTPException
 
 logger = logging.getLogger("video_tools")
 TMP_DIR = "/tmp/elgn_ai_temp"
+FFMPEG_PRESET = os.getenv("FFMPEG_PRESET", "veryfast")
+FFMPEG_CRF = int(os.getenv("FFMPEG_CRF", 23))
+# 0 = automático (um por núcleo); limite útil quando vários workers dividem a máquina
+FFMPEG_THREADS = int(os.getenv("FFMPEG_THREADS", 0))
+
+
+# === 🎛️ Parâmetros padrão de encode H.264 ===
+def x264_encode_args(preset: str = FFMPEG_PRESET, crf: int = FFMPEG_CRF, threads: int = FFMPEG_THREADS) -> list:
+    return ["-c:v", "libx264", "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p", "-threads", str(threads)]
+
+
+# === 🎛️ Parâmetros de encode H.265 (pontas do corte inteligente em fontes HEVC) ===
+def x265_encode_args(preset: str = FFMPEG_PRESET, crf: int = FFMPEG_CRF, threads: int = FFMPEG_THREADS) -> list:
+    return ["-c:v", "libx265", "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p", "-threads", str(threads),
+            "-x265-params", "log-level=error"]
+
+
+# === 🧩 Divisão em cenas numa única passada (segment muxer) ===
+def segment_command(input_path: str, output_dir: str, cuts: list, mode: str = "exact",
+                    end: Optional[float] = None) -> list:
+    """
+    Comando ffmpeg que grava `output_dir/scene_%03d.mp4` (um arquivo entre cortes
+    consecutivos) e a lista dos arquivos em `output_dir/scenes.txt`.
+
+    - mode="exact": reencoda forçando keyframes nos cortes (cada cena começa no frame exato).
+    - outro: cópia de stream; o muxer só corta em keyframe.
+
+    `end` limita a saída (s); sem ele a última cena vai até o fim do vídeo.
+    """
+    cmd = ["ffmpeg", "-y", "-v", "error", "-nostdin", "-i", input_path, "-map", "0:v:0", "-map", "0:a?"]
+    if end is not None:
+        cmd += ["-t", f"{end:.6f}"]
+    # ffmpeg corta no primeiro frame com pts >= tempo: recua meio milissegundo contra arredondamento
+    times = ",".join(f"{max(0.0, t - 0.0005):.4f}" for t in cuts)
+    if mode == "exact":
+        cmd += [*x264_encode_args(), "-c:a", "aac"]
+        if cuts:
+            cmd += ["-force_key_frames", times]
+    else:
+        cmd += ["-c", "copy"]
+    if cuts:
+        cmd += ["-segment_times", times]
+    return cmd + [
+        "-f", "segment", "-reset_timestamps", "1",
+        "-segment_list", os.path.join(output_dir, "scenes.txt"), "-segment_list_type", "flat",
+        os.path.join(output_dir, "scene_%03d.mp4"),
+    ]
 
 
 # === 🔍 Verifica se ffmpeg e ffprobe estão instalados ===
@@ -99,32 +147,19 @@ def generate_thumbnail(video_path: str, timestamp: float = 1.0) -> str:
 
 # === ✂️ Corta um trecho do vídeo ===
 def cut_video_segment(video_path: str, start: float, duration: float) -> str:
+    # Import local: smart_cut usa x264_encode_args deste módulo
+    from app.utils.smart_cut import smart_cut
+
     _check_dependencies()
     _check_file_exists(video_path)
 
     os.makedirs(f"{TMP_DIR}/cuts", exist_ok=True)
     output_path = f"{TMP_DIR}/cuts/clip_{uuid4()}.mp4"
 
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        video_path,
-        "-ss",
-        str(start),
-        "-t",
-        str(duration),
-        "-c:v",
-        "libx264",
-        "-c:a",
-        "aac",
-        output_path,
-    ]
-
     try:
-        subprocess.run(cmd, check=True)
-        return output_path
-    except subprocess.CalledProcessError as e:
+        # Seek no input + cópia do miolo alinhado a GOP; só as pontas são reencodadas
+        return smart_cut(video_path, start, start + duration, output_path)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
         logger.error(f"❌ Erro ao cortar vídeo: {e}")
         raise HTTPException(status_code=500, detail="Erro ao cortar o vídeo.")
 
@@ -214,4 +249,7 @@ __all__ = [
     "cut_video_segment",
     "compress_video",
     "get_video_metadata",
+    "x264_encode_args",
+    "x265_encode_args",
+    "segment_command",
 ]
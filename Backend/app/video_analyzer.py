@@ -1,16 +1,10 @@
-# 🚧 Arquivo temporário para evitar falha no Celery
-
-def analyze_motion(video_path: str):
-    pass
-
-def analyze_faces(video_path: str):
-    pass
-
-def analyze_objects(video_path: str):
-    pass
-
-def analyze_audio_peaks(video_path: str):
-    pass
-
-class VideoAnalysisConfig:
-    pass
+# 📁 backend/app/video_analyzer.py
+# Compatibilidade: as análises reais ficam em app/services/video_analyzer.py
+
+from app.services.video_analyzer import (
+    VideoAnalysisConfig,
+    analyze_audio_peaks,
+    analyze_faces,
+    analyze_motion,
+    analyze_objects,
+)
@@ -0,0 +1,55 @@
+# 📁 scripts/benchmark_parallel_analysis.py
+"""
+Benchmark: escalonamento da análise de frames fatiada por número de processos.
+
+Mede movimento + histograma no caminho serial e no ShardedFramePipeline com
+1, 2, 4... processos, e confere que o resultado é idêntico ao serial.
+
+Uso: python scripts/benchmark_parallel_analysis.py [--video longo.mp4] [--workers 1,2,4,8] [--analysis-height 240]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.frame_pipeline import HistogramAnalyzer, MotionAnalyzer, run_frame_pipeline
+from app.services.parallel_analysis import ShardedFramePipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def analyzers():
+    return [MotionAnalyzer(), HistogramAnalyzer()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", default=os.path.join(ROOT, "test_videos", "sample.mp4"))
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}")
+    parser.add_argument("--analysis-height", type=int, default=None)
+    parser.add_argument("--min-shard-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    serial = run_frame_pipeline(args.video, analyzers(), args.analysis_height)
+    serial_time = time.perf_counter() - t0
+    print(f"📊 {os.path.basename(args.video)} | altura de análise={args.analysis_height or 'original'}")
+    print(f"  serial        → {serial_time:7.2f}s")
+
+    for workers in sorted({int(w) for w in args.workers.split(",")}):
+        pipeline = ShardedFramePipeline(args.video, args.analysis_height, workers=workers,
+                                        min_shard_seconds=args.min_shard_seconds)
+        for analyzer in analyzers():
+            pipeline.register(analyzer)
+        t0 = time.perf_counter()
+        results = pipeline.run()
+        elapsed = time.perf_counter() - t0
+        match = "✅ igual" if results == serial else "❌ diverge"
+        print(f"  {workers:>2} processos → {elapsed:7.2f}s ({serial_time / elapsed:.2f}x) {match}")
+
+
+if __name__ == "__main__":
+    main()
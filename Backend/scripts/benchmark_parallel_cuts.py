@@ -0,0 +1,56 @@
+# 📁 scripts/benchmark_parallel_cuts.py
+"""
+Benchmark: tempo total de apply_multiple_cuts por número de cortes, serial vs paralelo.
+
+Uso: python scripts/benchmark_parallel_cuts.py [--video longo.mp4] [--segments 1,4,16,30] [--cut-seconds 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.editor import apply_multiple_cuts, cut_worker_budget
+from app.utils.ffmpeg_pipe import probe_media
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(video: str, cuts: list, workers: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        files = apply_multiple_cuts(video, cuts, tmp, workers=workers)
+        elapsed = time.perf_counter() - t0
+    if len(files) != len(cuts):
+        sys.exit("❌ Falha ao renderizar os cortes")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", default=os.path.join(ROOT, "test_videos", "sample.mp4"))
+    parser.add_argument("--segments", default="1,4,16,30")
+    parser.add_argument("--cut-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    duration, _ = probe_media(args.video)
+    print(f"📊 {os.path.basename(args.video)} | {duration:.1f}s | {os.cpu_count()} núcleos")
+    for count in (int(n) for n in args.segments.split(",")):
+        # Cortes espalhados pelo vídeo, começando fora dos keyframes para exercitar o reencode das pontas
+        step = max(duration - args.cut_seconds, 0) / max(count, 1)
+        cuts = [{"start": round(i * step + 0.37, 2), "end": round(i * step + 0.37 + args.cut_seconds, 2)}
+                for i in range(count)]
+        cuts = [cut for cut in cuts if cut["end"] <= duration]
+
+        workers, threads = cut_worker_budget(len(cuts))
+        serial = timed(args.video, cuts, workers=1)
+        parallel = timed(args.video, cuts, workers=workers)
+        print(f"  {len(cuts):>3} cortes → serial {serial:7.2f}s | {workers:>2}×{threads} threads {parallel:7.2f}s "
+              f"({serial / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
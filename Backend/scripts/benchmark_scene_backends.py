@@ -0,0 +1,91 @@
+# 📁 scripts/benchmark_scene_backends.py
+"""
+Benchmark: backends de detecção de cenas por vídeo.
+
+Compara o PySceneDetect (ContentDetector, referência) com os métodos do
+SceneEngine que deixam o escore com o ffmpeg (scdet e select) e com o content
+em NumPy. Para cada vídeo mede o tempo, os frames por segundo e quantos cortes
+batem com os da referência (tolerância --tolerance em segundos).
+
+Uso: python scripts/benchmark_scene_backends.py [--videos test_videos] [--video a.mp4 ...] [--height 144]
+Vídeos que o ffmpeg não decodifica são ignorados; sem nenhum vídeo, gera um
+vídeo sintético 1280x720 com --scenes cenas.
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scene_engine import SceneEngine
+from benchmark_scene_engine import make_video
+
+BACKENDS = ["scdet", "select", "content"]
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".avi", ".webm")
+
+
+def pyscenedetect_cuts(path: str) -> list:
+    from scenedetect import ContentDetector, detect
+    return [start.get_seconds() for start, _ in detect(path, ContentDetector())[1:]]
+
+
+def matched(cuts: list, reference: list, tolerance: float) -> int:
+    return sum(any(abs(c - r) <= tolerance for c in cuts) for r in reference)
+
+
+def benchmark(video: str, height: int, tolerance: float) -> None:
+    results = {}
+    for method in BACKENDS:
+        engine = SceneEngine(method, analysis_height=height)
+        results[method] = (engine.detect_cuts(video), engine.elapsed, engine.throughput)
+    frames = engine.frames_analyzed
+    if not frames:
+        print("  ⚠️ Nenhum frame decodificado, vídeo ignorado")
+        return
+
+    try:
+        t0 = time.perf_counter()
+        reference, label = pyscenedetect_cuts(video), "PySceneDetect"
+        ref_time = time.perf_counter() - t0
+        print(f"  {label:<14} {ref_time:7.2f}s {frames / ref_time:8.1f} frames/s | {len(reference)} cortes")
+    except ImportError:
+        print("  PySceneDetect não instalado: referência = engine content")
+        (reference, ref_time, _), label = results["content"], "content"
+
+    for method, (cuts, elapsed, throughput) in results.items():
+        print(f"  {method:<14} {elapsed:7.2f}s {throughput:8.1f} frames/s ({ref_time / elapsed:.1f}x) | "
+              f"{len(cuts)} cortes, {matched(cuts, reference, tolerance)}/{len(reference)} iguais ao {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--videos", default="test_videos", help="Diretório com os vídeos de teste")
+    parser.add_argument("--video", action="append", default=[])
+    parser.add_argument("--height", type=int, default=144)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--scenes", type=int, default=20)
+    parser.add_argument("--scene-seconds", type=float, default=1.5)
+    args = parser.parse_args()
+
+    videos = list(args.video)
+    if os.path.isdir(args.videos):
+        videos += sorted(p for p in glob.glob(os.path.join(args.videos, "*")) if p.lower().endswith(VIDEO_EXTENSIONS))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not videos:
+            video = os.path.join(tmp, "synthetic.mp4")
+            print(f"🎬 Nenhum vídeo em '{args.videos}': gerando {args.scenes} cenas de {args.scene_seconds}s (1280x720)")
+            make_video(video, args.scenes, args.scene_seconds)
+            videos = [video]
+
+        for video in videos:
+            print(f"📊 {os.path.basename(video)} ({args.height}p)")
+            benchmark(video, args.height, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
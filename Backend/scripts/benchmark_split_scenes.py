@@ -0,0 +1,80 @@
+# 📁 scripts/benchmark_split_scenes.py
+"""
+Benchmark: divisão de um vídeo em N cenas (scene_detector.split_scenes).
+
+Compara a implementação antiga (um ffmpeg por cena, em sequência, com -ss depois
+do -i: cada cena decodifica o vídeo desde o início) com os modos "parallel"
+(seek no input + pool de processos) e "segment" (um único ffmpeg).
+
+Uso: python scripts/benchmark_split_scenes.py [--scenes 100] [--scene-seconds 1] [--size 640x360] [--skip-legacy]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scene_detector import split_scenes
+
+
+def make_video(path: str, duration: float, size: str) -> None:
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=s={size}:r=25:d={duration}",
+        "-f", "lavfi", "-i", f"sine=d={duration}",
+        "-c:v", "libx264", "-preset", "veryfast", "-g", "50", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest", path,
+    ], check=True)
+
+
+def legacy_split(video_path: str, scene_times: list, output_dir: str) -> list:
+    """Implementação original: -ss depois do -i, uma cena por vez."""
+    outputs = []
+    for idx, (start, end) in enumerate(scene_times):
+        output_path = os.path.join(output_dir, f"legacy_{idx+1}.mp4")
+        subprocess.run([
+            "ffmpeg", "-y", "-i", video_path, "-ss", str(start), "-t", str(end - start),
+            "-c:v", "libx264", "-preset", "fast", "-crf", "23",
+            "-c:a", "aac", "-ac", "2", "-b:a", "128k", output_path,
+        ], check=True, capture_output=True)
+        outputs.append(output_path)
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenes", type=int, default=100)
+    parser.add_argument("--scene-seconds", type=float, default=1.0)
+    parser.add_argument("--size", default="640x360")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    scene_times = [(i * args.scene_seconds, (i + 1) * args.scene_seconds) for i in range(args.scenes)]
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "synthetic.mp4")
+        make_video(video, args.scenes * args.scene_seconds, args.size)
+        print(f"📊 {args.scenes} cenas de {args.scene_seconds}s | {args.size} | {os.cpu_count()} núcleos")
+
+        runs = [("parallel", lambda out: split_scenes(video, scene_times, out, "parallel", args.workers)),
+                ("segment", lambda out: split_scenes(video, scene_times, out, "segment"))]
+        if not args.skip_legacy:
+            runs.insert(0, ("legado", lambda out: legacy_split(video, scene_times, out)))
+
+        baseline = None
+        for name, run in runs:
+            output_dir = os.path.join(tmp, name)
+            os.makedirs(output_dir)
+            t0 = time.perf_counter()
+            outputs = run(output_dir)
+            elapsed = time.perf_counter() - t0
+            baseline = baseline or elapsed
+            print(f"  {name:<9} {elapsed:8.2f}s | {len(outputs)} arquivos | {baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
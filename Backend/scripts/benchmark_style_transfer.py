@@ -0,0 +1,46 @@
+# 📁 scripts/benchmark_style_transfer.py
+"""
+Benchmark: throughput (frames/s) do style transfer por tamanho de lote e altura de processamento.
+
+Uso: python scripts/benchmark_style_transfer.py --model estilo.pt [--video test_videos/sample.mp4]
+     [--batch-sizes 1,4,8] [--heights 0,360]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.style_transfer import StyleTransferRuntime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", default=os.path.join(ROOT, "test_videos", "sample.mp4"))
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--batch-sizes", default="1,4,8")
+    parser.add_argument("--heights", default="0,360", help="0 = resolução original")
+    args = parser.parse_args()
+
+    print(f"📊 {os.path.basename(args.video)} | modelo={os.path.basename(args.model)}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "styled.mp4")
+        for height in (int(h) for h in args.heights.split(",")):
+            for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+                runtime = StyleTransferRuntime(args.model, batch_size=batch_size, processing_height=height)
+                t0 = time.perf_counter()
+                frames = runtime.run(args.video, output)
+                fps = frames / (time.perf_counter() - t0)
+                baseline = baseline or fps
+                print(f"  altura={height or 'original':>8} lote={batch_size:>2} → {fps:7.1f} frames/s "
+                      f"({fps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# 📁 scripts/benchmark_yolo_batching.py
+"""
+Benchmark: throughput (frames/s) da inferência YOLO por tamanho de lote.
+
+Uso: python scripts/benchmark_yolo_batching.py [--video test_videos/sample.mp4] [--frames 64]
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+from ultralytics import YOLO
+
+# Adiciona o caminho raiz do projeto para importar corretamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.object_detection import iter_ultralytics_detections
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_frames(video_path: str, count: int) -> list:
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            if not frames:
+                break
+            continue
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", default=os.path.join(ROOT, "test_videos", "sample.mp4"))
+    parser.add_argument("--model", default="yolov8n.pt")
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        sys.exit(f"❌ Não foi possível ler frames de {args.video}")
+
+    model = YOLO(args.model)
+    model(frames[:1], verbose=False)  # aquecimento
+
+    print(f"📊 {len(frames)} frames de {os.path.basename(args.video)} | modelo={args.model}")
+    baseline = None
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        samples = ((i, frame) for i, frame in enumerate(frames))
+        t0 = time.perf_counter()
+        for _ in iter_ultralytics_detections(model, samples, batch_size):
+            pass
+        fps = len(frames) / (time.perf_counter() - t0)
+        baseline = baseline or fps
+        print(f"  lote={batch_size:>3} → {fps:7.1f} frames/s ({fps / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,33 @@
+import asyncio
+import io
+
 import pytest
+from fastapi import HTTPException, UploadFile
 
 # 🔧 Testes para editor.py
 
 def test_placeholder():
     assert True
+
+
+def test_every_upload_is_kept_and_queues_a_proxy(tmp_path, monkeypatch):
+    import app.api.editor as editor
+
+    queued = []
+
+    class FakeTask:
+        id = "proxy-task"
+
+    monkeypatch.setattr(editor.settings, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    monkeypatch.setattr(editor.generate_proxy_task, "delay", lambda path: queued.append(path) or FakeTask())
+
+    upload = UploadFile(file=io.BytesIO(b"video"), filename="clip.MP4")
+    video_path, task_id = asyncio.run(editor.store_upload(upload))
+
+    assert task_id == "proxy-task" and queued == [video_path]
+    assert video_path.startswith(str(tmp_path / "uploads")) and video_path.endswith(".mp4")
+    assert open(video_path, "rb").read() == b"video"
+
+    with pytest.raises(HTTPException):
+        asyncio.run(editor.store_upload(UploadFile(file=io.BytesIO(b"x"), filename="notes.txt")))
+    assert len(queued) == 1
@@ -2,9 +2,48 @@
 Teste de importação do módulo: tasks
 """
 
+import os
+import shutil
+import subprocess
+
+import pytest
+
+
 def test_import_tasks():
     try:
         import app.tasks as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar tasks: {e}"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_generate_video_highlights_task_scores_motion_peaks(tmp_path):
+    from app.tasks import generate_video_highlights_task
+
+    # Trechos parados intercalados com trechos em movimento: picos de movimento em ~3s e ~8s
+    video = str(tmp_path / "source.mp4")
+    sources = ["color=c=gray:", "testsrc2=", "color=c=gray:", "testsrc2=", "color=c=gray:"]
+    durations = [3, 1, 4, 1, 3]
+    cmd = ["ffmpeg", "-v", "error", "-y"]
+    for source, seconds in zip(sources, durations):
+        cmd += ["-f", "lavfi", "-i", f"{source}s=320x240:r=25:d={seconds}"]
+    cmd += ["-f", "lavfi", "-i", "sine=d=12"]
+    graph = "".join(f"[{i}:v]" for i in range(len(sources))) + f"concat=n={len(sources)}:v=1:a=0[v]"
+    subprocess.run(cmd + ["-filter_complex", graph, "-map", "[v]", "-map", f"{len(sources)}:a",
+                          "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", video], check=True)
+
+    output = str(tmp_path / "highlights.mp4")
+    result = generate_video_highlights_task(video, highlight_duration=10, output_path=output)
+
+    assert "error" not in result, result.get("error")
+    segments = result["segments"]
+    assert segments and os.path.exists(output)
+    assert sum(s["end"] - s["start"] for s in segments) <= 10
+    assert [s["score"] for s in segments] == sorted((s["score"] for s in segments), reverse=True)
+    for segment in segments:
+        assert 0 <= segment["start"] < segment["end"] <= 12.05
+        assert segment["score"] >= 0.5
+        # cada destaque cobre um dos trechos em movimento
+        assert any(segment["start"] <= t <= segment["end"] for t in (3.5, 8.5))
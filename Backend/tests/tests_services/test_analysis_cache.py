@@ -0,0 +1,203 @@
+"""
+Teste de importação e estrutura para o serviço: analysis_cache
+"""
+
+import os
+
+import numpy as np
+
+
+def test_import_analysis_cache():
+    try:
+        import app.services.analysis_cache as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar analysis_cache: {e}"
+
+
+def _video(tmp_path, content=b"conteudo"):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_roundtrip_arrays_and_json(tmp_path):
+    from app.services.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=None)
+    video = _video(tmp_path)
+
+    cache.put(video, "motion", {"k": 21}, np.arange(5))
+    cache.put(video, "levels", {}, {"times": np.arange(3.0), "peak_db": np.array([-30.0, -10.0, -np.inf])})
+    cache.put(video, "faces", {"sample_rate": 5}, [1.0, 2.5])
+
+    assert cache.get(video, "motion", {"k": 21}).tolist() == [0, 1, 2, 3, 4]
+    assert cache.get(video, "motion", {"k": 11}) is None
+    levels = cache.get(video, "levels", {})
+    assert levels["times"][levels["peak_db"] > -20].tolist() == [1.0]
+    assert cache.get(video, "faces", {"sample_rate": 5}) == [1.0, 2.5]
+
+
+def test_key_follows_content_not_path(tmp_path):
+    from app.services.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=None)
+    first = _video(tmp_path, b"mesmo")
+    copy = tmp_path / "copia.mp4"
+    copy.write_bytes(b"mesmo")
+
+    cache.put(first, "faces", {}, [3.0])
+    assert cache.get(str(copy), "faces", {}) == [3.0]
+
+
+def test_evicts_oldest_entries_over_budget(tmp_path):
+    import os
+    from app.services.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"), max_mb=1, redis=None)
+    video = _video(tmp_path)
+    for i in range(3):
+        cache.put(video, f"sinal{i}", {}, np.zeros(60_000))  # ~480 KB cada
+        os.utime(cache._existing_path(cache.entry_key(video, f"sinal{i}", {})), (i, i))
+
+    cache.put(video, "sinal3", {}, np.zeros(60_000))
+    assert cache.get(video, "sinal0", {}) is None
+    assert cache.get(video, "sinal3", {}) is not None
+
+
+def test_frame_pipeline_skips_decoding_on_hit(tmp_path):
+    import cv2
+    from app.services.analysis_cache import AnalysisCache
+    from app.services.frame_pipeline import MotionAnalyzer, run_frame_pipeline
+
+    video = str(tmp_path / "clip.mp4")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"mp4v"), 10, (64, 48))
+    for i in range(10):
+        writer.write(np.full((48, 64, 3), (i % 2) * 255, dtype=np.uint8))
+    writer.release()
+
+    class CountingMotion(MotionAnalyzer):
+        calls = 0
+
+        def process(self, frame):
+            CountingMotion.calls += 1
+            super().process(frame)
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=None)
+    first = run_frame_pipeline(video, [CountingMotion()], cache=cache)["motion"]
+    decoded = CountingMotion.calls
+    second = run_frame_pipeline(video, [CountingMotion()], cache=cache)["motion"]
+
+    assert decoded > 0 and CountingMotion.calls == decoded
+    assert second == [int(v) for v in first]
+
+
+class _FakeRedis:
+    """Só os comandos do índice LRU (zadd/zrange/zrem, hset/hmget/hdel, expire)."""
+
+    def __init__(self):
+        self.zsets, self.hashes, self.ttls = {}, {}, {}
+
+    def expire(self, name, seconds):
+        self.ttls[name] = seconds
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update(mapping)
+
+    def zrange(self, name, start, end):
+        return sorted(self.zsets.get(name, {}), key=self.zsets.get(name, {}).get)
+
+    def zrem(self, name, *keys):
+        for key in keys:
+            self.zsets.get(name, {}).pop(key, None)
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key] = value
+
+    def hmget(self, name, keys):
+        return [self.hashes.get(name, {}).get(key) for key in keys]
+
+    def hdel(self, name, *keys):
+        for key in keys:
+            self.hashes.get(name, {}).pop(key, None)
+
+
+def test_shared_redis_keeps_instances_apart(tmp_path):
+    from app.services.analysis_cache import AnalysisCache
+
+    redis = _FakeRedis()
+    video = _video(tmp_path)
+    backend = AnalysisCache(cache_dir=str(tmp_path / "backend"), max_mb=1, redis=redis)
+    worker = AnalysisCache(cache_dir=str(tmp_path / "worker"), max_mb=1, redis=redis)
+
+    worker.put(video, "sinal", {}, np.zeros(60_000))
+    for i in range(3):
+        backend.put(video, f"sinal{i}", {}, np.zeros(60_000))  # ~480 KB cada
+
+    # O backend só conta e remove as próprias entradas
+    assert worker.get(video, "sinal", {}) is not None
+    assert [key for key, _ in worker._entries_by_age()] == [worker.entry_key(video, "sinal", {})]
+    assert backend.get(video, "sinal0", {}) is None
+    assert backend.get(video, "sinal2", {}) is not None
+    assert backend.lru_key != worker.lru_key
+
+    # Entradas cujo arquivo sumiu saem do índice e não pesam no limite
+    os.remove(backend._existing_path(backend.entry_key(video, "sinal2", {})))
+    assert [key for key, _ in backend._entries_by_age()] == [backend.entry_key(video, "sinal1", {})]
+
+
+def test_index_survives_new_hostname_and_expires(tmp_path, monkeypatch):
+    import socket
+    from app.services.analysis_cache import AnalysisCache
+
+    redis = _FakeRedis()
+    video = _video(tmp_path)
+    first = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=redis, index_ttl=3600)
+    first.put(video, "faces", {}, [1.0])
+
+    # Container recriado: outro hostname, mesmo volume e mesmo índice
+    monkeypatch.setattr(socket, "gethostname", lambda: "container-novo")
+    second = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=redis, index_ttl=3600)
+    assert second.lru_key == first.lru_key
+    assert [key for key, _ in second._entries_by_age()] == [second.entry_key(video, "faces", {})]
+    assert redis.ttls == {first.lru_key: 3600, first.size_key: 3600}
+
+    named = AnalysisCache(cache_dir=str(tmp_path / "cache"), redis=redis, namespace="celery")
+    assert named.lru_key.endswith(":celery")
+
+
+def test_eviction_sweeps_only_past_threshold(tmp_path):
+    from app.services.analysis_cache import AnalysisCache
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"), max_mb=1, redis=None, evict_fraction=0.1)
+    sweeps = []
+    cache.evict_to_budget = lambda: sweeps.append(1) or 0
+    video = _video(tmp_path)
+
+    for i in range(10):
+        cache.put(video, f"pequeno{i}", {}, np.zeros(1000))  # ~8 KB cada
+    assert sweeps == []
+
+    cache.put(video, "grande", {}, np.zeros(20_000))  # ~160 KB, passa de 10% do limite
+    assert sweeps == [1]
+
+
+def test_hash_memo_is_bounded(tmp_path, monkeypatch):
+    import app.services.analysis_cache as module
+
+    monkeypatch.setattr(module, "HASH_MEMO_SIZE", 3)
+    monkeypatch.setattr(module, "_hash_memo", module.OrderedDict())
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"video{i}.mp4"
+        path.write_bytes(b"conteudo %d" % i)
+        paths.append(str(path))
+        module.content_hash(str(path))
+
+    assert [key[0] for key in module._hash_memo] == [os.path.abspath(p) for p in paths[2:]]
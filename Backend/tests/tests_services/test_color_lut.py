@@ -0,0 +1,41 @@
+"""
+Teste de importação e estrutura para o serviço: color_lut
+"""
+
+import numpy as np
+import pytest
+
+
+def test_import_color_lut():
+    try:
+        import app.services.color_lut as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar color_lut: {e}"
+
+
+@pytest.mark.parametrize("name", ["sepia", "vintage", "grayscale", "bw", "color_boost"])
+def test_tables_match_look_math(name):
+    from app.services.color_lut import get_color_lut
+
+    lut = get_color_lut(name)
+    frame = np.random.default_rng(0).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    expected = lut.look.evaluate(frame[..., ::-1] / 255.0)[..., ::-1] * 255
+
+    # caminho inteiro (uint8) arredonda entre a matriz e a curva: no máximo ~2 níveis
+    assert np.abs(lut.apply(frame).astype(float) - expected).max() <= 2.5
+    assert np.array_equal(lut.apply(frame[..., ::-1].copy(), channel_order="rgb"), lut.apply(frame)[..., ::-1])
+
+
+def test_cube_export(tmp_path):
+    from app.services.color_lut import get_color_lut
+
+    path = get_color_lut("bw").write_cube(str(tmp_path / "bw.cube"), size=5)
+    lines = open(path).read().splitlines()
+
+    assert "LUT_3D_SIZE 5" in lines
+    rows = np.loadtxt(lines[4:])
+    assert rows.shape == (125, 3)
+    # R varia mais rápido: segunda linha é (R=0.25, G=0, B=0), preto e branco nos extremos
+    assert np.allclose(rows[0], 0) and np.allclose(rows[-1], 1)
+    assert np.allclose(rows[1], np.clip((0.299 * 0.25 - 0.5) * 1.25 + 0.5, 0, 1), atol=1e-6)
@@ -2,9 +2,69 @@
 Teste de importação e estrutura para o serviço: editor
 """
 
+import shutil
+import subprocess
+
+import pytest
+
+
 def test_import_editor():
     try:
         import app.services.editor as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar editor: {e}"
+
+
+def _make_clip(path, size="320x240", rate=25, audio=True):
+    cmd = ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", f"testsrc2=d=1:s={size}:r={rate}"]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", "sine=d=1", "-c:a", "aac", "-shortest"]
+    subprocess.run(cmd + ["-c:v", "libx264", "-pix_fmt", "yuv420p", str(path)], check=True)
+    return str(path)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_concatenate_compatible_and_mixed_clips(tmp_path):
+    from app.services.editor import concatenate_video_segments
+    from app.utils.ffmpeg_pipe import probe_media, probe_video_stream
+
+    same = [_make_clip(tmp_path / f"same_{i}.mp4") for i in range(3)]
+    output = concatenate_video_segments(same, str(tmp_path / "same.mp4"))
+    duration, has_audio = probe_media(output)
+    assert has_audio and abs(duration - 3.0) < 0.2
+
+    mixed = [same[0], _make_clip(tmp_path / "other.mp4", size="640x360", rate=30, audio=False)]
+    output = concatenate_video_segments(mixed, str(tmp_path / "mixed.mp4"))
+    duration, has_audio = probe_media(output)
+    assert has_audio and abs(duration - 2.0) < 0.2
+    assert probe_video_stream(output)[:2] == (320, 240)
+
+
+def test_cut_worker_budget_respects_cores(monkeypatch):
+    from app.services import editor
+
+    monkeypatch.setattr(editor.os, "cpu_count", lambda: 16)
+    assert editor.cut_worker_budget(30) == (16, 1)
+    assert editor.cut_worker_budget(4) == (4, 4)
+    assert editor.cut_worker_budget(30, workers=3) == (3, 5)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_multiple_cuts_keep_order(tmp_path):
+    from app.services.editor import apply_multiple_cuts
+    from app.utils.ffmpeg_pipe import probe_media
+
+    source = str(tmp_path / "source.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=6:s=320x240:r=25",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", source,
+    ], check=True)
+    cuts = [{"start": 4.0, "end": 5.5}, {"start": 0.3, "end": 0.8}, {"start": 9, "end": 10}, {"start": 1.0, "end": 3.0}]
+
+    files = apply_multiple_cuts(source, cuts, str(tmp_path / "cuts"), workers=3)
+
+    assert [f.rsplit("/", 1)[-1] for f in files] == ["cut_1.mp4", "cut_2.mp4", "cut_4.mp4"]
+    assert [round(probe_media(f)[0], 1) for f in files] == [1.5, 0.5, 2.0]
@@ -0,0 +1,104 @@
+"""
+Teste de importação e estrutura para o serviço: edl
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+
+def test_import_edl():
+    try:
+        import app.services.edl as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar edl: {e}"
+
+
+PROBES = {
+    "a.mp4": {"width": 1280, "height": 720, "fps": 30.0, "duration": 20.0, "has_audio": True},
+    "b.mp4": {"width": 640, "height": 480, "fps": 25.0, "duration": 8.0, "has_audio": False},
+}
+
+
+def test_build_command_single_graph():
+    from app.services.edl import EditDecisionList
+
+    edl = EditDecisionList.from_dict({
+        "clips": [
+            {"source": "a.mp4", "start": 2, "end": 5, "filters": ["gray"], "fade_in": 0.5},
+            {"source": "b.mp4", "start": 0, "end": 4, "fade_out": 1},
+        ],
+        "height": 360,
+    })
+    cmd = edl.build_command("out.mp4", PROBES)
+    graph = cmd[cmd.index("-filter_complex") + 1]
+
+    assert cmd.count("-i") == 2 and cmd.count("-filter_complex") == 1
+    assert cmd[cmd.index("-ss"):cmd.index("-ss") + 4] == ["-ss", "2.000", "-t", "3.000"]
+    assert "format=gray" in graph and "scale=640:360" in graph
+    assert "anullsrc" in graph  # fonte sem áudio ganha silêncio
+    assert "concat=n=2:v=1:a=1" in graph
+    assert edl.duration == 7
+
+
+def test_estimate_rejects_invalid_ranges():
+    from app.services.edl import EditDecisionList
+
+    edl = EditDecisionList.from_dict({"clips": [
+        {"source": "a.mp4", "start": 0, "end": 10},
+        {"source": "b.mp4", "start": 5, "end": 12},
+        {"source": "missing.mp4", "start": 0, "end": 1},
+    ]})
+    cost = edl.estimate_cost(PROBES)
+    assert not cost.ok and len(cost.errors) == 2
+
+    edl.clips = edl.clips[:1]
+    cost = edl.estimate_cost(PROBES)
+    assert cost.ok and cost.output_size == (1280, 720) and cost.estimated_seconds > 0
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_render_timeline_with_voiceover(tmp_path):
+    from app.services.edl import EditDecisionList
+    from app.utils.ffmpeg_pipe import probe_media
+
+    source = str(tmp_path / "src.mp4")
+    voice = str(tmp_path / "voice.m4a")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=4:s=320x240:r=25",
+                    "-f", "lavfi", "-i", "sine=d=4", "-c:v", "libx264", "-c:a", "aac", "-shortest", source],
+                   check=True)
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "sine=f=880:d=1", voice], check=True)
+
+    edl = EditDecisionList.from_dict({
+        "clips": [
+            {"source": source, "start": 0, "end": 1.5, "filters": ["sepia"]},
+            {"source": source, "start": 3, "end": 4, "fade_in": 0.2},
+        ],
+        "voiceover": {"path": voice, "start": 0.5, "volume": 0.8},
+    })
+    output = edl.render(str(tmp_path / "timeline.mp4"))
+    duration, has_audio = probe_media(output)
+    assert has_audio and abs(duration - 2.5) < 0.15
+
+
+def test_from_dict_rejects_filtergraph_injection_and_bad_numbers():
+    from app.services.edl import EditDecisionList
+
+    clip = {"source": "a.mp4", "start": "2", "end": 5}
+    edl = EditDecisionList.from_dict({"clips": [clip], "overlays": [{"path": "logo.png", "x": 10, "y": "H-h-20"}]})
+    assert edl.clips[0].start == 2.0 and edl.overlays[0].x == "10"
+
+    invalid = [
+        {"clips": [clip], "overlays": [{"path": "logo.png", "x": "0;movie=/etc/passwd"}]},
+        {"clips": [clip], "overlays": [{"path": "logo.png", "y": "20[out]"}]},
+        {"clips": [clip], "voiceover": {"path": "voice.m4a", "volume": "1,volume=8"}},
+        {"clips": [{"source": "a.mp4", "start": "abc", "end": 5}]},
+        {"clips": [{"source": "a.mp4", "start": 0, "end": float("inf")}]},
+        {"clips": [{"source": "a.mp4", "start": 0, "end": 5, "fade_in": float("nan")}]},
+    ]
+    for data in invalid:
+        with pytest.raises(ValueError):
+            EditDecisionList.from_dict(data)
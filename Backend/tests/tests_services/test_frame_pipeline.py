@@ -0,0 +1,126 @@
+"""
+Teste de importação e estrutura para o serviço: frame_pipeline
+"""
+
+import shutil
+
+import pytest
+
+
+def test_import_frame_pipeline():
+    try:
+        import app.services.frame_pipeline as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar frame_pipeline: {e}"
+
+
+def test_register_rejects_duplicate_analyzer():
+    from app.services.frame_pipeline import FramePipeline, MotionAnalyzer
+
+    pipeline = FramePipeline("inexistente.mp4").register(MotionAnalyzer())
+    with pytest.raises(ValueError):
+        pipeline.register(MotionAnalyzer())
+
+
+def test_missing_file_returns_empty_results():
+    from app.services.frame_pipeline import HistogramAnalyzer, MotionAnalyzer, run_frame_pipeline
+
+    results = run_frame_pipeline("inexistente.mp4", [MotionAnalyzer(), HistogramAnalyzer()])
+    assert results == {"motion": [], "histogram": []}
+
+
+def _write_moving_square(path, frames=40, size=(640, 480)):
+    import cv2
+    import numpy as np
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 25, size)
+    x = 20
+    for i in range(frames):
+        image = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        x += (i % 5) * 6
+        cv2.rectangle(image, (x % (size[0] - 120), 180), (x % (size[0] - 120) + 100, 300), (255, 255, 255), -1)
+        writer.write(image)
+    writer.release()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+@pytest.mark.parametrize("options", [{}, {"dilate_iterations": 2, "score": "mean"}])
+def test_low_resolution_motion_matches_full_resolution(tmp_path, options):
+    import numpy as np
+    from app.services.frame_pipeline import MotionAnalyzer, run_frame_pipeline
+
+    video_path = tmp_path / "moving_square.mp4"
+    _write_moving_square(video_path)
+
+    full = np.array(run_frame_pipeline(str(video_path), [MotionAnalyzer(**options)])["motion"], dtype=float)
+    low = np.array(run_frame_pipeline(str(video_path), [MotionAnalyzer(**options)], analysis_height=240)["motion"],
+                   dtype=float)
+
+    assert len(full) == len(low) > 0
+    assert np.corrcoef(full, low)[0, 1] > 0.99
+    assert abs(low.sum() - full.sum()) / full.sum() < 0.08
+    assert np.max(np.abs(low - full)) / full.max() < 0.08
+
+
+def _write_frames(path, frames, fps=25):
+    import cv2
+
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for image in frames:
+        writer.write(image)
+    writer.release()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+def test_low_resolution_histogram_cuts_match_full_resolution(tmp_path):
+    import numpy as np
+    from app.services.frame_pipeline import HistogramAnalyzer, run_frame_pipeline
+
+    # Três cenas de textura com brilhos diferentes, 10 frames cada
+    rng = np.random.default_rng(0)
+    scenes = [rng.integers(low, low + 60, size=(720, 1280, 3), dtype=np.uint8) for low in (10, 120, 190)]
+    video_path = tmp_path / "scenes.mp4"
+    _write_frames(video_path, [scene for scene in scenes for _ in range(10)])
+
+    full = run_frame_pipeline(str(video_path), [HistogramAnalyzer()])["histogram"]
+    low = run_frame_pipeline(str(video_path), [HistogramAnalyzer()], analysis_height=240)["histogram"]
+
+    assert full == pytest.approx([0.4, 0.8])
+    assert low == full
+
+
+def _draw_face(image, cx, cy, size):
+    import cv2
+
+    cv2.ellipse(image, (cx, cy), (int(size * 0.8), size), 0, 0, 360, (190, 200, 220), -1)
+    for side in (-1, 1):
+        ex, ey = cx + int(side * size * 0.35), cy - int(size * 0.2)
+        cv2.ellipse(image, (ex, ey - int(size * 0.18)), (int(size * 0.2), int(size * 0.05)), 0, 0, 360, (40, 40, 40), -1)
+        cv2.ellipse(image, (ex, ey), (int(size * 0.16), int(size * 0.08)), 0, 0, 360, (30, 30, 30), -1)
+    cv2.ellipse(image, (cx, cy + int(size * 0.15)), (int(size * 0.06), int(size * 0.12)), 0, 0, 360, (150, 160, 180), -1)
+    cv2.ellipse(image, (cx, cy + int(size * 0.5)), (int(size * 0.3), int(size * 0.08)), 0, 0, 360, (60, 50, 120), -1)
+    return cv2.GaussianBlur(image, (7, 7), 0)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+def test_low_resolution_faces_match_full_resolution(tmp_path):
+    import numpy as np
+    from app.services.frame_pipeline import FaceAnalyzer, run_frame_pipeline
+
+    analyzer = FaceAnalyzer(sample_rate=5)
+    if analyzer.cascade.empty():
+        pytest.skip("Haar Cascade indisponível")
+
+    # Rosto desenhado nos 20 primeiros frames; os 20 seguintes só têm fundo
+    face = _draw_face(np.full((720, 1280, 3), 90, dtype=np.uint8), 640, 360, 150)
+    blank = np.full((720, 1280, 3), 90, dtype=np.uint8)
+    video_path = tmp_path / "face.mp4"
+    _write_frames(video_path, [face] * 20 + [blank] * 20)
+
+    full = run_frame_pipeline(str(video_path), [FaceAnalyzer(sample_rate=5)])["faces"]
+    low = run_frame_pipeline(str(video_path), [FaceAnalyzer(sample_rate=5)], analysis_height=240)["faces"]
+
+    assert full == pytest.approx([0.0, 0.2, 0.4, 0.6])
+    assert low == full
@@ -0,0 +1,119 @@
+"""
+Teste de importação e estrutura para o serviço: frame_sampler
+"""
+
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+
+def test_import_frame_sampler():
+    try:
+        import app.services.frame_sampler as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar frame_sampler: {e}"
+
+
+def test_requires_interval_or_timestamps():
+    from app.services.frame_sampler import iter_sampled_frames
+
+    with pytest.raises(ValueError):
+        next(iter_sampled_frames("inexistente.mp4"))
+
+
+def test_choose_sampling_mode_by_gop_spacing():
+    from app.services.frame_sampler import choose_sampling_mode
+
+    keyframes = np.arange(0, 60, 2.0)  # GOP de 2 s
+    assert choose_sampling_mode(np.arange(0, 1500, 25), 25.0, keyframes) == "grab"      # 1 amostra/s
+    assert choose_sampling_mode(np.arange(0, 1500, 250), 25.0, keyframes) == "keyframe"  # 1 amostra/10 s
+    assert choose_sampling_mode(np.arange(0, 1500, 250), 25.0, np.empty(0)) == "grab"
+
+
+def test_grab_mode_matches_seek_sampling(tmp_path):
+    import cv2
+    from app.services.frame_sampler import iter_sampled_frames
+
+    video_path = str(tmp_path / "counter.mp4")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"mp4v"), 10, (64, 48))
+    for i in range(30):
+        writer.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+    writer.release()
+
+    samples = list(iter_sampled_frames(video_path, interval_sec=1, mode="grab"))
+    assert [t for t, _ in samples] == [0.0, 1.0, 2.0]
+    means = [frame.mean() for _, frame in samples]
+    assert means == sorted(means) and means[-1] - means[0] > 100
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_keyframe_mode_decodes_keyframes_in_one_pass(tmp_path, monkeypatch):
+    import cv2
+    from app.services.frame_sampler import iter_sampled_frames
+
+    video_path = str(tmp_path / "gop.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=10:s=160x120:r=10",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", "10", "-keyint_min", "10",
+                    "-sc_threshold", "0", video_path], check=True)
+
+    real_capture = cv2.VideoCapture
+
+    class NoSeekCapture:
+        def __init__(self, path):
+            self._cap = real_capture(path)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+        def set(self, prop, value):
+            assert prop != cv2.CAP_PROP_POS_FRAMES, "seek por amostra"
+            return self._cap.set(prop, value)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(cv2, "VideoCapture", NoSeekCapture)
+        samples = list(iter_sampled_frames(video_path, timestamps=[0.2, 3.9, 7.1], mode="keyframe"))
+    assert [t for t, _ in samples] == [0.0, 4.0, 7.0]
+
+    cap = cv2.VideoCapture(video_path)
+    for timestamp, frame in samples:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(timestamp * 10))
+        _, expected = cap.read()
+        assert cv2.PSNR(frame, expected) > 40
+    cap.release()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_modes_agree_on_timestamps_with_start_offset(tmp_path):
+    from app.services.frame_sampler import iter_sampled_frames
+
+    # Container começando em 1.5 s: os dois modos contam a partir do início do vídeo
+    video_path = str(tmp_path / "offset.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=9:s=160x120:r=10",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", "10", "-keyint_min", "10",
+                    "-sc_threshold", "0", "-output_ts_offset", "1.5", video_path], check=True)
+
+    grab = [t for t, _ in iter_sampled_frames(video_path, interval_sec=3, mode="grab")]
+    keyframe = [t for t, _ in iter_sampled_frames(video_path, interval_sec=3, mode="keyframe")]
+    assert grab == pytest.approx([0.0, 3.0, 6.0])
+    assert keyframe == pytest.approx(grab)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_keyframe_mode_falls_back_when_decoded_keyframes_differ(tmp_path, monkeypatch):
+    import app.services.frame_sampler as module
+
+    video_path = str(tmp_path / "gop.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=6:s=160x120:r=10",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", "10", "-keyint_min", "10",
+                    "-sc_threshold", "0", video_path], check=True)
+
+    # Decodificador entregando um keyframe a menos: o índice do pipe não aponta mais para o pacote K
+    monkeypatch.setattr(module, "probe_decoded_keyframe_times", lambda path: np.arange(1.0, 6.0))
+    samples = list(module.iter_sampled_frames(video_path, timestamps=[0.3, 3.7], mode="keyframe"))
+    assert [t for t, _ in samples] == pytest.approx([0.3, 3.7])
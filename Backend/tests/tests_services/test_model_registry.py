@@ -0,0 +1,139 @@
+"""
+Teste de importação e estrutura para o serviço: model_registry
+"""
+
+import pytest
+
+
+def test_import_model_registry():
+    try:
+        import app.services.model_registry as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar model_registry: {e}"
+
+
+def _registry(budget_mb=1):
+    from app.services.model_registry import ModelRegistry
+
+    registry = ModelRegistry(memory_budget_mb=budget_mb)
+    loads = []
+
+    def loader(path):
+        loads.append(path)
+        return bytearray(512 * 1024)  # sem parâmetros torch: tamanho vem do arquivo ou 0
+
+    registry.register_loader("fake", loader)
+    return registry, loads
+
+
+def test_get_loads_once_and_counts_hits():
+    registry, loads = _registry()
+
+    first = registry.get("fake", "a")
+    assert registry.get("fake", "a") is first
+    assert loads == ["a"]
+
+    stats = registry.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_evicts_least_recently_used_over_budget(monkeypatch):
+    import app.services.model_registry as module
+
+    registry, loads = _registry(budget_mb=1)
+    monkeypatch.setattr(module, "estimate_model_bytes", lambda model, path=None: 400 * 1024)
+
+    registry.get("fake", "a")
+    registry.get("fake", "b")
+    registry.get("fake", "a")  # "b" passa a ser o menos usado
+    registry.get("fake", "c")  # 1200 KB > 1 MB: remove "b"
+
+    assert ("fake", "a") in registry and ("fake", "c") in registry
+    assert ("fake", "b") not in registry
+    assert registry.evictions == 1
+
+
+def test_unknown_kind_raises():
+    registry, _ = _registry()
+    with pytest.raises(KeyError):
+        registry.get("desconhecido", "x")
+
+
+def test_slow_load_does_not_block_other_models():
+    import threading
+
+    registry, loads = _registry()
+    cached = registry.get("fake", "a")
+    started, release = threading.Event(), threading.Event()
+    slow_loads = []
+
+    def slow_loader(path):
+        slow_loads.append(path)
+        started.set()
+        release.wait(5)
+        return object()
+
+    registry.register_loader("slow", slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("slow", "big"))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+
+    # Enquanto "big" carrega, o cache e os outros modelos seguem respondendo
+    others = []
+    probe = threading.Thread(target=lambda: others.extend([registry.get("fake", "a"), registry.get("fake", "b")]))
+    probe.start()
+    probe.join(2)
+    assert not probe.is_alive() and not release.is_set()
+    assert others[0] is cached and loads == ["a", "b"]
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert slow_loads == ["big"]
+    assert len(results) == 2 and results[0] is results[1]
+
+
+def test_evict_and_clear_drop_load_times():
+    registry, _ = _registry(budget_mb=64)
+    registry.get("fake", "a")
+    registry.get("fake", "b")
+
+    assert registry.evict("fake", "a")
+    assert ("fake", "a") not in registry._load_seconds
+    registry.clear()
+    assert registry._load_seconds == {} and registry.stats()["models"] == []
+
+
+def test_caller_between_load_and_insert_does_not_reload():
+    import threading
+
+    registry, loads = _registry(budget_mb=64)
+    key, fired, results = ("fake", "m"), [], []
+
+    class GapLock:
+        """RLock que, na primeira liberação depois de o loader rodar e `key` sair de `_loading`, roda outro get."""
+
+        def __init__(self):
+            self._lock = threading.RLock()
+
+        def __enter__(self):
+            self._lock.acquire()
+
+        def __exit__(self, *exc):
+            self._lock.release()
+            if loads and key not in registry._loading and not fired:
+                fired.append(True)
+                other = threading.Thread(target=lambda: results.append(registry.get(*key)))
+                other.start()
+                other.join(5)
+
+    registry._lock = GapLock()
+    model = registry.get(*key)
+
+    assert fired and results == [model]
+    assert loads == ["m"]
+    assert registry.stats()["misses"] == 1 and registry.stats()["hits"] == 1
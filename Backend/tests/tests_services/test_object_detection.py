@@ -0,0 +1,44 @@
+"""
+Teste de importação e estrutura para o serviço: object_detection
+"""
+
+
+def test_import_object_detection():
+    try:
+        import app.services.object_detection as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar object_detection: {e}"
+
+
+def test_iter_batches_keeps_order_and_remainder():
+    from app.services.object_detection import iter_batches
+
+    assert list(iter_batches(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+class _FakeNet:
+    """Rede com duas linhas por frame: classe 1 (conf. 0.9) e classe 0 (conf. 0.2)."""
+
+    def setInput(self, blob):
+        self.batch = blob.shape[0]
+
+    def getUnconnectedOutLayersNames(self):
+        return ["yolo"]
+
+    def forward(self, names):
+        import numpy as np
+
+        rows = np.array([[0, 0, 0, 0, 1, 0.1, 0.9], [0, 0, 0, 0, 1, 0.2, 0.1]], dtype=np.float32)
+        return [np.stack([rows] * self.batch)]
+
+
+def test_detect_dnn_batch_splits_outputs_per_frame():
+    import numpy as np
+    from app.services.object_detection import detect_dnn_batch
+
+    frames = [np.zeros((32, 32, 3), dtype=np.uint8) for _ in range(3)]
+    detections = detect_dnn_batch(_FakeNet(), frames, ["pessoa", "carro"], 0.5)
+
+    assert len(detections) == 3
+    assert all(d == [{"label": "carro", "confidence": np.float32(0.9).item()}] for d in detections)
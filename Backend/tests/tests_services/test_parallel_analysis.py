@@ -0,0 +1,46 @@
+"""
+Teste de importação e estrutura para o serviço: parallel_analysis
+"""
+
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+
+def test_import_parallel_analysis():
+    try:
+        import app.services.parallel_analysis as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar parallel_analysis: {e}"
+
+
+def test_plan_shards_starts_on_keyframes():
+    from app.services.parallel_analysis import plan_shards
+
+    assert plan_shards(np.arange(0, 300, 25), 300, 4) == [(0, 75), (75, 150), (150, 225), (225, None)]
+    assert plan_shards(np.array([0, 100]), 300, 4) == [(0, 100), (100, None)]
+    assert plan_shards(np.array([0]), 300, 4) == [(0, None)]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_sharded_results_match_serial(tmp_path):
+    from app.services.frame_pipeline import HistogramAnalyzer, MotionAnalyzer, run_frame_pipeline
+    from app.services.parallel_analysis import ShardedFramePipeline
+
+    video = str(tmp_path / "gop.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=8:s=320x240:r=25",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-x264-params", "keyint=25:min-keyint=25:scenecut=0", video,
+    ], check=True)
+
+    for height in (None, 120):
+        serial = run_frame_pipeline(video, [MotionAnalyzer(), HistogramAnalyzer(threshold=0.98)], height)
+        pipeline = ShardedFramePipeline(video, height, workers=3, min_shard_seconds=2)
+        pipeline.register(MotionAnalyzer()).register(HistogramAnalyzer(threshold=0.98))
+
+        assert pipeline.run() == serial
+        assert pipeline.frame_count == 200
@@ -2,9 +2,28 @@
 Teste de importação e estrutura para o serviço: processing_pipeline
 """
 
+import pytest
+from fastapi import HTTPException
+
+
 def test_import_processing_pipeline():
     try:
         import app.services.processing_pipeline as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar processing_pipeline: {e}"
+
+
+@pytest.mark.parametrize("filter_source, status_code", [("user_style", 501), ("desconhecido", 400), ("pytorch", 400)])
+def test_rejected_filter_does_no_work(monkeypatch, filter_source, status_code):
+    import app.services.processing_pipeline as module
+
+    work = []
+    monkeypatch.setattr(module, "select_cut_segments", lambda path: work.append("cut_analysis") or [(0.0, 1.0)])
+    monkeypatch.setattr(module.FilterChain, "render", lambda self, output_path: work.append("render"))
+
+    with pytest.raises(HTTPException) as exc:
+        module.full_video_pipeline("entrada.mp4", "u1", filter_type="sepia", filter_source=filter_source)
+
+    assert exc.value.status_code == status_code
+    assert work == []
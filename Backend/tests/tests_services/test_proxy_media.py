@@ -0,0 +1,50 @@
+"""
+Teste de importação e estrutura para o serviço: proxy_media
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+
+def test_import_proxy_media():
+    try:
+        import app.services.proxy_media as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar proxy_media: {e}"
+
+
+def test_resolve_media_falls_back_to_source(tmp_path, monkeypatch):
+    from app.services import proxy_media
+
+    monkeypatch.setattr(proxy_media, "PROXY_DIR", str(tmp_path / "proxies"))
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"original")
+    assert proxy_media.resolve_media(str(source)) == str(source)
+
+    proxy = proxy_media.proxy_path(str(source))
+    (tmp_path / "proxies").mkdir()
+    open(proxy, "wb").close()
+    assert proxy_media.resolve_media(str(source)) == proxy
+    assert proxy_media.resolve_media(str(source), use_proxy=False) == str(source)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_generate_proxy_keeps_timestamps(tmp_path, monkeypatch):
+    from app.services import proxy_media
+    from app.utils.ffmpeg_pipe import probe_keyframe_times, probe_media, probe_video_stream
+
+    monkeypatch.setattr(proxy_media, "PROXY_DIR", str(tmp_path / "proxies"))
+    source = str(tmp_path / "source.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=3:s=1280x720:r=25",
+                    "-f", "lavfi", "-i", "sine=d=3", "-c:v", "libx264", "-g", "250", "-c:a", "aac",
+                    "-shortest", source], check=True)
+
+    proxy = proxy_media.generate_proxy(source, height=180, gop=5)
+    assert proxy == proxy_media.get_proxy(source, height=180)
+    assert probe_video_stream(proxy) == (320, 180, 25.0)
+    assert abs(probe_media(proxy)[0] - probe_media(source)[0]) < 0.05
+    assert len(probe_keyframe_times(proxy)) == 15
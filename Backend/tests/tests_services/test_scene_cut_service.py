@@ -2,9 +2,67 @@
 Teste de importação e estrutura para o serviço: scene_cut_service
 """
 
+import os
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+
 def test_import_scene_cut_service():
     try:
         import app.services.scene_cut_service as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar scene_cut_service: {e}"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_detect_scenes_and_cut_bounds_processes_and_memory(tmp_path, monkeypatch):
+    import tracemalloc
+    from app.services.scene_cut_service import detect_scenes_and_cut
+
+    video = str(tmp_path / "scenes.mp4")
+    colors = ["red", "blue", "green", "white", "black"]
+    cmd = ["ffmpeg", "-v", "error", "-y"]
+    for color in colors:
+        cmd += ["-f", "lavfi", "-i", f"color={color}:s=640x360:r=25:d=3"]
+    graph = "".join(f"[{i}]" for i in range(len(colors))) + f"concat=n={len(colors)}"
+    subprocess.run(cmd + ["-filter_complex", graph, "-c:v", "libx264", "-pix_fmt", "yuv420p", video], check=True)
+
+    # Conta processos filhos vivos: um Popen só sai da conta depois do wait()
+    live = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+    real_popen = subprocess.Popen
+
+    class CountingPopen(real_popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._counted = True
+            with lock:
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+
+        def wait(self, timeout=None):
+            code = super().wait(timeout)
+            with lock:
+                if getattr(self, "_counted", False):
+                    self._counted = False
+                    live["now"] -= 1
+            return code
+
+    monkeypatch.setattr(subprocess, "Popen", CountingPopen)
+    tracemalloc.start()
+    try:
+        paths = detect_scenes_and_cut(video, str(tmp_path), workers=2)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(paths) == len(colors) and all(os.path.exists(p) for p in paths)
+    assert live["now"] == 0
+    assert live["peak"] <= 2
+    # Só um lote de frames reduzidos por vez: o vídeo inteiro decodificado passaria de 250 MB
+    assert peak_memory < 128 * 1024 * 1024
@@ -2,9 +2,54 @@
 Teste de importação e estrutura para o serviço: scene_detector
 """
 
+import os
+import shutil
+import subprocess
+
+import pytest
+
+
 def test_import_scene_detector():
     try:
         import app.services.scene_detector as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar scene_detector: {e}"
+
+
+def test_detect_scenes_rejects_unknown_method():
+    from fastapi import HTTPException
+    from app.services.scene_detector import detect_scenes
+
+    with pytest.raises(HTTPException) as exc:
+        detect_scenes("in.mp4", method="magic")
+    assert exc.value.status_code == 400
+
+
+def test_scene_command_seeks_before_input():
+    from app.services.scene_detector import _scene_command
+
+    cmd = _scene_command("in.mp4", 12.5, 14.0, "out.mp4", threads=2)
+    assert cmd.index("-ss") < cmd.index("-i")
+    assert cmd[cmd.index("-t") + 1] == "1.500000"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("mode", ["parallel", "segment"])
+def test_split_scenes_modes(tmp_path, mode):
+    from app.services.scene_detector import split_scenes
+    from app.utils.ffmpeg_pipe import probe_media
+
+    video = str(tmp_path / "input.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=6:s=320x240:r=25",
+                    "-f", "lavfi", "-i", "sine=d=6", "-c:v", "libx264", "-c:a", "aac", "-shortest", video],
+                   check=True)
+
+    scenes = [(0.0, 1.0), (1.0, 2.4), (3.0, 5.0)]
+    paths = split_scenes(video, scenes, output_dir=str(tmp_path / "out"), mode=mode, workers=2)
+    assert len(paths) == 3
+    for path, (start, end) in zip(paths, scenes):
+        duration, has_audio = probe_media(path)
+        assert has_audio and abs(duration - (end - start)) < 0.1
+    assert sorted(os.listdir(tmp_path / "out")) == sorted(os.path.basename(p) for p in paths)
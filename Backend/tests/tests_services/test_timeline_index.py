@@ -0,0 +1,38 @@
+"""
+Teste de importação e estrutura para o serviço: timeline_index
+"""
+
+
+def test_import_timeline_index():
+    try:
+        import app.services.timeline_index as module
+        assert module is not None
+    except Exception as e:
+        assert False, f"Erro ao importar timeline_index: {e}"
+
+
+def test_windows_match_linear_scan():
+    import numpy as np
+    from app.services.timeline_index import TimelineIndex
+
+    events = [0.5, 1.0, 2.0, 2.0, 7.5]
+    index = TimelineIndex(reversed(events))
+    starts, ends = np.array([0.0, 1.0, 2.5, 7.5]), np.array([1.0, 2.0, 7.0, 9.0])
+
+    closed = [sum(s <= t <= e for t in events) for s, e in zip(starts, ends)]
+    opened = [sum(s < t < e for t in events) for s, e in zip(starts, ends)]
+    assert index.count_within_many(starts, ends).tolist() == closed
+    assert index.count_within_many(starts, ends, closed=False).tolist() == opened
+    assert index.any_within(7.5, 7.5) and not index.any_within(7.5, 7.5, closed=False)
+
+
+def test_score_segments_adds_weights_per_term():
+    import numpy as np
+    from app.services.timeline_index import ScoreTerm, TimelineIndex, score_segments
+
+    mids = np.array([1.0, 5.0])
+    scores = score_segments(np.ones(2), [
+        ScoreTerm(TimelineIndex([1.2]), 0.4, mids - 0.5, mids + 0.5, closed=False),
+        ScoreTerm(TimelineIndex([]), 0.3, mids - 1, mids + 1),
+    ])
+    assert scores.tolist() == [1.4, 1.0]
@@ -2,9 +2,51 @@
 Teste de importação e estrutura para o serviço: video_analyzer
 """
 
+import shutil
+import subprocess
+
+import pytest
+
+
 def test_import_video_analyzer():
     try:
         import app.services.video_analyzer as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar video_analyzer: {e}"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_config_reaches_parallel_pipeline(tmp_path, monkeypatch):
+    import app.services.video_analyzer as module
+    from app.services.parallel_analysis import ShardedFramePipeline
+
+    video = str(tmp_path / "gop.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=6:s=320x240:r=25",
+        "-f", "lavfi", "-i", "sine=d=6", "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        "-x264-params", "keyint=25:min-keyint=25:scenecut=0", "-c:a", "aac", "-shortest", video,
+    ], check=True)
+
+    calls = []
+
+    def sharded(video_path, analyzers, analysis_height=None, workers=1, cache=None):
+        calls.append((analysis_height, workers))
+        pipeline = ShardedFramePipeline(video_path, analysis_height, workers=workers, min_shard_seconds=2)
+        for analyzer in analyzers:
+            pipeline.register(analyzer)
+        return pipeline.run()
+
+    monkeypatch.setattr(module, "analysis_cache", None)
+    monkeypatch.setattr(module, "run_parallel_frame_pipeline", sharded)
+
+    # Mesmo caminho do generate_video_highlights_task: config montada a partir de um dict
+    params = {"analysis_height": 120, "yolo_model_id": "yolov8n.pt"}
+    serial = module.analyze_video_for_cuts(video, None, None, module.VideoAnalysisConfig(**params))
+    parallel = module.analyze_video_for_cuts(video, None, None,
+                                             module.VideoAnalysisConfig(**params, parallel_workers=3))
+
+    assert calls == [(120, 3)]
+    assert len(serial["motion"]) == 149
+    assert parallel["motion"] == serial["motion"] and parallel["faces"] == serial["faces"]
@@ -2,9 +2,110 @@
 Teste de importação e estrutura para o serviço: video_filters
 """
 
+import shutil
+import subprocess
+
+import pytest
+
+
 def test_import_video_filters():
     try:
         import app.services.video_filters as module
         assert module is not None
     except Exception as e:
         assert False, f"Erro ao importar video_filters: {e}"
+
+
+def _frames(path):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+@pytest.mark.parametrize("filter_type,min_psnr", [("gray", 30), ("sepia", 30), ("vintage", 30), ("bw", 30), ("blur", 25)])
+def test_ffmpeg_backend_matches_opencv(tmp_path, filter_type, min_psnr):
+    import cv2
+    import numpy as np
+    from app.services.video_filters import apply_opencv_filter
+
+    source = str(tmp_path / "source.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=2:s=320x240:r=25",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", source,
+    ], check=True)
+
+    apply_opencv_filter(source, str(tmp_path / "opencv.mp4"), filter_type, backend="opencv")
+    apply_opencv_filter(source, str(tmp_path / "ffmpeg.mp4"), filter_type, backend="ffmpeg")
+
+    reference, native = _frames(str(tmp_path / "opencv.mp4")), _frames(str(tmp_path / "ffmpeg.mp4"))
+    assert len(reference) == len(native) == 50
+    assert np.mean([cv2.PSNR(a, b) for a, b in zip(reference, native)]) > min_psnr
+
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("effect", ["fadein", "fadeout", "color_boost"])
+def test_ffmpeg_effect_matches_moviepy(tmp_path, effect):
+    import cv2
+    import numpy as np
+    from app.services.video_filters import apply_moviepy_effect
+    from app.utils.ffmpeg_pipe import probe_media
+
+    source = str(tmp_path / "source.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=3:s=320x240:r=25",
+        "-f", "lavfi", "-i", "sine=d=3", "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", source,
+    ], check=True)
+
+    apply_moviepy_effect(source, str(tmp_path / "moviepy.mp4"), effect, backend="moviepy")
+    apply_moviepy_effect(source, str(tmp_path / "ffmpeg.mp4"), effect, backend="ffmpeg")
+
+    reference, native = _frames(str(tmp_path / "moviepy.mp4")), _frames(str(tmp_path / "ffmpeg.mp4"))
+    assert abs(len(reference) - len(native)) <= 1
+    assert np.mean([cv2.PSNR(a, b) for a, b in zip(reference, native)]) > 30
+    assert probe_media(str(tmp_path / "ffmpeg.mp4"))[1]
+
+def test_snap_to_keyframes_picks_nearest():
+    import numpy as np
+    from app.services.video_filters import snap_to_keyframes
+
+    keyframes = np.array([0.0, 1.0, 2.0, 3.0])
+    assert snap_to_keyframes([0.2, 1.4, 1.6, 2.4], keyframes) == [1.0, 2.0]
+    assert snap_to_keyframes([2.9, 7.5], keyframes) == [3.0]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("mode,expected_frames", [("fast", [50, 50, 52]), ("exact", [55, 48, 49])])
+def test_split_video_by_scene_keeps_audio(tmp_path, mode, expected_frames):
+    import cv2
+    from app.services.video_filters import split_video_by_scene
+    from app.utils.ffmpeg_pipe import probe_media
+
+    source = str(tmp_path / "scenes.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", "color=c=red:s=320x240:r=25:d=2.2",
+        "-f", "lavfi", "-i", "testsrc2=s=320x240:r=25:d=1.9",
+        "-f", "lavfi", "-i", "color=c=blue:s=320x240:r=25:d=2",
+        "-f", "lavfi", "-i", "sine=d=6.1",
+        "-filter_complex", "[0:v][1:v][2:v]concat=n=3:v=1:a=0,format=yuv420p[v]",
+        "-map", "[v]", "-map", "3:a", "-c:v", "libx264", "-x264-params", "keyint=25:min-keyint=25:scenecut=0",
+        "-c:a", "aac", "-shortest", source,
+    ], check=True)
+
+    scenes = split_video_by_scene(source, str(tmp_path / mode), mode=mode)
+
+    frames = [int(cv2.VideoCapture(path).get(cv2.CAP_PROP_FRAME_COUNT)) for path in scenes]
+    assert frames == expected_frames
+    assert all(probe_media(path)[1] for path in scenes)
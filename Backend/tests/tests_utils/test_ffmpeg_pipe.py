@@ -0,0 +1,32 @@
+import shutil
+import subprocess
+
+import pytest
+
+from app.utils import ffmpeg_pipe
+
+
+def test_scaled_size_keeps_aspect_and_even_width():
+    assert ffmpeg_pipe.scaled_size(1920, 1080, 240) == (426, 240)
+
+
+def test_scaled_size_never_upscales():
+    assert ffmpeg_pipe.scaled_size(320, 181, 240) == (320, 180)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg não instalado")
+def test_iter_gray_frames_keeps_vfr_frames_and_raises_on_failure(tmp_path):
+    # 2 s a 25 fps + 2 s a 5 fps: 60 frames decodificados (um pipe CFR a 25 fps daria 100)
+    video = str(tmp_path / "vfr.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y",
+                    "-f", "lavfi", "-i", "color=red:s=160x90:r=25:d=2",
+                    "-f", "lavfi", "-i", "color=blue:s=160x90:r=5:d=2",
+                    "-filter_complex", "[0][1]concat=n=2", "-fps_mode", "passthrough",
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p", video],
+                   check=True)
+    assert sum(1 for _ in ffmpeg_pipe.iter_gray_frames(video, 80, 44)) == 60
+
+    broken = tmp_path / "broken.mp4"
+    broken.write_bytes(b"not a video")
+    with pytest.raises(RuntimeError):
+        list(ffmpeg_pipe.iter_gray_frames(str(broken), 80, 44))
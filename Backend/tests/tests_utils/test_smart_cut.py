@@ -0,0 +1,124 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from app.utils import smart_cut
+
+
+def test_plan_copies_gop_aligned_middle():
+    keyframes = np.arange(0, 20, 2.0)
+    assert smart_cut.plan_smart_cut(3.1, 12.5, keyframes) == [
+        ("encode", 3.1, 4.0), ("copy", 4.0, 12.0), ("encode", 12.0, 12.5),
+    ]
+    assert smart_cut.plan_smart_cut(4.0, 8.0, keyframes) == [("copy", 4.0, 8.0)]
+
+
+def test_plan_reencodes_when_no_full_gop():
+    keyframes = np.arange(0, 20, 2.0)
+    assert smart_cut.plan_smart_cut(4.5, 7.9, keyframes) == [("encode", 4.5, 7.9)]
+
+
+def test_snap_start_uses_last_keyframe_before_start():
+    keyframes = np.arange(0, 20, 2.0)
+    # 3.9 fica mais perto de 4.0, mas começar lá perderia conteúdo (e passaria do fim de [3.9-3.95])
+    assert smart_cut.snap_start(3.9, keyframes) == 2.0
+    assert smart_cut.snap_start(4.0, keyframes) == 4.0
+    assert smart_cut.snap_start(0.5, np.array([1.0, 3.0])) == 0.5
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("mode", ["smart", "fast"])
+def test_smart_cut_is_frame_accurate(tmp_path, mode):
+    import cv2
+    from app.utils.ffmpeg_pipe import probe_media
+
+    source, output = str(tmp_path / "source.mp4"), str(tmp_path / "cut.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=8:s=320x240:r=25",
+        "-f", "lavfi", "-i", "sine=d=8", "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        "-x264-params", "keyint=25:min-keyint=25:scenecut=0", "-c:a", "aac", "-shortest", source,
+    ], check=True)
+
+    smart_cut.smart_cut(source, 1.32, 4.6, output, mode=mode)
+
+    cap = cv2.VideoCapture(output)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    _, has_audio = probe_media(output)
+    assert has_audio
+    if mode == "smart":
+        assert frames == 82
+    else:
+        # início recuado ao keyframe anterior (1.0s), sem reencode; a cópia pode deixar
+        # passar os B-frames do fim do GOP
+        assert abs(frames / 25 - 3.6) <= 0.12
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("encoder, expected_codec", [("libx265", "hevc"), ("libvpx-vp9", "h264")])
+def test_smart_cut_other_source_codecs(tmp_path, encoder, expected_codec):
+    import cv2
+    from app.utils.ffmpeg_pipe import probe_stream_signature
+
+    source, output = str(tmp_path / "source.mp4"), str(tmp_path / "cut.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=8:s=320x240:r=25",
+        "-c:v", encoder, "-pix_fmt", "yuv420p", "-g", "25", "-keyint_min", "25", source,
+    ], check=True)
+
+    # HEVC: miolo copiado e pontas em H.265; VP9: sem filtro Annex B, reencode completo em H.264
+    smart_cut.smart_cut(source, 1.32, 4.6, output, mode="smart")
+
+    cap = cv2.VideoCapture(output)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    (codec, *_), _ = probe_stream_signature(output)
+    assert codec == expected_codec
+    assert frames == 82
+
+
+def _frame_count(path):
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return frames
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+def test_fast_cut_inside_one_gop(tmp_path):
+    source, output = str(tmp_path / "source.mp4"), str(tmp_path / "cut.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=8:s=320x240:r=25",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-bf", "0",
+        "-x264-params", "keyint=50:min-keyint=50:scenecut=0", source,
+    ], check=True)
+
+    # Keyframes em 0, 2, 4, 6 s: [3.5-3.7] fica dentro do GOP de 2 s e o mais próximo (4 s) passaria do fim
+    smart_cut.smart_cut(source, 3.5, 3.7, output, mode="fast")
+    assert _frame_count(output) == 43
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                    reason="ffmpeg/ffprobe não instalados")
+@pytest.mark.parametrize("mode, expected", [("smart", 70), ("fast", 85)])
+def test_cut_source_with_start_offset(tmp_path, mode, expected):
+    from app.utils.ffmpeg_pipe import probe_keyframe_times
+
+    # Container começando em 1.5 s (como .ts ou trechos já cortados): o -ss conta a partir daí
+    source, output = str(tmp_path / "offset.mp4"), str(tmp_path / "cut.mp4")
+    subprocess.run([
+        "ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "testsrc2=d=4:s=320x240:r=25",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-bf", "0",
+        "-x264-params", "keyint=25:min-keyint=25:scenecut=0", "-output_ts_offset", "1.5", source,
+    ], check=True)
+    assert np.allclose(probe_keyframe_times(source), [0.0, 1.0, 2.0, 3.0])
+
+    smart_cut.smart_cut(source, 0.6, 3.4, output, mode=mode)
+    assert _frame_count(output) == expected